@@ -0,0 +1,273 @@
+"""
+End-to-end throughput of `Evolver` with the LLM and the sandbox taken out of the picture.
+
+A seeded stub LLM answers from a fixed corpus of programs and an in-process sandbox
+runs them with the sandbox runner's own code, so what is measured is the
+orchestration itself: selection, prompt building, pre-filtering, evaluation
+bookkeeping, caching and population updates.
+
+Run from the repository root:
+    python -m alphaevolve_core.benchmarks.evolver_bench --output bench.json
+    python -m alphaevolve_core.benchmarks.evolver_bench --compare bench.json
+"""
+import argparse
+import contextlib
+import gc
+import itertools
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import threading
+import time
+from typing import List, Dict, Any, Callable
+
+from alphaevolve_core.src.core.evolver import Evolver
+from alphaevolve_core.src.evaluation import sandbox_runner
+from alphaevolve_core.src.project_def.project_base import ProjectBase
+
+
+class SyntheticProject(ProjectBase):
+    """A project whose test cases are generated from a reference solution."""
+
+    description = function_name = signature = test_cases = None
+
+    def __init__(self, name: str, description: str, function_name: str, signature: str,
+                 reference: Callable[[Any], Any], make_input: Callable[[random.Random, int], Any],
+                 num_cases: int, correct: List[str], wrong: List[str], variants: int = 20, seed: int = 0):
+        """
+        Args:
+            name: Short name used in reports.
+            reference: Computes the expected output of an input.
+            make_input: Draws an input of a given size.
+            num_cases: Number of test cases.
+            correct: Bodies of correct programs in the LLM corpus.
+            wrong: Bodies of incorrect programs (wrong results, crashes, syntax or
+                import errors); their share sets how hard the project is to solve.
+            variants: Distinct copies of each body in the corpus, so that repeated
+                answers are not all served by the evaluation cache.
+        """
+        self.name = name
+        self.description = description
+        self.function_name = function_name
+        self.signature = signature
+        rng = random.Random(seed)
+        inputs = [make_input(rng, rng.randint(0, 20)) for _ in range(num_cases)]
+        self.test_cases = [{"input": test_input, "output": reference(test_input)} for test_input in inputs]
+        self.corpus = [f"```python\n{signature}\n    variant = {i}\n{body}\n```"
+                       for i in range(variants) for body in correct + wrong]
+        self.unsolved_corpus = [f"```python\n{signature}\n    variant = {i}\n{body}\n```"
+                                for i in range(variants) for body in wrong]
+        self.solve_rate = len(correct) / (len(correct) + len(wrong))
+
+    def generate_input(self, size: int) -> Any:
+        return list(range(size, 0, -1))
+
+
+def _int_list(rng: random.Random, size: int) -> List[int]:
+    return [rng.randint(-50, 50) for _ in range(size)]
+
+
+def build_projects(seed: int) -> Dict[str, SyntheticProject]:
+    """Three problems of increasing difficulty (fewer correct programs) and suite size."""
+    broken = [
+        "    return None",
+        "    raise ValueError('not implemented yet')",
+        "    return arr[0]",
+        "    import os\n    return os.getcwd()",
+        "    return [x for x in arr if x >",
+    ]
+    return {
+        "sum": SyntheticProject(
+            "sum", "Return the sum of a list of integers.", "total", "def total(arr: list) -> int:",
+            sum, _int_list, num_cases=10, seed=seed,
+            correct=["    return sum(arr)", "    result = 0\n    for x in arr:\n        result += x\n    return result"],
+            wrong=broken + ["    return sum(arr) + 1"]),
+        "sort": SyntheticProject(
+            "sort", "Return the list of integers sorted in ascending order.", "sort_list",
+            "def sort_list(arr: list) -> list:", sorted, _int_list, num_cases=100, seed=seed,
+            correct=["    return sorted(arr)"],
+            wrong=broken + ["    return sorted(arr, reverse=True)", "    return list(arr)",
+                            "    return sorted(set(arr))", "    arr.sort()",
+                            "    return sorted(arr)[1:]"]),
+        "dedupe": SyntheticProject(
+            "dedupe", "Remove duplicates from a list of integers, keeping the first occurrence of each.",
+            "dedupe", "def dedupe(arr: list) -> list:", lambda arr: list(dict.fromkeys(arr)), _int_list,
+            num_cases=1000, seed=seed,
+            correct=["    seen = set()\n    return [x for x in arr if not (x in seen or seen.add(x))]"],
+            wrong=broken + ["    return sorted(set(arr))", "    return list(set(arr))", "    return list(arr)",
+                            "    return list(dict.fromkeys(arr))[::-1]", "    return [x for x in arr if arr.count(x) == 1]",
+                            "    return list(dict.fromkeys(arr))[:-1]", "    return arr[:len(set(arr))]",
+                            "    return sorted(dict.fromkeys(arr), key=arr.index)[1:]"]),
+    }
+
+
+class InProcessSandbox:
+    """Runs batches through `sandbox_runner.run_batch` in this process: no pipes, no containers."""
+
+    def __init__(self, size: int = 1):
+        self.size = size
+        self._lock = threading.Lock()
+        self.batches_run = 0
+
+    def run_batch(self, code: str, function_name: str, test_inputs: List[Any], timeout: float = 10,
+                  per_test_timeout: float | None = None, expected_outputs: List[Any] | None = None,
+                  stop_on_failure: bool = False):
+        # Per-test timeouts use SIGALRM, which only works on the main thread, so they are not applied here
+        request = {"code": code, "function_name": function_name, "inputs": list(test_inputs)}
+        if stop_on_failure and expected_outputs is not None:
+            request["expected"] = list(expected_outputs)
+            request["stop_on_failure"] = True
+        response = sandbox_runner.run_batch(request)
+        with self._lock:
+            self.batches_run += 1
+        return [(r["result"], r["stdout"], r["stderr"]) for r in response["results"]]
+
+
+def _rss_bytes() -> int:
+    """Current resident set size; falls back to the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def bench(project: SyntheticProject, population_size: int, tournament_size: int, concurrency: int,
+          generations: int, generation_mode: str, seed: int) -> Dict[str, Any]:
+    random.seed(seed)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        evolver = Evolver(project, population_size=population_size, generations=generations,
+                          tournament_size=tournament_size, generation_mode=generation_mode,
+                          llm_backend="stub", quiet=True)
+        evolver.gemini_client.responses = project.corpus
+        evolver.gemini_client.random = random.Random(seed)
+        sandbox = InProcessSandbox(size=concurrency)
+        evolver.fitness_evaluator.sandbox = sandbox
+        # Run every generation so throughput is comparable; time-to-solution is recorded on the side
+        evolver.target_fitness = float("inf")
+
+        # Fill the population up front with incorrect programs, so selection works on a population of
+        # the configured size and the solution still has to be found
+        seed_rng = random.Random(seed)
+        evolver.initialize_population([seed_rng.choice(project.unsolved_corpus) for _ in range(population_size)])
+
+        start = time.perf_counter()
+        solved_at = []
+        add_individual = evolver.population.add_individual
+
+        def timed_add(code, fitness, metadata=None):
+            if fitness >= 1.0 and not solved_at:
+                solved_at.append(time.perf_counter() - start)
+            return add_individual(code, fitness, metadata=metadata)
+
+        evolver.population.add_individual = timed_add
+        generations_run = []
+
+        def on_generation(generation: int) -> bool:
+            generations_run.append(generation)
+            return False
+
+        gc.collect()
+        rss_before = _rss_bytes()
+        batches_before = sandbox.batches_run
+        evaluated_before = evolver.offspring_evaluated
+        if concurrency > 1:
+            evolver.evolve_async(concurrency=concurrency)
+            generations_run.append(evolver.offspring_started)
+        else:
+            evolver.evolve(on_generation=on_generation)
+            generations_run = [len(generations_run)]
+        seconds = time.perf_counter() - start
+        gc.collect()
+        rss_growth = _rss_bytes() - rss_before
+        evaluations = evolver.offspring_evaluated - evaluated_before
+        sandbox_runs = sandbox.batches_run - batches_before
+        llm_calls = evolver.gemini_client.metrics.requests
+        evolver.close()
+
+    return {
+        "project": project.name,
+        "solve_rate": project.solve_rate,
+        "test_cases": len(project.test_cases),
+        "population_size": population_size,
+        "tournament_size": tournament_size,
+        "concurrency": concurrency,
+        "generation_mode": generation_mode,
+        "generations": generations_run[0],
+        "seconds": seconds,
+        "generations_per_second": generations_run[0] / seconds,
+        "evaluations_per_second": evaluations / seconds,
+        "sandbox_runs_per_second": sandbox_runs / seconds,
+        "llm_calls": llm_calls,
+        "rss_growth_mb": rss_growth / (1024 * 1024),
+        "time_to_solution": solved_at[0] if solved_at else None,
+    }
+
+
+def _config_key(result: Dict[str, Any]) -> tuple:
+    return (result["project"], result["population_size"], result["tournament_size"], result["concurrency"],
+            result["generation_mode"])
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark end-to-end Evolver throughput with a mocked LLM and sandbox.")
+    parser.add_argument("--projects", type=str, nargs="+", default=["sum", "sort", "dedupe"])
+    parser.add_argument("--population_sizes", type=int, nargs="+", default=[20, 200])
+    parser.add_argument("--tournament_sizes", type=int, nargs="+", default=[3, 7])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--generations", type=int, default=50)
+    parser.add_argument("--generation_mode", type=str, default="direct", choices=["meta", "direct", "batched"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None, help="Save results as JSON to this file.")
+    parser.add_argument("--compare", type=str, default=None, help="Results file of an earlier run to compare against.")
+    args = parser.parse_args()
+
+    projects = build_projects(args.seed)
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = {_config_key(result): result for result in json.load(f)["results"]}
+
+    results = []
+    for name, population_size, tournament_size, concurrency in itertools.product(
+            args.projects, args.population_sizes, args.tournament_sizes, args.concurrency):
+        result = bench(projects[name], population_size, tournament_size, concurrency, args.generations,
+                       args.generation_mode, args.seed)
+        results.append(result)
+        solved = f"{result['time_to_solution']:.3f}s" if result["time_to_solution"] is not None else "unsolved"
+        line = (f"{name:>7} pop={population_size:<5} k={tournament_size:<3} c={concurrency:<3}: "
+                f"{result['generations_per_second']:8.1f} gen/s, {result['evaluations_per_second']:8.1f} eval/s, "
+                f"{result['sandbox_runs_per_second']:8.1f} runs/s, "
+                f"+{result['rss_growth_mb']:6.1f} MiB, solved {solved}")
+        previous = baseline.get(_config_key(result))
+        if previous:
+            line += f" ({result['generations_per_second'] / previous['generations_per_second']:.2f}x gen/s vs baseline)"
+        print(line)
+
+    if args.output:
+        report = {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.time(),
+            "arguments": vars(args),
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Insert and selection cost of `Population` at large sizes.
+
+An insert is a binary search plus an O(n) memmove of the key array and the
+individuals list, so the reported insert time grows linearly with the size (with
+a small constant), not logarithmically; the list-based population it is compared
+with re-sorts everything on every insert.
+
+Run from the repository root:
+    python -m alphaevolve_core.benchmarks.population_bench --sizes 10000 100000 1000000
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from alphaevolve_core.src.core.population import Population, ProgramStore
+from alphaevolve_core.src.core.selection import TournamentSelection
+
+
+class ListPopulation:
+    """The previous list-of-dicts population (append, then re-sort everything), for comparison."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.individuals = []
+
+    def add_individual(self, code, fitness, metadata=None):
+        individual = {'code': code, 'fitness': fitness}
+        if metadata:
+            individual.update(metadata)
+        self.individuals.append(individual)
+        self.individuals.sort(key=lambda x: x['fitness'], reverse=True)
+        self.individuals = self.individuals[:self.max_size]
+
+
+def bench(population_cls, size: int, selections: int, seed: int, measure_memory: bool, store_path: str | None):
+    rng = random.Random(seed)
+    random.seed(seed)
+    details = {"tests_run": 10, "tests_passed": 5, "errors": "Test 3 expected [1, 2], got [2, 1]"}
+    population = (population_cls(size) if population_cls is ListPopulation
+                  else population_cls(size, store=ProgramStore(path=store_path)))
+
+    if measure_memory:
+        tracemalloc.start()
+    # Insert twice the capacity so the second half exercises eviction
+    inserts = 2 * size
+    start = time.perf_counter()
+    for i in range(inserts):
+        population.add_individual(f"def f(x):\n    return x + {i}\n", rng.random(), metadata=details)
+    insert_seconds = time.perf_counter() - start
+    peak_bytes = tracemalloc.get_traced_memory()[1] if measure_memory else None
+    if measure_memory:
+        tracemalloc.stop()
+
+    selection = TournamentSelection(tournament_size=5)
+    start = time.perf_counter()
+    for _ in range(selections):
+        selection.select(population.individuals, num_parents=2)
+    select_seconds = time.perf_counter() - start
+
+    result = {
+        "population": population_cls.__name__,
+        "size": size,
+        "insert_us": insert_seconds / inserts * 1e6,
+        "select_us": select_seconds / selections * 1e6,
+    }
+    if peak_bytes is not None:
+        result["bytes_per_individual"] = peak_bytes / size
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark population insert and select cost.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--selections", type=int, default=10000, help="Tournament selections timed per size.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--memory", action="store_true", help="Also measure peak memory (slower).")
+    parser.add_argument("--store", type=str, default=None, help="SQLite program store path (default: in memory).")
+    parser.add_argument("--compare_max_size", type=int, default=10000,
+                        help="Largest size at which the list-based population is also timed.")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        classes = [Population] + ([ListPopulation] if size <= args.compare_max_size else [])
+        for population_cls in classes:
+            result = bench(population_cls, size, args.selections, args.seed, args.memory, args.store)
+            line = (f"{result['population']:>15} n={result['size']:>8}: "
+                    f"insert (search + shift) {result['insert_us']:8.2f} us, select {result['select_us']:8.2f} us")
+            if "bytes_per_individual" in result:
+                line += f", {result['bytes_per_individual']:.0f} B/individual"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Startup time of the CLI and of loading a project, in fresh interpreters.
+
+Run from the repository root:
+    python -m alphaevolve_core.benchmarks.startup_bench --runs 10 --importtime
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+COMMANDS = {
+    "python": ["-c", "pass"],
+    "import main": ["-c", "import alphaevolve_core.src.main"],
+    "cli help": ["-m", "alphaevolve_core.src.main", "--help"],
+    "cli list": ["-m", "alphaevolve_core.src.main", "--list_projects"],
+    "load project": ["-c", "from alphaevolve_core.src.project_def.registry import ProjectRegistry; "
+                           "ProjectRegistry().create('sort_list')"],
+    "load project tests": ["-c", "from alphaevolve_core.src.project_def.registry import ProjectRegistry; "
+                                   "ProjectRegistry().create('sort_list').test_cases"],
+    "import evolver": ["-c", "import alphaevolve_core.src.core.evolver"],
+}
+
+
+def time_command(arguments: List[str], runs: int) -> List[float]:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *arguments], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def slowest_imports(arguments: List[str], count: int) -> List[str]:
+    """Modules imported directly by the command (or by its first import) with the largest cumulative import time."""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", *arguments], stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True, check=True).stderr
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # importtime indents nested imports by two spaces per level
+        if cumulative.strip().isdigit() and len(name) - len(name.lstrip(" ")) <= 3:
+            imports.append((int(cumulative), name.strip()))
+    return [f"{us / 1000:8.1f} ms  {name}" for us, name in sorted(imports, reverse=True)[:count]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CLI startup and project loading time.")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters started per command.")
+    parser.add_argument("--commands", type=str, nargs="+", default=list(COMMANDS), choices=list(COMMANDS))
+    parser.add_argument("--importtime", action="store_true", help="Also list the slowest imports of the CLI.")
+    args = parser.parse_args()
+
+    for name in args.commands:
+        times = time_command(COMMANDS[name], args.runs)
+        print(f"{name:>22}: median {statistics.median(times) * 1e3:7.1f} ms, min {min(times) * 1e3:7.1f} ms")
+    if args.importtime:
+        print("Slowest imports of the CLI:")
+        print("\n".join(slowest_imports(COMMANDS["import main"], 10)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+import ast
+import math
+import random
+from typing import List, Dict, Any, Tuple, Callable
+
+from alphaevolve_core.src.core.population import Population, ProgramStore, Individual
+
+
+def runtime_descriptor(code: str, details: Dict[str, Any]) -> float | None:
+    """log10 of the benchmarked runtime in seconds; None for programs that were not benchmarked."""
+    performance = details.get("performance") or {}
+    if "wall_seconds" not in performance:
+        return None
+    return math.log10(max(performance["wall_seconds"], 1e-9))
+
+
+def code_length_descriptor(code: str, details: Dict[str, Any]) -> float | None:
+    """Number of non-blank lines."""
+    return float(sum(1 for line in code.splitlines() if line.strip()))
+
+
+def ast_size_descriptor(code: str, details: Dict[str, Any]) -> float | None:
+    """Number of AST nodes; None when the code does not parse."""
+    try:
+        return float(sum(1 for _ in ast.walk(ast.parse(code))))
+    except (SyntaxError, ValueError):
+        return None
+
+
+def loop_depth_descriptor(code: str, details: Dict[str, Any]) -> float | None:
+    """Deepest nesting of loops and comprehensions; None when the code does not parse."""
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+    loops = (ast.For, ast.AsyncFor, ast.While, ast.comprehension)
+
+    def depth(node: ast.AST) -> int:
+        below = max((depth(child) for child in ast.iter_child_nodes(node)), default=0)
+        return below + (1 if isinstance(node, loops) else 0)
+
+    return float(depth(tree))
+
+
+# name -> (function, low, high); values are clamped to [low, high] before binning
+DESCRIPTORS: Dict[str, Tuple[Callable[[str, Dict[str, Any]], float | None], float, float]] = {
+    "runtime": (runtime_descriptor, -6.0, 0.0),
+    "code_length": (code_length_descriptor, 1.0, 60.0),
+    "ast_size": (ast_size_descriptor, 5.0, 400.0),
+    "loop_depth": (loop_depth_descriptor, 0.0, 4.0),
+}
+
+
+class MapElitesArchive(Population):
+    def __init__(self, max_size: int, store: ProgramStore | None = None,
+                 descriptors: List[str] = ("runtime", "code_length", "loop_depth"), bins: int = 8,
+                 cvt_cells: int = 0, seed: int = 0):
+        """
+        A MAP-Elites archive: the fittest program found so far in each behavioural cell.
+
+        Each program is mapped to a cell from behavioural descriptors (runtime, code
+        length, AST features) and only competes with the incumbent of that cell, so fast
+        but slightly wrong programs or correct but slow ones are kept instead of being
+        crowded out by near-identical copies of the best program. `individuals` stays
+        sorted best-first, so selection strategies work unchanged.
+
+        Args:
+            max_size: Cap on occupied cells; beyond it the least fit elite is evicted.
+            store: Optional `ProgramStore` for code and evaluation details.
+            descriptors: Names from `DESCRIPTORS` spanning the behaviour space.
+            bins: Grid bins per descriptor. Programs whose descriptor is unavailable
+                (e.g. runtime of a program that was not benchmarked) share an extra bin.
+            cvt_cells: When positive, use this many centroidal Voronoi cells instead of a
+                grid, which keeps the cell count fixed as descriptors are added.
+            seed: Seed for the CVT centroids, so a resumed run maps programs identically.
+        """
+        super().__init__(max_size, store=store)
+        unknown = [name for name in descriptors if name not in DESCRIPTORS]
+        if unknown:
+            raise ValueError(f"Unknown behavioural descriptors: {unknown}")
+        self.descriptors = list(descriptors)
+        self.bins = bins
+        self.cvt_cells = cvt_cells
+        self._cells: Dict[Any, Individual] = {}
+        self._cell_of: Dict[int, Any] = {}  # id(individual) -> cell
+        self._centroids = self._compute_centroids(cvt_cells, len(self.descriptors), seed) if cvt_cells else None
+
+    @staticmethod
+    def _compute_centroids(cells: int, dimensions: int, seed: int, iterations: int = 10) -> List[List[float]]:
+        """Approximates a centroidal Voronoi tessellation of the unit cube with Lloyd's algorithm."""
+        rng = random.Random(seed)
+        samples = [[rng.random() for _ in range(dimensions)] for _ in range(cells * 5)]
+        centroids = [list(sample) for sample in rng.sample(samples, cells)]
+        for _ in range(iterations):
+            sums = [[0.0] * dimensions for _ in range(cells)]
+            counts = [0] * cells
+            for sample in samples:
+                nearest = MapElitesArchive._nearest(centroids, sample)
+                counts[nearest] += 1
+                for d in range(dimensions):
+                    sums[nearest][d] += sample[d]
+            centroids = [[s / counts[i] for s in sums[i]] if counts[i] else centroids[i] for i in range(cells)]
+        return centroids
+
+    @staticmethod
+    def _nearest(centroids: List[List[float]], point: List[float]) -> int:
+        return min(range(len(centroids)), key=lambda i: sum((c - p) ** 2 for c, p in zip(centroids[i], point)))
+
+    def cell(self, code: str, metadata: Dict[str, Any] | None) -> Any:
+        """Returns the cell key of a program: a tuple of bin indices, or a CVT cell index."""
+        coordinates = []
+        for name in self.descriptors:
+            function, low, high = DESCRIPTORS[name]
+            value = function(code, metadata or {})
+            coordinates.append(None if value is None else min(max((value - low) / (high - low), 0.0), 1.0))
+        if self._centroids is not None:
+            return self._nearest(self._centroids, [0.0 if c is None else c for c in coordinates])
+        return tuple(-1 if c is None else min(int(c * self.bins), self.bins - 1) for c in coordinates)
+
+    def add_individual(self, code: str, fitness: float, metadata: Dict[str, Any] = None) -> Individual | None:
+        """
+        Offers a program to its cell, replacing a less fit incumbent in O(1) cell lookups.
+
+        Returns:
+            The stored elite, or None if the cell's incumbent is at least as fit or the
+            archive is full of fitter elites.
+        """
+        cell = self.cell(code, metadata)
+        incumbent = self._cells.get(cell)
+        if incumbent is not None:
+            if fitness <= incumbent.fitness:
+                return None
+            self._remove(self._position_of(incumbent))
+        elif len(self.individuals) >= self.max_size and fitness <= self.individuals[-1].fitness:
+            return None
+
+        individual = self._insert(code, fitness, metadata)
+        self._cells[cell] = individual
+        self._cell_of[id(individual)] = cell
+        self._maintain_size()
+        return individual
+
+    def _remove(self, position: int) -> Individual:
+        removed = super()._remove(position)
+        del self._cells[self._cell_of.pop(id(removed))]
+        return removed
+
+    def admission_threshold(self) -> float:
+        # Admission depends on the newcomer's cell, so there is no single fitness cutoff
+        return float("-inf")
+
+    def stats(self) -> Dict[str, Any]:
+        total_cells = self.cvt_cells or (self.bins + 1) ** len(self.descriptors)
+        return {
+            "occupied_cells": len(self._cells),
+            "coverage": len(self._cells) / total_cells,
+            "qd_score": self._fitness_sum,
+        }
+
+
+def fitness_objective(code: str, fitness: float, details: Dict[str, Any]) -> float:
+    return fitness
+
+
+def speed_objective(code: str, fitness: float, details: Dict[str, Any]) -> float:
+    """1 / (1 + runtime in ms) at the largest benchmark size; 0 for programs that were not benchmarked."""
+    performance = details.get("performance") or {}
+    if "wall_seconds" not in performance:
+        return 0.0
+    return 1.0 / (1.0 + performance["wall_seconds"] * 1e3)
+
+
+def memory_objective(code: str, fitness: float, details: Dict[str, Any]) -> float:
+    """1 / (1 + peak MiB) at the largest benchmark size; 0 for programs that were not benchmarked."""
+    performance = details.get("performance") or {}
+    if "peak_memory_bytes" not in performance:
+        return 0.0
+    return 1.0 / (1.0 + performance["peak_memory_bytes"] / (1024 * 1024))
+
+
+def brevity_objective(code: str, fitness: float, details: Dict[str, Any]) -> float:
+    """1 / (1 + characters of code)."""
+    return 1.0 / (1.0 + len(code))
+
+
+def passed_all_tests(details: Dict[str, Any]) -> bool:
+    """False for a program that failed tests; programs scored without a test report count as passing."""
+    if "tests_run" not in details:
+        return True
+    return 0 < details["tests_passed"] == details["tests_run"] and not details.get("errors")
+
+
+# Every objective is maximized, and every objective but fitness lies in [0, 1]
+OBJECTIVES: Dict[str, Callable[[str, float, Dict[str, Any]], float]] = {
+    "fitness": fitness_objective,
+    "speed": speed_objective,
+    "memory": memory_objective,
+    "brevity": brevity_objective,
+}
+
+
+def dominates(a: Tuple[float, ...], b: Tuple[float, ...]) -> bool:
+    """True if `a` is at least as good as `b` on every objective and better on one."""
+    return all(x >= y for x, y in zip(a, b)) and any(x > y for x, y in zip(a, b))
+
+
+class ParetoArchive(Population):
+    def __init__(self, max_size: int, store: ProgramStore | None = None,
+                 objectives: List[str] = ("fitness", "speed")):
+        """
+        Keeps the non-dominated programs over several objectives.
+
+        A newcomer is rejected if a member is at least as good on every objective, and
+        members it dominates are dropped. When the front outgrows `max_size`, the member
+        in the most crowded region of the front is evicted, preserving its spread.
+        `individuals` stays sorted by fitness, best first.
+
+        Objectives other than fitness only reward programs that pass all their tests:
+        a failing program scores 0 on them, so short or fast broken programs cannot
+        crowd correct ones off the front.
+
+        Args:
+            max_size: Largest number of programs kept on the front.
+            store: Optional `ProgramStore` for code and evaluation details.
+            objectives: Names from `OBJECTIVES`, all maximized.
+        """
+        super().__init__(max_size, store=store)
+        unknown = [name for name in objectives if name not in OBJECTIVES]
+        if unknown:
+            raise ValueError(f"Unknown objectives: {unknown}")
+        self.objectives = list(objectives)
+        self._vectors: Dict[int, Tuple[float, ...]] = {}  # id(individual) -> objective vector
+
+    def objective_vector(self, code: str, fitness: float, metadata: Dict[str, Any] | None) -> Tuple[float, ...]:
+        metadata = metadata or {}
+        correct = passed_all_tests(metadata)
+        return tuple(OBJECTIVES[name](code, fitness, metadata) if correct or name == "fitness" else 0.0
+                     for name in self.objectives)
+
+    def add_individual(self, code: str, fitness: float, metadata: Dict[str, Any] = None) -> Individual | None:
+        """
+        Adds a program if no member is at least as good on every objective.
+
+        Returns:
+            The stored individual, or None if it is dominated by (or equal to) a member.
+        """
+        vector = self.objective_vector(code, fitness, metadata)
+        dominated = []
+        for member in self.individuals:
+            member_vector = self._vectors[id(member)]
+            if member_vector == vector or dominates(member_vector, vector):
+                return None
+            if dominates(vector, member_vector):
+                dominated.append(member)
+        for member in dominated:
+            self._remove(self._position_of(member))
+
+        individual = self._insert(code, fitness, metadata)
+        self._vectors[id(individual)] = vector
+        self._maintain_size()
+        # The newcomer itself may have been the most crowded member
+        return individual if id(individual) in self._vectors else None
+
+    def _remove(self, position: int) -> Individual:
+        removed = super()._remove(position)
+        del self._vectors[id(removed)]
+        return removed
+
+    def admission_threshold(self) -> float:
+        # Low fitness can still be non-dominated, so there is no single fitness cutoff
+        return float("-inf")
+
+    def _maintain_size(self):
+        """Evicts the most crowded members beyond max_size; the least fit breaks ties."""
+        while len(self.individuals) > self.max_size:
+            distances = self._crowding_distances()
+            position = min(range(len(self.individuals)), key=lambda i: (distances[i], -i))
+            self._remove(position)
+
+    def _crowding_distances(self) -> List[float]:
+        vectors = [self._vectors[id(member)] for member in self.individuals]
+        distances = [0.0] * len(vectors)
+        for k in range(len(self.objectives)):
+            order = sorted(range(len(vectors)), key=lambda i: vectors[i][k])
+            low, high = vectors[order[0]][k], vectors[order[-1]][k]
+            distances[order[0]] = distances[order[-1]] = float("inf")
+            if high == low:
+                continue
+            for previous, current, following in zip(order, order[1:], order[2:]):
+                distances[current] += (vectors[following][k] - vectors[previous][k]) / (high - low)
+        return distances
+
+    def stats(self) -> Dict[str, Any]:
+        return {"front_size": len(self.individuals), "objectives": self.objectives}
+
+
+ARCHIVES = ("population", "map_elites", "pareto")
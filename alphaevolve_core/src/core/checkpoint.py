@@ -0,0 +1,104 @@
+import json
+import queue
+import sqlite3
+import threading
+from typing import List, Dict, Any, Tuple, Iterator
+
+class CheckpointWriter:
+    def __init__(self, path: str, snapshot_interval: int = 10):
+        """
+        Writes incremental checkpoints of an evolution run to an append-only SQLite log.
+
+        Each checkpoint appends only the individuals admitted since the previous one,
+        plus the run state (generation counter, RNG state) as JSON. Every
+        `snapshot_interval`-th checkpoint replaces the log with the surviving population,
+        so resuming costs the population size rather than the run length. Writes happen
+        on a background thread so they never stall the evolutionary loop.
+
+        Args:
+            path: The SQLite checkpoint file; an existing file is appended to.
+            snapshot_interval: Checkpoints between snapshots of the survivors.
+        """
+        self.path = path
+        self.snapshot_interval = snapshot_interval
+        self._queue: queue.Queue = queue.Queue()
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._write_loop, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, individuals: List[Tuple[str, float, Dict[str, Any]]], state: Dict[str, Any],
+               survivors: List[Tuple[str, float, Dict[str, Any]]] | None = None):
+        """
+        Queues a checkpoint; returns immediately.
+
+        Args:
+            individuals: (code, fitness, details) admitted since the previous checkpoint.
+            state: JSON-serializable run state.
+            survivors: The current population, best first; when given, it replaces the
+                logged admissions instead of `individuals` being appended.
+        """
+        if self._error is not None:
+            raise RuntimeError(f"Checkpoint writer failed: {self._error}")
+        self._queue.put((individuals, state, survivors))
+
+    def _write_loop(self):
+        db = sqlite3.connect(self.path)
+        db.execute("CREATE TABLE IF NOT EXISTS individuals "
+                   "(seq INTEGER PRIMARY KEY AUTOINCREMENT, generation INTEGER, code TEXT, fitness REAL, details TEXT)")
+        db.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value BLOB)")
+        db.commit()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                individuals, state, survivors = item
+                generation = state.get("generation", 0)
+                if survivors is not None:
+                    # Replaying the survivors best first rebuilds the same population
+                    db.execute("DELETE FROM individuals")
+                    individuals = survivors
+                db.executemany("INSERT INTO individuals (generation, code, fitness, details) VALUES (?, ?, ?, ?)",
+                               [(generation, code, fitness, json.dumps(details or {}, default=repr))
+                                for code, fitness, details in individuals])
+                db.executemany("INSERT OR REPLACE INTO state VALUES (?, ?)",
+                               [(key, json.dumps(value)) for key, value in state.items()])
+                db.commit()
+        except BaseException as e:
+            self._error = e
+            raise
+        finally:
+            db.close()
+
+    def close(self):
+        """Flushes pending checkpoints and stops the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+
+def load_checkpoint(path: str) -> Tuple[Iterator[Tuple[str, float, Dict[str, Any]]], Dict[str, Any]]:
+    """
+    Reads a checkpoint file. Only JSON is decoded, so a checkpoint from an untrusted
+    source cannot run code.
+
+    Returns:
+        A tuple containing:
+            - individuals: An iterator over (code, fitness, details) in admission order.
+            - state: The run state saved with the latest checkpoint.
+    """
+    db = sqlite3.connect(path)
+    try:
+        state = {key: json.loads(value) for key, value in db.execute("SELECT key, value FROM state")}
+    except ValueError:
+        db.close()
+        raise ValueError(f"{path} holds pickled run state from an older version; "
+                         f"start a new checkpoint instead of resuming it.") from None
+
+    def individuals():
+        try:
+            for code, fitness, details in db.execute("SELECT code, fitness, details FROM individuals ORDER BY seq"):
+                yield code, fitness, json.loads(details)
+        finally:
+            db.close()
+
+    return individuals(), state
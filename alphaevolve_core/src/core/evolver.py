@@ -1,39 +1,185 @@
+import asyncio
+import contextlib
+import random
 import time
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
 
-from alphaevolve_core.src.core.population import Population
-from alphaevolve_core.src.core.selection import SelectionStrategy, TournamentSelection
-from alphaevolve_core.src.evaluation.fitness import FitnessEvaluator
-from alphaevolve_core.src.evaluation.sandbox import DockerSandbox # Assuming DockerSandbox is used
+from alphaevolve_core.src.core.archive import MapElitesArchive, ParetoArchive, ARCHIVES
+from alphaevolve_core.src.core.checkpoint import CheckpointWriter, load_checkpoint
+from alphaevolve_core.src.core.population import Population, ProgramStore
+from alphaevolve_core.src.core.scheduler import ModelRouter, CorrectionPolicy, RunBudget
+from alphaevolve_core.src.core.selection import SelectionStrategy, TournamentSelection, UniformSelection
+from alphaevolve_core.src.evaluation.eval_cache import EvaluationCache
+from alphaevolve_core.src.evaluation.fitness import FitnessEvaluator, RacingEvaluator
+from alphaevolve_core.src.evaluation.performance import PerformanceObjective
+from alphaevolve_core.src.evaluation.prefilter import StaticPreFilter
+from alphaevolve_core.src.evaluation.sandbox_pool import SandboxPool
 from alphaevolve_core.src.llm_services.gemini_client import GeminiClient
+from alphaevolve_core.src.llm_services.rate_limit import RateLimiter, RetryPolicy
+from alphaevolve_core.src.llm_services.stub_client import StubLLMClient
+from alphaevolve_core.src.llm_services.response_cache import ResponseCache, Cassette
+from alphaevolve_core.src.llm_services.prompt_budget import PromptBudget
 from alphaevolve_core.src.llm_services.prompt_generation import EvolvePromptGenerator
 from alphaevolve_core.src.llm_services.program_generation import ProgramGenerator
 from alphaevolve_core.src.llm_services.program_correction import ProgramCorrector
+from alphaevolve_core.src.utils.telemetry import Telemetry
 
 class Evolver:
     def __init__(self, project_def: Any, population_size: int = 50, generations: int = 100,
-                 tournament_size: int = 5, gemini_model: str = "gemini-1.5-flash-latest"):
+                 tournament_size: int = 5, gemini_model: str = "gemini-1.5-flash-latest",
+                 sandbox_workers: int = 0, sandbox_backend: str = "auto", eval_workers: int | None = None,
+                 eval_cache_path: str | None = None, eval_cache_size: int = 10000,
+                 llm_cache_size: int = 0, llm_cache_path: str | None = None, llm_cache_ttl: float | None = None,
+                 cassette_path: str | None = None, cassette_mode: str = "replay",
+                 generation_mode: str = "meta", candidates_per_call: int = 4,
+                 llm_backend: str = "gemini", requests_per_minute: float | None = None,
+                 tokens_per_minute: float | None = None, max_retries: int = 4,
+                 program_store_path: str | None = None,
+                 checkpoint_path: str | None = None, checkpoint_interval: int = 1,
+                 performance_weight: float = 0.0, benchmark_repeats: int = 5,
+                 archive: str = "population", archive_descriptors: List[str] | None = None,
+                 archive_bins: int = 8, cvt_cells: int = 0, pareto_objectives: List[str] | None = None,
+                 selection: str = "tournament", prefilter: bool = True,
+                 allowed_imports: List[str] | None = None, suite_sample_size: int = 0,
+                 racing: bool = False, racing_confidence: float = 0.95, racing_initial_cases: int = 8,
+                 prompt_token_budget: int | None = None, telemetry_path: str | None = None,
+                 metrics_port: int | None = None, metrics_host: str = "127.0.0.1",
+                 profile_dir: str | None = None, quiet: bool = False,
+                 strong_model: str | None = None, strong_cost: float = 10.0, routing_patience: int = 5,
+                 correction_policy: str = "always", min_correction_gain: float = 0.02,
+                 max_correction_attempts: int = 1, token_budget: int | None = None,
+                 time_budget: float | None = None, seed: int | None = None):
         self.project_def = project_def
         self.population_size = population_size
         self.generations = generations
         self.tournament_size = tournament_size
         self.gemini_model = gemini_model
+        self.eval_workers = eval_workers
+        # "meta" asks the LLM for a prompt and then for code, "direct" asks for code in one call and
+        # "batched" asks for `candidates_per_call` diverse programs in one call
+        if generation_mode not in ("meta", "direct", "batched"):
+            raise ValueError(f"Unknown generation mode: {generation_mode}")
+        self.generation_mode = generation_mode
+        self.candidates_per_call = candidates_per_call
+        self.offspring_evaluated = 0
+        # Spans, LLM histograms and per-generation gauges, written as JSONL and/or served to Prometheus.
+        # Quiet mode drops the per-offspring prints (whole prompts and programs) in favour of these.
+        self.quiet = quiet
+        self.telemetry = Telemetry(path=telemetry_path, prometheus_port=metrics_port, profile_dir=profile_dir,
+                                   prometheus_host=metrics_host)
+        # A pool of warm sandbox workers; 0 keeps the placeholder evaluator. Workers map a columnar
+        # test suite straight from its directory.
+        suite = project_def.test_suite
+        self.sandbox = None
+        if sandbox_workers > 0:
+            self.sandbox = SandboxPool(size=sandbox_workers, backend=sandbox_backend,
+                                       shared_dirs=[suite.directory] if suite is not None else None)
 
-        self.gemini_client = GeminiClient(model_name=self.gemini_model)
-        self.prompt_generator = EvolvePromptGenerator(self.gemini_client)
-        self.program_generator = ProgramGenerator(self.gemini_client)
-        self.program_corrector = ProgramCorrector(self.gemini_client)
-        self.fitness_evaluator = FitnessEvaluator() # Sandbox will be initialized within evaluate
-        self.selection_strategy: SelectionStrategy = TournamentSelection(self.tournament_size)
-        self.population = Population(max_size=self.population_size)
+        self.llm_cache = None
+        if llm_cache_size > 0 or llm_cache_path:
+            self.llm_cache = ResponseCache(max_entries=llm_cache_size or 1000, ttl=llm_cache_ttl, path=llm_cache_path)
+        # A cassette records responses, or replays them so a run can be benchmarked offline
+        self.cassette = Cassette(cassette_path, mode=cassette_mode) if cassette_path else None
+        client_options = dict(cache=self.llm_cache, cassette=self.cassette,
+                              rate_limiter=RateLimiter(requests_per_minute, tokens_per_minute),
+                              retry_policy=RetryPolicy(max_retries=max_retries), telemetry=self.telemetry)
+        if llm_backend == "stub":
+            self.gemini_client = StubLLMClient(**client_options)
+        else:
+            self.gemini_client = GeminiClient(model_name=self.gemini_model, **client_options)
+        self.llm_clients = [self.gemini_client]
+        # With a strong model, each generation and correction call goes to whichever tier has paid
+        # off best per unit of cost for parents of that fitness; `gemini_model` is the cheap tier
+        self.router = None
+        llm = self.gemini_client
+        if strong_model:
+            if llm_backend == "stub":
+                strong_client = StubLLMClient(model_name=f"stub:{strong_model}", **client_options)
+            else:
+                strong_client = GeminiClient(model_name=strong_model, **client_options)
+            self.llm_clients.append(strong_client)
+            self.router = llm = ModelRouter({"cheap": self.gemini_client, "strong": strong_client},
+                                            costs={"cheap": 1.0, "strong": strong_cost}, patience=routing_patience,
+                                            seed=seed)
+        self.stalled = 0  # Offspring in a row that did not beat their best parent
+        # "always" corrects every imperfect offspring once; "adaptive" skips corrections whose
+        # learned expected gain is too small, and retries up to `max_correction_attempts` otherwise
+        if correction_policy not in ("always", "adaptive"):
+            raise ValueError(f"Unknown correction policy: {correction_policy}")
+        # Both draw from their own generators, seeded from the run seed so that seeded runs repeat
+        self.correction_policy = CorrectionPolicy(min_expected_gain=min_correction_gain,
+                                                  seed=None if seed is None else seed + 1) \
+            if correction_policy == "adaptive" else None
+        self.max_correction_attempts = max_correction_attempts
+        # The run stops once the LLM tokens of all tiers or the wall-clock time since the loop started
+        # reach their cap
+        self.run_budget = RunBudget(self.llm_clients, max_tokens=token_budget, max_seconds=time_budget)
+        # Parents and errors are compacted to fit the budget; prompts are counted either way
+        self.prompt_budget = PromptBudget(max_tokens=prompt_token_budget)
+        self.prompt_generator = EvolvePromptGenerator(llm, budget=self.prompt_budget, verbose=not quiet)
+        self.program_generator = ProgramGenerator(llm, verbose=not quiet)
+        self.program_corrector = ProgramCorrector(llm, budget=self.prompt_budget, verbose=not quiet)
+        # Identical or trivially different programs are scored once, across restarts with a cache path
+        self.eval_cache = EvaluationCache(max_entries=eval_cache_size, path=eval_cache_path)
+        # Programs that cannot pass any test are rejected in-process instead of costing a sandbox run
+        self.prefilter = StaticPreFilter(allowed_imports=allowed_imports) if prefilter else None
+        # With a performance weight, correct programs are benchmarked and faster ones score above 1.0
+        self.performance = PerformanceObjective(weight=performance_weight) if performance_weight > 0 else None
+        if self.performance is not None and self.sandbox is None:
+            print("Warning: performance-aware fitness needs sandbox workers; scoring correctness only.")
+        evaluator_options = dict(sandbox=self.sandbox, cache=self.eval_cache, performance=self.performance,
+                                 benchmark_repeats=benchmark_repeats, suite_sample_size=suite_sample_size,
+                                 verbose=not quiet)
+        if racing:
+            # Offspring that cannot beat the worst kept individual stop after a few test cases
+            self.fitness_evaluator = RacingEvaluator(threshold=lambda: self.population.admission_threshold(),
+                                                     initial_cases=racing_initial_cases,
+                                                     confidence=racing_confidence, **evaluator_options)
+        else:
+            self.fitness_evaluator = FitnessEvaluator(**evaluator_options)
+        # A correct program ends the run unless there is still speed to gain
+        self.target_fitness = 1.0 if self.performance is None else float("inf")
+        if selection == "uniform":
+            self.selection_strategy: SelectionStrategy = UniformSelection()
+        elif selection == "tournament":
+            self.selection_strategy = TournamentSelection(self.tournament_size)
+        else:
+            raise ValueError(f"Unknown selection strategy: {selection}")
+        # Code and evaluation details are interned apart from the fitness index; they only move out of
+        # memory, to SQLite, when a store path is given
+        self.program_store = ProgramStore(path=program_store_path)
+        # "population" keeps the top programs by fitness; "map_elites" keeps the best program per
+        # behavioural cell and "pareto" the non-dominated programs, which preserves diverse parents
+        if archive not in ARCHIVES:
+            raise ValueError(f"Unknown archive: {archive}")
+        self.archive = archive
+        # A single elite or a front of one is a valid archive to select from
+        self.min_population = 2 if archive == "population" else 1
+        if archive == "map_elites":
+            archive_options = {"descriptors": archive_descriptors} if archive_descriptors else {}
+            self.population = MapElitesArchive(max_size=self.population_size, store=self.program_store,
+                                               bins=archive_bins, cvt_cells=cvt_cells, **archive_options)
+        elif archive == "pareto":
+            archive_options = {"objectives": pareto_objectives} if pareto_objectives else {}
+            self.population = ParetoArchive(max_size=self.population_size, store=self.program_store,
+                                            **archive_options)
+        else:
+            self.population = Population(max_size=self.population_size, store=self.program_store)
+        self.start_generation = 0
+
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_writer = None
+        self.checkpoints_written = 0
+        if checkpoint_path:
+            self.checkpoint_writer = CheckpointWriter(checkpoint_path)
+            self.population.journal = []
 
     def initialize_population(self, initial_programs: list[str] = None):
         """Initializes the population, optionally with provided programs."""
         if initial_programs:
             print(f"Initializing population with {len(initial_programs)} provided programs.")
-            for code in initial_programs:
-                fitness, details = self.fitness_evaluator.evaluate(code, self.project_def)
-                self.population.add_individual(code, fitness, metadata=details)
+            programs = list(initial_programs)
         else:
             print("Initializing population by generating initial programs...")
             # Generate a few initial programs directly from the project description
@@ -41,74 +187,480 @@ class Evolver:
 Implement the function with the signature: {self.project_def.signature}
 Output only the Python code for the function within a single triple backtick block.
 """
-            for _ in range(min(5, self.population_size)): # Generate a few initial individuals
-                 code = self.program_generator.generate_program(initial_prompt)
-                 if code:
-                     fitness, details = self.fitness_evaluator.evaluate(code, self.project_def)
-                     self.population.add_individual(code, fitness, metadata=details)
-
-    def evolve(self):
-        """Runs the main evolutionary loop."""
+            num_initial = min(5, self.population_size) # Generate a few initial individuals
+            if self.generation_mode == "batched":
+                batch_prompt = self.prompt_generator.generate_direct_prompt(self.project_def, num_candidates=num_initial)
+                programs = self.program_generator.generate_programs(batch_prompt, num_initial)
+            else:
+                programs = []
+                for _ in range(num_initial):
+                     code = self.program_generator.generate_program(initial_prompt)
+                     if code:
+                         programs.append(code)
+
+        # Seeding takes about as long as the slowest program rather than the sum of all of them
+        for code, fitness, details in self._evaluate_offspring(programs):
+            self.population.add_individual(code, fitness, metadata=details)
+
+    def evolve(self, on_generation: Callable[[int], bool] | None = None):
+        """
+        Runs the main evolutionary loop.
+
+        Args:
+            on_generation: Optional hook called with the zero-based generation index after
+                each generation (e.g. for island migration); returning True stops the run.
+        """
         print("Starting evolutionary process...")
         start_time = time.time()
+        self.run_budget.start()
 
-        for generation in range(self.generations):
-            print(f"\n--- Generation {generation + 1}/{self.generations} ---")
+        # Only generations that ran to the end are checkpointed, so a resumed run repeats a stopped one
+        completed = self.start_generation
+        for generation in range(self.start_generation, self.generations):
+            self._log(f"\n--- Generation {generation + 1}/{self.generations} ---")
 
-            if len(self.population) < 2: # Need at least two individuals for selection
+            if len(self.population) < self.min_population: # Need enough individuals for selection
                  print("Population size too small for evolution. Stopping.")
                  break
+            exhausted = self.run_budget.exhausted()
+            if exhausted:
+                print(f"\n{exhausted} Stopping.")
+                break
+
+            generation_start = time.perf_counter()
+            with self.telemetry.profile(f"generation-{generation + 1}"):
+                # Selection
+                with self.telemetry.span("select", generation=generation + 1):
+                    parents = self.selection_strategy.select(self.population.individuals, num_parents=2) # Select 2 parents
+
+                # Evolution (Generate offspring)
+                parent_fitness = max(parent['fitness'] for parent in parents)
+                tier = self._route("generate", parent_fitness)
+                offspring = self._generate_offspring(parents, tier)
 
-            # Selection
-            parents = self.selection_strategy.select(self.population.individuals, num_parents=2) # Select 2 parents
-
-            # Evolution (Generate offspring)
-            evolve_prompt = self.prompt_generator.generate_evolve_prompt(self.project_def, parents)
-            offspring_code = self.program_generator.generate_program(evolve_prompt)
-
-            if offspring_code:
-                # Evaluation
-                fitness, eval_details = self.fitness_evaluator.evaluate(offspring_code, self.project_def)
-                final_offspring_code = offspring_code
-
-                # Program Correction (Optional)
-                if fitness < 1.0: # Assuming 1.0 is perfect fitness
-                    print("Attempting to correct offspring...")
-                    corrected_code = self.program_corrector.correct_program(offspring_code, eval_details, self.project_def)
-                    if corrected_code and corrected_code != offspring_code:
-                        print("Correction successful. Re-evaluating corrected code.")
-                        corrected_fitness, corrected_details = self.fitness_evaluator.evaluate(corrected_code, self.project_def)
-                        if corrected_fitness > fitness: # Only use corrected code if it's better
-                            fitness = corrected_fitness
-                            final_offspring_code = corrected_code
-                            eval_details = corrected_details
-                            print(f"Corrected code improved fitness to {fitness}")
-                        else:
-                             print("Corrected code did not improve fitness.")
-                    else:
-                         print("Correction did not result in different or valid code.")
-
-
-                # Population Update
-                self.population.add_individual(final_offspring_code, fitness, metadata=eval_details)
-                print(f"Added offspring with fitness: {fitness}")
+                if offspring:
+                    # Evaluation
+                    scored = self._evaluate_offspring(offspring)
+                    self._record_generate(tier, parent_fitness, scored[0][1])
+
+                    # Program Correction (Optional), spent on the most promising candidate only
+                    attempts = 0
+                    offspring_code, fitness, eval_details = scored[0]
+                    while self._should_correct(fitness, eval_details, attempts): # Assuming 1.0 is perfect fitness
+                        attempts += 1
+                        self._log("Attempting to correct offspring...")
+                        tier = self._route("correct", fitness)
+                        with self.telemetry.span("correct", generation=generation + 1, tier=tier):
+                            corrected_code = self._correct(offspring_code, eval_details, tier)
+                        corrected = self._adopt_correction(offspring_code, fitness, eval_details, corrected_code)
+                        self._record_correction(tier, fitness, eval_details, corrected[1])
+                        scored[0] = offspring_code, fitness, eval_details = corrected
+
+                    # Population Update
+                    for final_offspring_code, fitness, eval_details in scored:
+                        self.population.add_individual(final_offspring_code, fitness, metadata=eval_details)
+                        self.offspring_evaluated += 1
+                        self._log(f"Added offspring with fitness: {fitness}")
 
             # Log progress
             best_fitness = self.population.get_fittest()['fitness'] if self.population.get_fittest() else 0.0
             avg_fitness = self.population.get_average_fitness()
             print(f"Population size: {len(self.population)}, Best Fitness: {best_fitness:.4f}, Average Fitness: {avg_fitness:.4f}")
+            self._record_generation(generation + 1, time.perf_counter() - generation_start)
+            if not self.quiet:
+                self._report_evaluation_stats()
+            completed = generation + 1
+
+            if completed % self.checkpoint_interval == 0:
+                self.checkpoint(completed)
 
             # Check termination condition
-            if best_fitness >= 1.0:
+            if best_fitness >= self.target_fitness:
                 print("\nSolution found!")
                 break
+            if on_generation is not None and on_generation(generation):
+                print("\nStopped by generation hook.")
+                break
 
+        self.checkpoint(completed)
         end_time = time.time()
-        print(f"\nEvolution finished after {generation + 1} generations in {end_time - start_time:.2f} seconds.")
+        print(f"\nEvolution finished after {completed} generations in {end_time - start_time:.2f} seconds.")
+        self._report_llm_usage()
+        self._report_telemetry()
+        self._print_fittest()
+
+    def _route(self, kind: str, fitness: float) -> str | None:
+        """Picks the model tier for a generation or correction call; None without a router."""
+        if self.router is None:
+            return None
+        return self.router.choose(kind, fitness, stalled=self.stalled, budget_left=self.run_budget.left())
+
+    def _record_generate(self, tier: str | None, parent_fitness: float, fitness: float):
+        improved = fitness > parent_fitness
+        self.stalled = 0 if improved else self.stalled + 1
+        if self.router is not None:
+            self.router.record("generate", tier, parent_fitness, improved)
+
+    def _should_correct(self, fitness: float, eval_details: Dict[str, Any], attempts: int) -> bool:
+        """Whether another correction call is worth it for an offspring corrected `attempts` times."""
+        if fitness >= 1.0 or attempts >= self.max_correction_attempts:
+            return False
+        return self.correction_policy is None or self.correction_policy.should_correct(fitness, eval_details)
+
+    def _tier_context(self, tier: str | None):
+        """Sends the LLM calls made inside the block to the model of `tier`; a no-op without a router."""
+        return self.router.use(tier) if tier is not None else contextlib.nullcontext()
+
+    def _correct(self, offspring_code: str, eval_details: Dict[str, Any], tier: str | None) -> str:
+        with self._tier_context(tier):
+            return self.program_corrector.correct_program(offspring_code, eval_details, self.project_def)
+
+    async def _correct_async(self, offspring_code: str, eval_details: Dict[str, Any], tier: str | None) -> str:
+        with self._tier_context(tier):
+            return await self.program_corrector.correct_program_async(offspring_code, eval_details,
+                                                                      self.project_def)
+
+    def _record_correction(self, tier: str | None, fitness: float, eval_details: Dict[str, Any],
+                           corrected_fitness: float):
+        if self.correction_policy is not None:
+            self.correction_policy.record(fitness, eval_details, corrected_fitness)
+        if self.router is not None:
+            self.router.record("correct", tier, fitness, corrected_fitness > fitness)
+
+    def _generate_offspring(self, parents: List[Dict[str, Any]], tier: str | None = None) -> List[str]:
+        """Asks the LLM (the model of `tier` when routing) for offspring code in the configured generation mode."""
+        with self._tier_context(tier):
+            return self._generate_offspring_in_mode(parents)
+
+    def _generate_offspring_in_mode(self, parents: List[Dict[str, Any]]) -> List[str]:
+        if self.generation_mode == "meta":
+            # Two hops: the LLM writes a prompt, which is then sent off again for code
+            with self.telemetry.span("prompt", mode="meta"):
+                evolve_prompt = self.prompt_generator.generate_evolve_prompt(self.project_def, parents)
+            with self.telemetry.span("generate", mode="meta"):
+                offspring_code = self.program_generator.generate_program(evolve_prompt)
+            return [offspring_code] if offspring_code else []
+        if self.generation_mode == "direct":
+            with self.telemetry.span("prompt", mode="direct"):
+                prompt = self.prompt_generator.generate_direct_prompt(self.project_def, parents)
+            with self.telemetry.span("generate", mode="direct"):
+                offspring_code = self.program_generator.generate_program(prompt)
+            return [offspring_code] if offspring_code else []
+        with self.telemetry.span("prompt", mode="batched"):
+            prompt = self.prompt_generator.generate_direct_prompt(self.project_def, parents,
+                                                                  num_candidates=self.candidates_per_call)
+        with self.telemetry.span("generate", mode="batched"):
+            return self.program_generator.generate_programs(prompt, self.candidates_per_call)
+
+    async def _generate_offspring_async(self, parents: List[Dict[str, Any]], tier: str | None = None) -> List[str]:
+        """`_generate_offspring` for the steady-state loop: awaits the client instead of blocking a thread."""
+        with self._tier_context(tier):
+            if self.generation_mode == "meta":
+                with self.telemetry.span("prompt", mode="meta"):
+                    evolve_prompt = await self.prompt_generator.generate_evolve_prompt_async(self.project_def, parents)
+                with self.telemetry.span("generate", mode="meta"):
+                    offspring_code = await self.program_generator.generate_program_async(evolve_prompt)
+                return [offspring_code] if offspring_code else []
+            num_candidates = self.candidates_per_call if self.generation_mode == "batched" else 1
+            with self.telemetry.span("prompt", mode=self.generation_mode):
+                prompt = self.prompt_generator.generate_direct_prompt(self.project_def, parents,
+                                                                      num_candidates=num_candidates)
+            with self.telemetry.span("generate", mode=self.generation_mode):
+                if num_candidates > 1:
+                    return await self.program_generator.generate_programs_async(prompt, num_candidates)
+                offspring_code = await self.program_generator.generate_program_async(prompt)
+            return [offspring_code] if offspring_code else []
+
+    def _prefilter(self, programs: List[str]) -> Tuple[List[str], List[Tuple[str, float, Dict[str, Any]]]]:
+        """Splits programs into those worth running and (code, 0.0, details) for the rejected ones."""
+        if self.prefilter is None:
+            return list(programs), []
+        passed, rejected = [], []
+        for program in programs:
+            code, rejection = self.prefilter.check(program, self.project_def)
+            if rejection is None:
+                passed.append(code)
+            else:
+                self._log(rejection["errors"])
+                rejected.append((code, 0.0, rejection))
+        return passed, rejected
+
+    def _evaluate_offspring(self, offspring: List[str]) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """Evaluates candidate programs and returns (code, fitness, details) sorted best first."""
+        with self.telemetry.span("evaluate", programs=len(offspring)):
+            offspring, scored = self._prefilter(offspring)
+            if len(offspring) == 1:
+                fitness, eval_details = self.fitness_evaluator.evaluate(offspring[0], self.project_def)
+                scored.append((offspring[0], fitness, eval_details))
+            elif offspring:
+                scored.extend((offspring[i], fitness, eval_details) for i, fitness, eval_details in
+                              self.fitness_evaluator.evaluate_many(offspring, self.project_def,
+                                                                   max_workers=self.eval_workers))
+        scored.sort(key=lambda x: x[1], reverse=True)
+        return scored
+
+    def _adopt_correction(self, offspring_code: str, fitness: float, eval_details: Dict[str, Any],
+                          corrected_code: str) -> Tuple[str, float, Dict[str, Any]]:
+        """Re-evaluates corrected code and keeps whichever version scores better."""
+        if not corrected_code or corrected_code == offspring_code:
+            self._log("Correction did not result in different or valid code.")
+            return offspring_code, fitness, eval_details
+
+        self._log("Correction successful. Re-evaluating corrected code.")
+        corrected_code, corrected_fitness, corrected_details = self._evaluate_offspring([corrected_code])[0]
+        if corrected_fitness > fitness: # Only use corrected code if it's better
+            self._log(f"Corrected code improved fitness to {corrected_fitness}")
+            return corrected_code, corrected_fitness, corrected_details
+        self._log("Corrected code did not improve fitness.")
+        return offspring_code, fitness, eval_details
+
+    def evolve_async(self, concurrency: int = 4, max_llm_requests: int | None = None):
+        """
+        Runs a steady-state evolutionary loop with several offspring in flight at once.
+
+        Each of the `concurrency` workers repeatedly runs an independent
+        select -> prompt -> generate -> evaluate -> correct chain and adds its child to
+        the population as soon as it is scored. `self.generations` is the total number of
+        offspring produced, matching one offspring per generation in `evolve`; each counts
+        as one generation for checkpoints.
+
+        Args:
+            concurrency: Number of offspring in flight at once.
+            max_llm_requests: Cap on outstanding LLM requests across all workers
+                (defaults to `concurrency`).
+        """
+        return asyncio.run(self._steady_state(concurrency, max_llm_requests or concurrency))
+
+    async def _steady_state(self, concurrency: int, max_llm_requests: int):
+        print(f"Starting steady-state evolution with {concurrency} offspring in flight...")
+        # LLM calls are awaited on the event loop through the clients' async API; only evaluation blocks,
+        # on an executor sized so that no worker waits for a thread
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+        llm_slots = asyncio.Semaphore(max_llm_requests)
+        solved = asyncio.Event()
+        start_time = time.time()
+        self.run_budget.start()
+        self.offspring_started = 0
+        evaluated_at_start = self.offspring_evaluated
+        chains_done = 0
+
+        async def call_llm(request):
+            async with llm_slots:
+                return await request
+
+        async def worker():
+            nonlocal chains_done
+            # The shared counter is the back-pressure: no worker starts a child beyond the budget
+            while self.offspring_started < self.generations - self.start_generation and not solved.is_set():
+                if len(self.population) < self.min_population:
+                    print("Population size too small for evolution. Stopping.")
+                    solved.set()
+                    return
+                exhausted = self.run_budget.exhausted()
+                if exhausted:
+                    print(f"\n{exhausted} Stopping.")
+                    solved.set()
+                    return
+                self.offspring_started += 1
+
+                with self.telemetry.span("select"):
+                    parents = self.selection_strategy.select(self.population.individuals, num_parents=2)
+                parent_fitness = max(parent['fitness'] for parent in parents)
+                tier = self._route("generate", parent_fitness)
+                offspring = await call_llm(self._generate_offspring_async(parents, tier))
+                if not offspring:
+                    continue
+
+                scored = await asyncio.to_thread(self._evaluate_offspring, offspring)
+                self._record_generate(tier, parent_fitness, scored[0][1])
+                attempts = 0
+                offspring_code, fitness, eval_details = scored[0]
+                while self._should_correct(fitness, eval_details, attempts):
+                    attempts += 1
+                    tier = self._route("correct", fitness)
+                    with self.telemetry.span("correct", tier=tier):
+                        corrected_code = await call_llm(self._correct_async(offspring_code, eval_details, tier))
+                    corrected = await asyncio.to_thread(
+                        self._adopt_correction, offspring_code, fitness, eval_details, corrected_code)
+                    self._record_correction(tier, fitness, eval_details, corrected[1])
+                    scored[0] = offspring_code, fitness, eval_details = corrected
+
+                for final_offspring_code, fitness, eval_details in scored:
+                    self.population.add_individual(final_offspring_code, fitness, metadata=eval_details)
+                    self.offspring_evaluated += 1
+                fitness = max(fitness for _, fitness, _ in scored)
+                chains_done += 1
+                elapsed_minutes = max(time.time() - start_time, 1e-9) / 60
+                self._log(f"Offspring {self.start_generation + chains_done}/{self.generations} added with fitness: {fitness}. "
+                          f"Best Fitness: {self.population.get_fittest()['fitness']:.4f}, "
+                          f"Throughput: {(self.offspring_evaluated - evaluated_at_start) / elapsed_minutes:.1f} offspring/min")
+                if chains_done % concurrency == 0:
+                    self._record_generation(self.start_generation + chains_done, time.time() - start_time)
+                    if not self.quiet:
+                        self._report_evaluation_stats()
+                if chains_done % self.checkpoint_interval == 0:
+                    self.checkpoint(self.start_generation + chains_done)
+                if fitness >= self.target_fitness:
+                    print("\nSolution found!")
+                    solved.set()
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+        self.checkpoint(self.start_generation + chains_done)
+        end_time = time.time()
+        evaluated = self.offspring_evaluated - evaluated_at_start
+        print(f"\nSteady-state evolution finished after {evaluated} evaluated offspring "
+              f"in {end_time - start_time:.2f} seconds "
+              f"({evaluated / max(end_time - start_time, 1e-9) * 60:.1f} offspring/min).")
+        self._report_llm_usage()
+        self._report_telemetry()
+        self._print_fittest()
+
+    def checkpoint(self, generation: int):
+        """Queues an incremental checkpoint of the individuals admitted since the last one."""
+        if self.checkpoint_writer is None:
+            return
+        admitted, self.population.journal = self.population.journal, []
+        self.checkpoints_written += 1
+        survivors = None
+        if self.checkpoints_written % self.checkpoint_writer.snapshot_interval == 0:
+            survivors = [(ind.code, ind.fitness, ind.metadata) for ind in self.population.individuals]
+        self.checkpoint_writer.submit(admitted, {
+            "generation": generation,
+            "rng_state": random.getstate(),
+            "offspring_evaluated": self.offspring_evaluated,
+        }, survivors=survivors)
+
+    def resume(self, checkpoint_path: str):
+        """
+        Rebuilds the population and run state from a checkpoint without re-evaluating programs.
+
+        Replaying admissions in their original order (or the last snapshot of the
+        survivors followed by later admissions) reproduces the population exactly,
+        including which individuals were evicted.
+        """
+        individuals, state = load_checkpoint(checkpoint_path)
+        journal, self.population.journal = self.population.journal, None
+        count = 0
+        for code, fitness, details in individuals:
+            self.population.add_individual(code, fitness, metadata=details)
+            count += 1
+        self.population.journal = journal
+        self.start_generation = state.get("generation", 0)
+        self.offspring_evaluated = state.get("offspring_evaluated", 0)
+        if "rng_state" in state:
+            version, internal_state, gauss_next = state["rng_state"]
+            random.setstate((version, tuple(internal_state), gauss_next))
+        print(f"Resumed from {checkpoint_path}: replayed {count} admissions, "
+              f"population size {len(self.population)}, continuing at generation {self.start_generation + 1}.")
+
+    def _log(self, message: str):
+        """Prints per-offspring progress, which quiet mode drops."""
+        if not self.quiet:
+            print(message)
+
+    def _record_generation(self, generation: int, seconds: float):
+        """Publishes population, cache and sandbox figures as gauges and one `generation` event."""
+        fittest = self.population.get_fittest()
+        best_fitness = fittest['fitness'] if fittest else 0.0
+        average_fitness = self.population.get_average_fitness()
+        cache_stats = self.eval_cache.stats()
+        telemetry = self.telemetry
+        telemetry.set_gauge("best_fitness", best_fitness)
+        telemetry.set_gauge("average_fitness", average_fitness)
+        telemetry.set_gauge("population_size", len(self.population))
+        telemetry.set_gauge("offspring_evaluated", self.offspring_evaluated)
+        telemetry.set_gauge("cache_hit_rate", cache_stats["hit_rate"], cache="evaluation")
+        event = {"generation": generation, "seconds": seconds, "best_fitness": best_fitness,
+                 "average_fitness": average_fitness, "population_size": len(self.population),
+                 "offspring_evaluated": self.offspring_evaluated, "eval_cache": cache_stats,
+                 "llm": self.gemini_client.metrics.snapshot()}
+        if self.llm_cache is not None:
+            event["llm_cache"] = self.llm_cache.stats()
+            telemetry.set_gauge("cache_hit_rate", event["llm_cache"]["hit_rate"], cache="llm")
+        if self.sandbox is not None:
+            event["sandbox"] = sandbox_stats = self.sandbox.stats()
+            telemetry.set_gauge("sandbox_queue_depth", sandbox_stats["queue_depth"])
+            telemetry.set_gauge("sandbox_peak_queue_depth", sandbox_stats["peak_queue_depth"])
+            telemetry.set_gauge("sandbox_utilisation", sandbox_stats["utilisation"])
+        if self.prefilter is not None:
+            event["prefilter"] = self.prefilter.stats()
+        if self.router is not None:
+            event["routing"] = self.router.stats()
+            event["llm_tiers"] = {client.model_name: client.metrics.snapshot() for client in self.llm_clients}
+            telemetry.set_gauge("llm_cost", event["routing"]["cost"])
+        if self.correction_policy is not None:
+            event["corrections"] = self.correction_policy.stats()
+        event["run_budget"] = self.run_budget.stats()
+        telemetry.emit("generation", **event)
+
+    def _report_evaluation_stats(self):
+        cache_stats = self.eval_cache.stats()
+        print(f"Evaluation cache: hit rate {cache_stats['hit_rate']:.1%} "
+              f"({cache_stats['hits']} hits, {cache_stats['misses']} misses), "
+              f"{cache_stats['seconds_saved']:.2f}s of evaluation saved")
+        if self.prefilter is not None:
+            print(f"Static pre-filter: {self.prefilter.stats()}")
+        if isinstance(self.fitness_evaluator, RacingEvaluator):
+            print(f"Racing: {self.fitness_evaluator.stats()}")
+        if self.sandbox is not None:
+            print(f"Sandbox pool: {self.sandbox.stats()}")
+        if self.llm_cache is not None:
+            print(f"LLM response cache: {self.llm_cache.stats()}")
+        if self.archive != "population":
+            print(f"Archive ({self.archive}): {self.population.stats()}")
+
+    def _report_llm_usage(self):
+        children = max(self.offspring_evaluated, 1)
+        requests = sum(client.metrics.requests for client in self.llm_clients)
+        total_tokens = sum(client.metrics.total_tokens for client in self.llm_clients)
+        prompt_tokens = sum(client.metrics.prompt_tokens for client in self.llm_clients)
+        print(f"LLM usage ({self.generation_mode} mode): {requests} calls, "
+              f"{total_tokens} tokens, "
+              f"{requests / children:.2f} calls and "
+              f"{total_tokens / children:.0f} tokens "
+              f"per evaluated child, "
+              f"{prompt_tokens / max(requests, 1):.0f} prompt tokens per call")
+        for client in self.llm_clients:
+            print(f"LLM client ({client.model_name}): {client.metrics.snapshot()}")
+        if self.router is not None:
+            print(f"Model routing: {self.router.stats()}")
+        if self.correction_policy is not None:
+            print(f"Correction policy: {self.correction_policy.stats()}")
+        if self.run_budget.max_tokens or self.run_budget.max_seconds:
+            print(f"Run budget: {self.run_budget.stats()}")
+        print(f"Prompt budget: {self.prompt_budget.stats()}")
+
+    def _report_telemetry(self):
+        spans = self.telemetry.span_summary()
+        if spans:
+            print("Span timings: " + ", ".join(
+                f"{name} {summary['count']}x mean {summary['mean'] * 1e3:.1f} ms (p95 {summary['p95'] * 1e3:.1f} ms)"
+                for name, summary in spans.items()))
+
+    def _print_fittest(self):
         print("Fittest individual:")
         fittest = self.population.get_fittest()
         if fittest:
             print(fittest['code'])
             print(f"Fitness: {fittest['fitness']}")
+            performance = fittest.get("performance")
+            if performance and "score" in performance:
+                print(f"Performance: {performance['wall_seconds'] * 1e3:.3f} ms and "
+                      f"{performance['peak_memory_bytes'] / 1024:.1f} KiB at n={performance['samples'][-1]['size']}, "
+                      f"empirical complexity {performance['complexity']} "
+                      f"(exponent {performance['complexity_exponent']:.2f}), score {performance['score']:.3f}")
         else:
             print("No individuals in the population.")
+
+    def close(self):
+        """Flushes checkpoints and releases the sandbox workers, the caches and the program store."""
+        if self.checkpoint_writer is not None:
+            self.checkpoint_writer.close()
+        if self.sandbox is not None:
+            self.sandbox.close()
+        self.eval_cache.close()
+        if self.llm_cache is not None:
+            self.llm_cache.close()
+        self.program_store.close()
+        self.telemetry.close()
@@ -0,0 +1,359 @@
+import ipaddress
+import json
+import multiprocessing as mp
+import os
+import queue
+import random
+import threading
+import time
+from collections import defaultdict
+from multiprocessing.connection import Listener, Client
+from typing import List, Dict, Any, Tuple
+
+from alphaevolve_core.src.core.population import Population
+
+TOPOLOGIES = ("ring", "full", "random")
+# Shared secret of the migration hub, unless given on the command line
+HUB_SECRET_ENV = "ALPHAEVOLVE_HUB_SECRET"
+
+
+def migration_targets(island: int, num_islands: int, topology: str, rng: random.Random) -> List[int]:
+    """Returns the islands that receive emigrants from `island`."""
+    if num_islands < 2:
+        return []
+    if topology == "ring":
+        return [(island + 1) % num_islands]
+    if topology == "full":
+        return [i for i in range(num_islands) if i != island]
+    if topology == "random":
+        return [rng.choice([i for i in range(num_islands) if i != island])]
+    raise ValueError(f"Unknown migration topology: {topology}")
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    host, port = address.rsplit(":", 1)
+    return host, int(port)
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def hub_authkey(address: str, secret: str | None = None) -> bytes:
+    """
+    Returns the shared secret that hub connections authenticate with.
+
+    The secret comes from `secret` or the ALPHAEVOLVE_HUB_SECRET environment variable.
+    Only a hub on a loopback address may run without one, because anyone who can
+    reach the port and knows the key can feed migrants to every island.
+
+    Raises:
+        ValueError: If the address is not a loopback address and no secret is set.
+    """
+    secret = secret or os.environ.get(HUB_SECRET_ENV)
+    if secret:
+        return secret.encode("utf-8")
+    if not _is_loopback(parse_address(address)[0]):
+        raise ValueError(f"The migration hub at {address} is reachable from other machines; set a shared "
+                         f"secret with --hub_secret or {HUB_SECRET_ENV}.")
+    return b"alphaevolve-loopback"
+
+
+def _send_json(connection, message: Any):
+    connection.send_bytes(json.dumps(message).encode("utf-8"))
+
+
+def _recv_json(connection) -> Any:
+    # Messages are JSON, never pickles, so a peer cannot make this process run code
+    return json.loads(connection.recv_bytes())
+
+
+class QueueTransport:
+    """Migration over multiprocessing queues, for islands on one machine."""
+
+    def __init__(self, num_islands: int, context=mp):
+        self.inboxes = [context.Queue() for _ in range(num_islands)]
+
+    def send(self, island: int, individuals: List[Dict[str, Any]]):
+        self.inboxes[island].put(individuals)
+
+    def receive(self, island: int) -> List[Dict[str, Any]]:
+        received = []
+        while True:
+            try:
+                received.extend(self.inboxes[island].get_nowait())
+            except queue.Empty:
+                return received
+
+    def drain(self):
+        """Discards undelivered migrants, e.g. those sent to islands that already finished."""
+        for island in range(len(self.inboxes)):
+            self.receive(island)
+
+
+def join_islands(processes: Dict[int, Any], transport):
+    """
+    Waits for the island processes to exit.
+
+    A process that sent migrants over a `QueueTransport` only exits once its queue
+    feeder thread has flushed them into the pipe, which blocks while the pipe is full.
+    Islands that finished early never read their inboxes again, so the inboxes are
+    drained while waiting; every island has reported back by then, so nothing is lost.
+    """
+    while any(process.is_alive() for process in processes.values()):
+        if isinstance(transport, QueueTransport):
+            transport.drain()
+        for process in processes.values():
+            process.join(timeout=0.1)
+
+
+class SocketTransport:
+    """Migration through a `MigrationHub`, for islands spread over several machines."""
+
+    def __init__(self, address: str, authkey: bytes):
+        self.address = address
+        self.authkey = authkey
+        self._connection = None
+
+    def __getstate__(self):
+        # Each island process opens its own connection
+        return {"address": self.address, "authkey": self.authkey, "_connection": None}
+
+    def _call(self, message: List[Any]):
+        if self._connection is None:
+            self._connection = Client(parse_address(self.address), authkey=self.authkey)
+        _send_json(self._connection, message)
+        return _recv_json(self._connection)
+
+    def send(self, island: int, individuals: List[Dict[str, Any]]):
+        self._call(["put", island, individuals])
+
+    def receive(self, island: int) -> List[Dict[str, Any]]:
+        return self._call(["get", island])
+
+
+class MigrationHub:
+    """A small mailbox server relaying emigrants, as JSON, between islands on any machine."""
+
+    def __init__(self, address: str, authkey: bytes):
+        self.listener = Listener(parse_address(address), authkey=authkey)
+        self.address = self.listener.address
+        self._mailboxes: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def serve_forever(self):
+        while True:
+            try:
+                connection = self.listener.accept()
+            except (mp.AuthenticationError, OSError, EOFError):
+                # A client without the shared secret is turned away; the hub keeps serving
+                continue
+            threading.Thread(target=self._serve, args=(connection,), daemon=True).start()
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def _serve(self, connection):
+        try:
+            while True:
+                message = _recv_json(connection)
+                with self._lock:
+                    if message[0] == "put":
+                        self._mailboxes[int(message[1])].extend(
+                            {"code": str(ind["code"]), "fitness": float(ind["fitness"]), "island": int(ind["island"])}
+                            for ind in message[2])
+                        reply = True
+                    else:
+                        reply = self._mailboxes.pop(int(message[1]), [])
+                _send_json(connection, reply)
+        except (EOFError, OSError, ValueError, TypeError, KeyError, IndexError):
+            # A closed connection or a malformed message ends the session
+            connection.close()
+
+
+def run_island(island: int, num_islands: int, project_def: Any, evolver_options: Dict[str, Any], transport,
+               status_queue, stop_event, migration_interval: int, migration_size: int, topology: str,
+               seed: int | None, resume: bool = False):
+    """Process entry point: evolves one island and exchanges its top individuals with others."""
+    # Spread the run over several API keys' quotas when GEMINI_API_KEYS lists more than one
+    from alphaevolve_core.src.llm_services.gemini_client import load_environment
+    load_environment()
+    api_keys = [key for key in os.environ.get("GEMINI_API_KEYS", "").split(",") if key]
+    if api_keys:
+        os.environ["GEMINI_API_KEY"] = api_keys[island % len(api_keys)]
+    rng = random.Random(None if seed is None else seed + island)
+    random.seed(None if seed is None else seed + island)
+
+    # Files that a single process owns get one copy per island
+    evolver_options = dict(evolver_options)
+    if seed is not None:
+        evolver_options["seed"] = seed + island
+    for option in ("program_store_path", "checkpoint_path", "telemetry_path"):
+        if evolver_options.get(option):
+            evolver_options[option] += f".island{island}"
+    if evolver_options.get("profile_dir"):
+        evolver_options["profile_dir"] = os.path.join(evolver_options["profile_dir"], f"island{island}")
+    if evolver_options.get("metrics_port") is not None:
+        # Each island serves its own metrics on consecutive ports
+        evolver_options["metrics_port"] += island
+    if evolver_options.get("cassette_path") and evolver_options.get("cassette_mode") == "record":
+        evolver_options["cassette_path"] += f".island{island}"
+
+    from alphaevolve_core.src.core.evolver import Evolver
+    evolver = Evolver(project_def=project_def, **evolver_options)
+
+    def on_generation(generation: int) -> bool:
+        immigrants = transport.receive(island)
+        for individual in immigrants:
+            evolver.population.add_individual(individual["code"], individual["fitness"],
+                                              metadata={"migrated_from": individual["island"]})
+        if (generation + 1) % migration_interval == 0:
+            emigrants = [{"code": ind.code, "fitness": ind.fitness, "island": island}
+                         for ind in evolver.population.individuals[:migration_size]]
+            for target in migration_targets(island, num_islands, topology, rng):
+                transport.send(target, emigrants)
+        fittest = evolver.population.get_fittest()
+        status_queue.put(("progress", island, generation + 1, fittest.fitness if fittest else 0.0,
+                          evolver.population.get_average_fitness(), len(immigrants)))
+        return stop_event.is_set()
+
+    try:
+        if resume:
+            # Each island continues from its own checkpoint
+            evolver.resume(evolver_options["checkpoint_path"])
+        else:
+            evolver.initialize_population()
+        evolver.evolve(on_generation=on_generation)
+        survivors = [{"code": ind.code, "fitness": ind.fitness, "island": island}
+                     for ind in evolver.population.individuals]
+        status_queue.put(("done", island, survivors))
+    except BaseException as e:
+        status_queue.put(("failed", island, repr(e)))
+        raise
+    finally:
+        evolver.close()
+
+
+class IslandModel:
+    def __init__(self, project_def: Any, num_islands: int = 4, evolver_options: Dict[str, Any] = None,
+                 migration_interval: int = 5, migration_size: int = 2, topology: str = "ring",
+                 hub_address: str | None = None, serve_hub: bool = False, authkey: bytes | None = None,
+                 island_offset: int = 0, total_islands: int | None = None, seed: int | None = None,
+                 resume: bool = False):
+        """
+        Runs M independent populations in separate processes with periodic migration.
+
+        Args:
+            project_def: The project definition shared by all islands.
+            num_islands: Islands launched by this process.
+            evolver_options: Keyword arguments for each island's `Evolver`.
+            migration_interval: Generations between emigrations.
+            migration_size: Top individuals sent to each target island.
+            topology: "ring", "full" or "random".
+            hub_address: host:port of a `MigrationHub`; None migrates over local queues.
+            serve_hub: Start the hub in this process (on the machine that owns it).
+            authkey: Shared secret for the hub connections; defaults to `hub_authkey`.
+            island_offset: Global index of the first local island, when islands run on
+                several machines.
+            total_islands: Islands across all machines (defaults to `num_islands`).
+            seed: Base random seed; island i uses seed + i.
+            resume: Resume every island from its own checkpoint (the `checkpoint_path`
+                evolver option suffixed with `.island<i>`) instead of seeding it afresh.
+        """
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown migration topology: {topology}")
+        if resume and not (evolver_options or {}).get("checkpoint_path"):
+            raise ValueError("Resuming islands needs the checkpoint_path evolver option.")
+        if hub_address and authkey is None:
+            authkey = hub_authkey(hub_address)
+        self.project_def = project_def
+        self.num_islands = num_islands
+        self.evolver_options = evolver_options or {}
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.topology = topology
+        self.hub_address = hub_address
+        self.serve_hub = serve_hub
+        self.authkey = authkey
+        self.island_offset = island_offset
+        self.total_islands = total_islands or num_islands
+        self.seed = seed
+        self.resume = resume
+
+    def run(self) -> Population:
+        """Launches and monitors the islands, then merges their populations."""
+        context = mp.get_context("spawn")
+        if self.hub_address:
+            if self.serve_hub:
+                MigrationHub(self.hub_address, self.authkey).start()
+            transport = SocketTransport(self.hub_address, self.authkey)
+        else:
+            transport = QueueTransport(self.total_islands, context=context)
+        status_queue = context.Queue()
+        stop_event = context.Event()
+
+        processes = {}
+        for island in range(self.island_offset, self.island_offset + self.num_islands):
+            process = context.Process(
+                target=run_island, name=f"island-{island}",
+                args=(island, self.total_islands, self.project_def, self.evolver_options, transport, status_queue,
+                      stop_event, self.migration_interval, self.migration_size, self.topology, self.seed,
+                      self.resume))
+            process.start()
+            processes[island] = process
+        print(f"Launched {self.num_islands} islands ({self.topology} topology, migrating the top "
+              f"{self.migration_size} every {self.migration_interval} generations).")
+
+        # With performance-aware fitness, correct programs keep evolving until the generation budget runs out
+        target_fitness = 1.0 if not self.evolver_options.get("performance_weight") else float("inf")
+        start_time = time.time()
+        results: Dict[int, List[Dict[str, Any]]] = {}
+        finished = set()
+        while len(finished) < len(processes):
+            try:
+                message = status_queue.get(timeout=1.0)
+            except queue.Empty:
+                for island, process in processes.items():
+                    if island not in finished and not process.is_alive():
+                        print(f"Island {island} exited with code {process.exitcode}.")
+                        finished.add(island)
+                continue
+            kind, island = message[0], message[1]
+            if kind == "progress":
+                _, _, generation, best, average, immigrants = message
+                print(f"[island {island}] generation {generation}: best {best:.4f}, average {average:.4f}, "
+                      f"{immigrants} immigrants")
+                if best >= target_fitness:
+                    stop_event.set()
+            elif kind == "done":
+                results[island] = message[2]
+                finished.add(island)
+            else:
+                print(f"Island {island} failed: {message[2]}")
+                finished.add(island)
+
+        join_islands(processes, transport)
+
+        merged = Population(max_size=self.evolver_options.get("population_size", 50))
+        for survivors in results.values():
+            for individual in survivors:
+                merged.add_individual(individual["code"], individual["fitness"],
+                                      metadata={"island": individual["island"]})
+        fittest = merged.get_fittest()
+        print(f"\nIsland run finished in {time.time() - start_time:.2f} seconds; "
+              f"best fitness {fittest.fitness if fittest else 0.0:.4f} across {len(results)} islands.")
+        return merged
+
+
+def serve_hub(address: str, authkey: bytes | None = None):
+    """Runs a standalone migration hub until interrupted; `authkey` defaults to `hub_authkey`."""
+    hub = MigrationHub(address, authkey if authkey is not None else hub_authkey(address))
+    print(f"Migration hub listening on {address}")
+    hub.serve_forever()
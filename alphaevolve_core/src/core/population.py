@@ -1,30 +1,355 @@
-from typing import List, Dict, Any, Tuple
+import bisect
+from collections.abc import Sequence
+import hashlib
+import json
+import sqlite3
+import threading
+from typing import List, Dict, Any, Tuple, Iterator
+
+class ProgramStore:
+    def __init__(self, path: str | None = None):
+        """
+        Storage for program code and evaluation details, kept apart from the fitness index.
+
+        Identical programs are interned and reference counted, so duplicates cost one
+        copy and evicted programs are freed. Only with a path is the storage out-of-line:
+        code and details then live in a SQLite file and are loaded when an individual's
+        fields are read. Without one, individuals hold references to the interned code
+        strings and the details dicts themselves, so everything stays in memory.
+
+        Args:
+            path: Optional SQLite file; None keeps everything in memory, by reference.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._codes: Dict[Any, List[Any]] = {}  # code (in memory) or digest (on disk) -> [code ref, refcount]
+        self._next_details_id = 0
+        self._pending_writes = 0
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS codes (key BLOB PRIMARY KEY, code TEXT)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS details (id INTEGER PRIMARY KEY, details TEXT)")
+            self._db.commit()
+
+    def put(self, code: str, details: Dict[str, Any] | None) -> Tuple[Any, Any]:
+        """
+        Stores code and details, returning the references an `Individual` keeps instead.
+
+        In memory the references are the interned code string and the details dict
+        themselves; on disk they are a code digest and a details row id.
+        """
+        with self._lock:
+            key = code if self._db is None else hashlib.sha1(code.encode("utf-8")).digest()
+            entry = self._codes.get(key)
+            if entry is None:
+                entry = self._codes[key] = [code if self._db is None else key, 0]
+                if self._db is not None:
+                    self._db.execute("INSERT OR REPLACE INTO codes VALUES (?, ?)", (key, code))
+            entry[1] += 1
+
+            details_ref = details or None
+            if details and self._db is not None:
+                details_ref = self._next_details_id
+                self._next_details_id += 1
+                self._db.execute("INSERT INTO details VALUES (?, ?)", (details_ref, json.dumps(details, default=repr)))
+            self._commit_periodically()
+        return entry[0], details_ref
+
+    def _commit_periodically(self):
+        # Reads on this connection see uncommitted rows, so commits only bound the crash window
+        if self._db is not None:
+            self._pending_writes += 1
+            if self._pending_writes >= 1000:
+                self._db.commit()
+                self._pending_writes = 0
+
+    def get_code(self, code_ref: Any) -> str:
+        if self._db is None:
+            return code_ref
+        with self._lock:
+            return self._db.execute("SELECT code FROM codes WHERE key = ?", (code_ref,)).fetchone()[0]
+
+    def get_details(self, details_ref: Any) -> Dict[str, Any]:
+        if details_ref is None:
+            return {}
+        if self._db is None:
+            return details_ref
+        with self._lock:
+            row = self._db.execute("SELECT details FROM details WHERE id = ?", (details_ref,)).fetchone()
+            return json.loads(row[0])
+
+    def release(self, code_ref: Any, details_ref: Any):
+        """Drops one reference to the code and frees the details of an evicted individual."""
+        with self._lock:
+            key = code_ref
+            entry = self._codes[key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._codes[key]
+                if self._db is not None:
+                    self._db.execute("DELETE FROM codes WHERE key = ?", (key,))
+            if details_ref is not None and self._db is not None:
+                self._db.execute("DELETE FROM details WHERE id = ?", (details_ref,))
+            self._commit_periodically()
+
+    def close(self):
+        if self._db is not None:
+            self._db.commit()
+            self._db.close()
+            self._db = None
+
+
+class Individual:
+    """
+    A compact population record. Code and evaluation details are kept in a
+    `ProgramStore` and loaded on access; dict-style access (`ind['code']`,
+    `ind['fitness']`, `ind['errors']`) is kept for selection strategies and prompts.
+    """
+    __slots__ = ("fitness", "code_ref", "details_ref", "store")
+
+    def __init__(self, fitness: float, code_ref: Any, details_ref: Any, store: ProgramStore):
+        self.fitness = fitness
+        self.code_ref = code_ref
+        self.details_ref = details_ref
+        self.store = store
+
+    @property
+    def code(self) -> str:
+        return self.store.get_code(self.code_ref)
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.store.get_details(self.details_ref)
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "fitness":
+            return self.fitness
+        if key == "code":
+            return self.code
+        return self.metadata[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: str) -> bool:
+        return key in ("code", "fitness") or key in self.metadata
+
+    def to_dict(self) -> Dict[str, Any]:
+        individual = {'code': self.code, 'fitness': self.fitness}
+        individual.update(self.metadata)
+        return individual
+
+    def __repr__(self):
+        return f"Individual(fitness={self.fitness}, code={self.code[:40]!r})"
+
+
+class SortedIndividuals(Sequence):
+    def __init__(self, load: int = 512):
+        """
+        Individuals sorted by fitness, best first, held in a list of short blocks.
+
+        An insertion or removal shifts entries within one block of at most `2 * load`
+        individuals instead of the whole population. Blocks are found by a binary
+        search over their last keys, and a Fenwick tree over the block sizes maps
+        positions to blocks, so both cost O(log n). A block that outgrows `2 * load` is
+        split, which rebuilds the tree in O(n / load), once every `load` insertions.
+
+        Args:
+            load: Target number of individuals per block.
+        """
+        self.load = load
+        self._blocks: List[List[Individual]] = []
+        self._keys: List[List[float]] = [] # Negated fitness per block, ascending, for bisect
+        self._maxes: List[float] = [] # Last key of each block
+        self._tree: List[int] = [0] # Fenwick tree over the block sizes, 1-based
+        self._len = 0
+
+    def insert(self, individual: Individual):
+        """Inserts an individual after those of equal fitness."""
+        key = -individual.fitness
+        if not self._blocks:
+            self._blocks.append([individual])
+            self._keys.append([key])
+            self._maxes.append(key)
+            self._len = 1
+            self._rebuild()
+            return
+        block = min(bisect.bisect_right(self._maxes, key), len(self._blocks) - 1)
+        keys = self._keys[block]
+        offset = bisect.bisect_right(keys, key)
+        keys.insert(offset, key)
+        self._blocks[block].insert(offset, individual)
+        self._maxes[block] = keys[-1]
+        self._len += 1
+        if len(keys) > 2 * self.load:
+            self._blocks.insert(block + 1, self._blocks[block][self.load:])
+            self._keys.insert(block + 1, keys[self.load:])
+            del self._blocks[block][self.load:], keys[self.load:]
+            self._maxes[block:block + 1] = [keys[-1], self._keys[block + 1][-1]]
+            self._rebuild()
+        else:
+            self._add(block, 1)
+
+    def pop(self, position: int = -1) -> Individual:
+        """Removes and returns the individual at `position`."""
+        block, offset = self._locate(position)
+        keys = self._keys[block]
+        del keys[offset]
+        individual = self._blocks[block].pop(offset)
+        self._len -= 1
+        if keys:
+            self._maxes[block] = keys[-1]
+            self._add(block, -1)
+        else:
+            del self._blocks[block], self._keys[block], self._maxes[block]
+            self._rebuild()
+        return individual
+
+    def index(self, individual: Individual) -> int:
+        """Finds an individual's position among those of equal fitness."""
+        key = -individual.fitness
+        block = bisect.bisect_left(self._maxes, key)
+        offset = bisect.bisect_left(self._keys[block], key) if block < len(self._blocks) else 0
+        while block < len(self._blocks):
+            members = self._blocks[block]
+            while offset < len(members):
+                if members[offset] is individual:
+                    return self._prefix(block) + offset
+                offset += 1
+            block, offset = block + 1, 0
+        raise ValueError(f"{individual!r} is not in the population")
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(self._len))]
+        block, offset = self._locate(position)
+        return self._blocks[block][offset]
+
+    def __iter__(self) -> Iterator[Individual]:
+        for members in self._blocks:
+            yield from members
+
+    def __len__(self):
+        return self._len
+
+    def __repr__(self):
+        return f"SortedIndividuals({list(self)!r})"
+
+    def _locate(self, position: int) -> Tuple[int, int]:
+        """Maps a position to (block, offset) by descending the Fenwick tree."""
+        if position < 0:
+            position += self._len
+        if not 0 <= position < self._len:
+            raise IndexError("population index out of range")
+        # The best and the worst individual are read on every admission
+        if position == 0:
+            return 0, 0
+        last = len(self._blocks[-1])
+        if position >= self._len - last:
+            return len(self._blocks) - 1, position - (self._len - last)
+        tree, size = self._tree, len(self._tree)
+        block = 0
+        step = 1 << (size - 1).bit_length()
+        while step:
+            following = block + step
+            if following < size and tree[following] <= position:
+                block = following
+                position -= tree[following]
+            step >>= 1
+        return block, position
+
+    def _prefix(self, block: int) -> int:
+        """Number of individuals in the blocks before `block`."""
+        total = 0
+        while block > 0:
+            total += self._tree[block]
+            block -= block & -block
+        return total
+
+    def _add(self, block: int, delta: int):
+        block += 1
+        while block < len(self._tree):
+            self._tree[block] += delta
+            block += block & -block
+
+    def _rebuild(self):
+        self._tree = [0] + [len(members) for members in self._blocks]
+        for i in range(1, len(self._tree)):
+            parent = i + (i & -i)
+            if parent < len(self._tree):
+                self._tree[parent] += self._tree[i]
+
 
 class Population:
-    def __init__(self, max_size: int):
+    def __init__(self, max_size: int, store: ProgramStore | None = None):
         self.max_size = max_size
-        self.individuals: List[Dict[str, Any]] = [] # Stores {'code': str, 'fitness': float, ...}
-
-    def add_individual(self, code: str, fitness: float, metadata: Dict[str, Any] = None):
-        """Adds a new individual to the population."""
-        individual = {'code': code, 'fitness': fitness}
-        if metadata:
-            individual.update(metadata)
-        self.individuals.append(individual)
+        self.store = store or ProgramStore()
+        self.individuals = SortedIndividuals() # Kept sorted by fitness, best first
+        self._fitness_sum = 0.0
+        # When set to a list, admitted individuals are appended for incremental checkpoints
+        self.journal: List[Tuple[str, float, Dict[str, Any]]] | None = None
+
+    def add_individual(self, code: str, fitness: float, metadata: Dict[str, Any] = None) -> Individual | None:
+        """
+        Adds a new individual to the population at its sorted position, in O(log n).
+
+        Returns:
+            The stored individual, or None if it ranks below a full population.
+        """
+        # A newcomer ranks after existing individuals of equal fitness
+        if len(self.individuals) >= self.max_size and fitness <= self.individuals[-1].fitness:
+            return None
+
+        individual = self._insert(code, fitness, metadata)
         self._maintain_size()
+        return individual
+
+    def _insert(self, code: str, fitness: float, metadata: Dict[str, Any] | None) -> Individual:
+        """Stores an individual at its sorted position and journals the admission."""
+        code_ref, details_ref = self.store.put(code, metadata)
+        individual = Individual(fitness, code_ref, details_ref, self.store)
+        self.individuals.insert(individual)
+        self._fitness_sum += fitness
+        if self.journal is not None:
+            self.journal.append((code, fitness, metadata))
+        return individual
+
+    def _remove(self, position: int) -> Individual:
+        """Removes the individual at `position` and releases its stored code and details."""
+        removed = self.individuals.pop(position)
+        self._fitness_sum -= removed.fitness
+        self.store.release(removed.code_ref, removed.details_ref)
+        return removed
+
+    def _position_of(self, individual: Individual) -> int:
+        """Finds an individual's index among those of equal fitness."""
+        return self.individuals.index(individual)
 
     def _maintain_size(self):
-        """Sorts the population by fitness and truncates to max_size."""
-        self.individuals.sort(key=lambda x: x['fitness'], reverse=True)
-        self.individuals = self.individuals[:self.max_size]
+        """Evicts the least fit individuals beyond max_size."""
+        while len(self.individuals) > self.max_size:
+            self._remove(len(self.individuals) - 1)
+
+    def admission_threshold(self) -> float:
+        """
+        Returns the fitness a newcomer must exceed to be kept: the worst kept fitness
+        once the population is full, -inf before that.
+        """
+        if len(self.individuals) < self.max_size:
+            return float("-inf")
+        return self.individuals[-1].fitness
 
-    def get_fittest(self) -> Dict[str, Any] | None:
+    def get_fittest(self) -> Individual | None:
         """Returns the fittest individual in the population."""
         if not self.individuals:
             return None
         return self.individuals[0]
 
-    def select_parents(self, num_parents: int) -> List[Dict[str, Any]]:
+    def select_parents(self, num_parents: int) -> List[Individual]:
         """
         Selects parents from the population (placeholder - implement selection strategies).
         For now, just returns the top num_parents individuals.
@@ -32,10 +357,10 @@ class Population:
         return self.individuals[:num_parents]
 
     def get_average_fitness(self) -> float:
-        """Calculates the average fitness of the population."""
+        """Returns the average fitness of the population from a running total."""
         if not self.individuals:
             return 0.0
-        return sum(ind['fitness'] for ind in self.individuals) / len(self.individuals)
+        return self._fitness_sum / len(self.individuals)
 
     def __len__(self):
         return len(self.individuals)
@@ -0,0 +1,223 @@
+import contextvars
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import List, Dict, Any
+
+# Upper edges of the fitness ranges that routing and correction statistics are kept for
+FITNESS_BUCKETS = (0.0, 0.5, 0.9)
+
+
+def fitness_bucket(fitness: float) -> int:
+    """0 for fitness 0, then one bucket per range up to FITNESS_BUCKETS[-1] and above."""
+    for i, edge in enumerate(FITNESS_BUCKETS):
+        if fitness <= edge if i == 0 else fitness < edge:
+            return i
+    return len(FITNESS_BUCKETS)
+
+
+class ModelRouter:
+    def __init__(self, clients: Dict[str, Any], costs: Dict[str, float], patience: int = 5,
+                 seed: int | None = None):
+        """
+        Routes LLM calls across model tiers, cheapest first, by expected success per unit of cost.
+
+        For every (tier, call kind, parent fitness bucket) the router keeps a Beta
+        posterior of how often a call improved fitness, and picks the tier with the
+        best Thompson-sampled success rate per unit cost. Every `patience`-th call in a
+        row without progress is escalated to the strongest tier, and when the run budget
+        is nearly spent calls stay on the cheapest one.
+
+        The router is a drop-in LLM client for the generators and the corrector: their
+        `generate_text` calls go to the tier selected with `use`, which is tracked per
+        thread and per task.
+
+        Args:
+            clients: Tier name -> LLM client, cheapest first.
+            costs: Tier name -> relative cost per token.
+            patience: Calls without improvement between escalations to the strongest tier.
+            seed: Seed for the Thompson samples.
+        """
+        self.clients = clients
+        self.tiers = list(clients)
+        self.costs = costs
+        self.patience = patience
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tier = contextvars.ContextVar("llm_tier", default=self.tiers[0])
+        self._outcomes: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0])  # -> [successes, failures]
+        self.calls: Dict[str, int] = defaultdict(int)  # "kind:tier" -> calls
+
+    def choose(self, kind: str, fitness: float, stalled: int = 0, budget_left: float = 1.0) -> str:
+        """
+        Picks the tier for one call.
+
+        Args:
+            kind: "generate" or "correct".
+            fitness: Best parent fitness, or the fitness of the program being corrected.
+            stalled: Consecutive offspring that did not improve on their parents.
+            budget_left: Remaining fraction of the run's token/time budget.
+        """
+        if budget_left < 0.2:
+            tier = self.tiers[0]
+        elif stalled and stalled % self.patience == 0:
+            tier = self.tiers[-1]
+        else:
+            bucket = fitness_bucket(fitness)
+            with self._lock:
+                samples = {}
+                for name in self.tiers:
+                    successes, failures = self._outcomes[(name, kind, bucket)]
+                    samples[name] = self._rng.betavariate(successes + 1, failures + 1) / self.costs[name]
+            tier = max(self.tiers, key=lambda name: samples[name])
+        with self._lock:
+            self.calls[f"{kind}:{tier}"] += 1
+        return tier
+
+    def record(self, kind: str, tier: str, fitness: float, improved: bool):
+        with self._lock:
+            self._outcomes[(tier, kind, fitness_bucket(fitness))][0 if improved else 1] += 1
+
+    @contextmanager
+    def use(self, tier: str | None):
+        """Sends the `generate_text` calls made inside the block to `tier`."""
+        if tier is None:
+            yield
+            return
+        token = self._tier.set(tier)
+        try:
+            yield
+        finally:
+            self._tier.reset(token)
+
+    def generate_text(self, prompt, temperature=0.7, safety_settings=None) -> str:
+        return self.clients[self._tier.get()].generate_text(prompt, temperature, safety_settings)
+
+    async def generate_text_async(self, prompt, temperature=0.7, safety_settings=None) -> str:
+        return await self.clients[self._tier.get()].generate_text_async(prompt, temperature, safety_settings)
+
+    def cost(self) -> float:
+        """Tokens spent so far, weighted by the relative cost of each tier."""
+        return sum(self.costs[name] * client.metrics.total_tokens for name, client in self.clients.items())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            success_rates = {}
+            for (tier, kind, bucket), (successes, failures) in sorted(self._outcomes.items()):
+                if successes + failures:
+                    success_rates[f"{kind}:{tier}:{bucket}"] = round(successes / (successes + failures), 3)
+            return {"calls": dict(self.calls), "success_rates": success_rates, "cost": self.cost()}
+
+
+class CorrectionPolicy:
+    def __init__(self, min_expected_gain: float = 0.02, prior_gain: float = 0.1, prior_weight: float = 2.0,
+                 explore: float = 0.05, seed: int | None = None):
+        """
+        Decides whether a correction call is worth its tokens, from the fitness gains past
+        corrections achieved.
+
+        Gains are averaged per kind of failure: each fitness bucket, and programs rejected
+        by a pre-filter stage. An optimistic prior makes the first corrections of every
+        kind happen; afterwards kinds whose expected gain falls below `min_expected_gain`
+        are skipped, except for a small `explore` share that keeps the estimate current.
+
+        Args:
+            min_expected_gain: Smallest expected fitness gain a correction call must promise.
+            prior_gain: Expected gain before any correction of a kind was seen.
+            prior_weight: Number of pseudo-observations the prior counts for.
+            explore: Probability of correcting anyway when the expected gain is too low.
+            seed: Seed for the exploration draws.
+        """
+        self.min_expected_gain = min_expected_gain
+        self.prior_gain = prior_gain
+        self.prior_weight = prior_weight
+        self.explore = explore
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._gains: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0])  # kind -> [total gain, count]
+        self.attempted = 0
+        self.skipped = 0
+        self.explored = 0
+
+    @staticmethod
+    def _kind(fitness: float, details: Dict[str, Any]) -> str:
+        rejection = details.get("prefilter")
+        if rejection:
+            return f"prefilter:{rejection['stage']}"
+        return f"fitness:{fitness_bucket(fitness)}"
+
+    def expected_gain(self, fitness: float, details: Dict[str, Any]) -> float:
+        with self._lock:
+            total, count = self._gains[self._kind(fitness, details)]
+        return (total + self.prior_gain * self.prior_weight) / (count + self.prior_weight)
+
+    def should_correct(self, fitness: float, details: Dict[str, Any]) -> bool:
+        correct = self.expected_gain(fitness, details) >= self.min_expected_gain
+        with self._lock:
+            if not correct and self._rng.random() < self.explore:
+                correct = True
+                self.explored += 1
+            if correct:
+                self.attempted += 1
+            else:
+                self.skipped += 1
+        return correct
+
+    def record(self, fitness: float, details: Dict[str, Any], corrected_fitness: float):
+        with self._lock:
+            gains = self._gains[self._kind(fitness, details)]
+            gains[0] += max(0.0, corrected_fitness - fitness)
+            gains[1] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            expected = {kind: round((total + self.prior_gain * self.prior_weight) / (count + self.prior_weight), 4)
+                        for kind, (total, count) in sorted(self._gains.items())}
+            return {"attempted": self.attempted, "skipped": self.skipped, "explored": self.explored,
+                    "expected_gain": expected}
+
+
+class RunBudget:
+    def __init__(self, clients: List[Any], max_tokens: int | None = None, max_seconds: float | None = None):
+        """
+        A global cap on the LLM tokens and wall-clock time of a run.
+
+        Args:
+            clients: The LLM clients whose tokens count towards the budget.
+            max_tokens: Total prompt and completion tokens across all clients.
+            max_seconds: Wall-clock seconds from the last `start` (or the creation of the budget).
+        """
+        self.clients = clients
+        self.max_tokens = max_tokens
+        self.max_seconds = max_seconds
+        self._start = time.time()
+
+    def start(self):
+        """Starts the clock, so that set-up before the run does not count towards the time budget."""
+        self._start = time.time()
+
+    def tokens_used(self) -> int:
+        return sum(client.metrics.total_tokens for client in self.clients)
+
+    def left(self) -> float:
+        """Remaining fraction of the tighter of the two limits (1.0 without limits)."""
+        left = 1.0
+        if self.max_tokens:
+            left = min(left, 1.0 - self.tokens_used() / self.max_tokens)
+        if self.max_seconds:
+            left = min(left, 1.0 - (time.time() - self._start) / self.max_seconds)
+        return max(left, 0.0)
+
+    def exhausted(self) -> str | None:
+        """Returns why the budget is spent, or None while there is some left."""
+        if self.max_tokens and self.tokens_used() >= self.max_tokens:
+            return f"Token budget of {self.max_tokens} exhausted."
+        if self.max_seconds and time.time() - self._start >= self.max_seconds:
+            return f"Time budget of {self.max_seconds:.0f}s exhausted."
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"tokens_used": self.tokens_used(), "max_tokens": self.max_tokens,
+                "seconds": time.time() - self._start, "max_seconds": self.max_seconds}
@@ -29,4 +29,9 @@ class TournamentSelection(SelectionStrategy):
             selected_parents.append(winner)
         return selected_parents
 
+class UniformSelection(SelectionStrategy):
+    def select(self, population: List[Dict[str, Any]], num_parents: int) -> List[Dict[str, Any]]:
+        """Selects parents uniformly at random, as MAP-Elites samples its archive of elites."""
+        return [random.choice(population) for _ in range(num_parents)]
+
 # Add other selection strategies here (e.g., RouletteWheelSelection, EliteSelection)
@@ -0,0 +1,126 @@
+import ast
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Tuple
+
+
+def normalize_program(program_code: str) -> str:
+    """
+    Returns a canonical form of the program that ignores whitespace, comments and docstrings.
+
+    Programs that do not parse are normalized to their stripped source, so they still
+    share a cache entry with byte-identical copies.
+    """
+    try:
+        tree = ast.parse(program_code)
+    except (SyntaxError, ValueError):
+        return program_code.strip()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Module, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            body = node.body
+            if (body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant)
+                    and isinstance(body[0].value.value, str)):
+                node.body = body[1:] or [ast.Pass()]
+    return ast.dump(tree)
+
+
+class EvaluationCache:
+    def __init__(self, max_entries: int = 10000, path: str | None = None):
+        """
+        A content-addressed cache of evaluation results.
+
+        Args:
+            max_entries: Size of the in-memory LRU tier.
+            path: Optional SQLite file backing the LRU tier, so results survive restarts.
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self._entries: OrderedDict = OrderedDict()  # key -> (fitness, details, elapsed)
+        self._project_keys: Dict[int, Tuple[Any, str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS evaluations "
+                             "(key TEXT PRIMARY KEY, fitness REAL, details TEXT, elapsed REAL)")
+            self._db.commit()
+
+    def _project_key(self, project_def: Any) -> str:
+        cached = self._project_keys.get(id(project_def))
+        if cached is not None and cached[0] is project_def:
+            return cached[1]
+        suite = getattr(project_def, "test_suite", None)
+        fingerprint = json.dumps([project_def.description, project_def.function_name, project_def.signature,
+                                  project_def.test_cases, suite.fingerprint() if suite is not None else None],
+                                 sort_keys=True, default=repr)
+        digest = hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+        # Keep a reference to the project so its id() cannot be reused by another object
+        self._project_keys[id(project_def)] = (project_def, digest)
+        return digest
+
+    def key(self, program_code: str, project_def: Any, variant: str = "") -> str:
+        """
+        Hashes the normalized program together with the project definition and its test cases.
+
+        `variant` separates results scored under different settings (e.g. a performance objective).
+        """
+        program_hash = hashlib.sha256(normalize_program(program_code).encode("utf-8")).hexdigest()
+        return hashlib.sha256(f"{program_hash}:{self._project_key(project_def)}:{variant}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Tuple[float, Dict[str, Any]] | None:
+        """Returns a cached (fitness, details) pair, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute("SELECT fitness, details, elapsed FROM evaluations WHERE key = ?",
+                                       (key,)).fetchone()
+                if row is not None:
+                    entry = (row[0], json.loads(row[1]), row[2])
+                    self._remember(key, entry)
+
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.seconds_saved += entry[2]
+            return entry[0], dict(entry[1])
+
+    def put(self, key: str, fitness: float, details: Dict[str, Any], elapsed: float):
+        """Stores an evaluation result along with the seconds it took to compute."""
+        details = json.loads(json.dumps(details, default=repr))
+        with self._lock:
+            self._remember(key, (fitness, details, elapsed))
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?)",
+                                 (key, fitness, json.dumps(details), elapsed))
+                self._db.commit()
+
+    def _remember(self, key: str, entry: Tuple[float, Dict[str, Any], float]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "seconds_saved": self.seconds_saved,
+            "entries": len(self._entries),
+        }
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -1,23 +1,112 @@
-from typing import Dict, Any, Tuple
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Tuple, List, Iterator, Callable
+
+from alphaevolve_core.src.evaluation.sandbox_runner import outputs_match
 
 class FitnessEvaluator:
-    def evaluate(self, program_code: str, project_def: Any) -> Tuple[float, Dict[str, Any]]:
+    def __init__(self, sandbox: Any = None, timeout: float = 10, per_test_timeout: float | None = None,
+                 cache: Any = None, performance: Any = None, benchmark_repeats: int = 5,
+                 benchmark_timeout: float = 60, suite_sample_size: int = 0, suite_sample_seed: int = 0,
+                 verbose: bool = True):
+        """
+        Args:
+            sandbox: Optional sandbox exposing `run_batch` (e.g. a `SandboxPool`). Without
+                one, evaluation falls back to the placeholder scoring below.
+            timeout: Maximum execution time in seconds for the whole test batch.
+            per_test_timeout: Optional maximum execution time for each test case.
+            cache: Optional `EvaluationCache` consulted before any sandbox run. Placeholder
+                scores (no sandbox) are neither read from nor written to it.
+            performance: Optional `PerformanceObjective`. Programs that pass every test are
+                then benchmarked on generated inputs of increasing size and score above 1.0.
+            benchmark_repeats: Timed calls per input size when benchmarking.
+            benchmark_timeout: Maximum time in seconds for one program's benchmark.
+            suite_sample_size: For projects with a columnar `test_suite`, score programs on
+                this many sampled cases first; only those passing the whole sample run the
+                full suite. 0 always runs the full suite.
+            suite_sample_seed: Seed of the sample, so every program sees the same cases.
+            verbose: Print each program scored by the placeholder evaluator.
+        """
+        self.sandbox = sandbox
+        self.cache = cache
+        self.performance = performance
+        self.benchmark_repeats = benchmark_repeats
+        self.benchmark_timeout = benchmark_timeout
+        self.suite_sample_size = suite_sample_size
+        self.suite_sample_seed = suite_sample_seed
+        self.timeout = timeout
+        self.per_test_timeout = per_test_timeout
+        self.verbose = verbose
+
+    def evaluate(self, program_code: str, project_def: Any, stop_on_first_failure: bool = False,
+                 timeout: float | None = None, per_test_timeout: float | None = None) -> Tuple[float, Dict[str, Any]]:
         """
         Evaluates the fitness of a program against a project definition's test cases.
 
         Args:
             program_code: The string containing the program's code.
             project_def: An instance of a class inheriting from ProjectBase.
+            stop_on_first_failure: Stop at the first failing test when only a pass/fail
+                cutoff is needed. Tests that were not run count as failed.
+            timeout: Overrides the whole-program timeout for this call.
+            per_test_timeout: Overrides the per-test timeout for this call.
 
         Returns:
             A tuple containing:
                 - fitness_score: A float representing the fitness (e.g., percentage of tests passed).
                 - evaluation_details: A dictionary with details about the evaluation (e.g., test results, errors).
         """
-        # This is a placeholder. Actual implementation will involve the sandbox.
+        if self.cache is None or self.sandbox is None:
+            return self._evaluate_uncached(program_code, project_def, stop_on_first_failure, timeout, per_test_timeout)
+
+        key = self._cache_key(program_code, project_def, timeout, per_test_timeout)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        start = time.perf_counter()
+        fitness_score, evaluation_details = self._evaluate_uncached(
+            program_code, project_def, stop_on_first_failure, timeout, per_test_timeout)
+        self._store(key, fitness_score, evaluation_details, time.perf_counter() - start, stop_on_first_failure)
+        return fitness_score, evaluation_details
+
+    def _cache_key(self, program_code: str, project_def: Any, timeout: float | None = None,
+                   per_test_timeout: float | None = None) -> str:
+        # Results scored under a different objective or time limits must not be reused
+        timeout = self.timeout if timeout is None else timeout
+        per_test_timeout = self.per_test_timeout if per_test_timeout is None else per_test_timeout
+        variant = f"timeout={timeout}/{per_test_timeout}"
+        if self.performance:
+            variant += f":{self.performance!r}"
+        if self.suite_sample_size:
+            variant += f":sample={self.suite_sample_size}/{self.suite_sample_seed}"
+        return self.cache.key(program_code, project_def, variant=variant)
+
+    def _store(self, key: str, fitness_score: float, evaluation_details: Dict[str, Any], elapsed: float,
+               stop_on_first_failure: bool):
+        # A run cut short by stop_on_first_failure is not the program's full score
+        if not (stop_on_first_failure and fitness_score < 1.0):
+            self.cache.put(key, fitness_score, evaluation_details, elapsed)
+
+    def _evaluate_uncached(self, program_code: str, project_def: Any, stop_on_first_failure: bool = False,
+                           timeout: float | None = None, per_test_timeout: float | None = None) -> Tuple[float, Dict[str, Any]]:
+        if self.sandbox is not None:
+            evaluate = self._evaluate_suite if project_def.test_suite is not None else self._evaluate_in_sandbox
+            fitness_score, evaluation_details = evaluate(
+                program_code, project_def, stop_on_first_failure,
+                self.timeout if timeout is None else timeout,
+                self.per_test_timeout if per_test_timeout is None else per_test_timeout)
+            if self.performance is not None and fitness_score >= 1.0:
+                fitness_score = self._benchmark(program_code, project_def, fitness_score, evaluation_details)
+            return fitness_score, evaluation_details
+
+        # This is a placeholder used when no sandbox is configured.
         # For now, we'll just return a dummy fitness score and details.
-        print(f"Evaluating program:\n{program_code}")
-        print(f"Against project: {project_def.description}")
+        if self.verbose:
+            print(f"Evaluating program:\n{program_code}")
+            print(f"Against project: {project_def.description}")
 
         # Dummy implementation: Assume 50% fitness and some placeholder details
         fitness_score = 0.5
@@ -28,3 +117,305 @@ class FitnessEvaluator:
         }
 
         return fitness_score, evaluation_details
+
+    def evaluate_many(self, programs: List[str], project_def: Any, max_workers: int | None = None,
+                      stop_on_first_failure: bool = False, timeout: float | None = None,
+                      per_test_timeout: float | None = None) -> Iterator[Tuple[int, float, Dict[str, Any]]]:
+        """
+        Evaluates several programs concurrently and streams results as they finish.
+
+        Programs are fanned out over threads that each hold one sandbox worker, so the
+        sandbox pool's processes do the parallel work.
+
+        Args:
+            programs: The program code strings to evaluate.
+            project_def: An instance of a class inheriting from ProjectBase.
+            max_workers: Concurrency level; defaults to the sandbox pool size.
+            stop_on_first_failure: See `evaluate`.
+            timeout: Overrides the whole-program timeout.
+            per_test_timeout: Overrides the per-test timeout.
+
+        Yields:
+            (index, fitness_score, evaluation_details) tuples in completion order, where
+            index is the position of the program in `programs`.
+        """
+        if not programs:
+            return
+
+        cache = self.cache if self.sandbox is not None else None
+        pending = {}
+        for i, code in enumerate(programs):
+            cached = None
+            if cache is not None:
+                key = self._cache_key(code, project_def, timeout, per_test_timeout)
+                cached = cache.get(key)
+            if cached is not None:
+                yield i, cached[0], cached[1]
+            else:
+                pending[i] = key if cache is not None else None
+        if not pending:
+            return
+
+        max_workers = max_workers or getattr(self.sandbox, "size", None)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._timed_evaluate, programs[i], project_def, stop_on_first_failure,
+                                timeout, per_test_timeout): i
+                for i in pending
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                fitness_score, evaluation_details, elapsed = future.result()
+                if cache is not None:
+                    self._store(pending[i], fitness_score, evaluation_details, elapsed, stop_on_first_failure)
+                yield i, fitness_score, evaluation_details
+
+    def _timed_evaluate(self, *args) -> Tuple[float, Dict[str, Any], float]:
+        start = time.perf_counter()
+        fitness_score, evaluation_details = self._evaluate_uncached(*args)
+        return fitness_score, evaluation_details, time.perf_counter() - start
+
+    def _evaluate_in_sandbox(self, program_code: str, project_def: Any, stop_on_first_failure: bool,
+                             timeout: float, per_test_timeout: float | None,
+                             indices: List[int] | None = None) -> Tuple[float, Dict[str, Any]]:
+        """Runs the whole test suite (or the cases at `indices`) in a single sandbox batch and scores the pass rate."""
+        test_cases = project_def.test_cases
+        if indices is not None:
+            test_cases = [test_cases[i] for i in indices]
+        if not test_cases:
+            return 0.0, {"tests_run": 0, "tests_passed": 0, "errors": "Project has no test cases."}
+
+        outcomes = self.sandbox.run_batch(program_code, project_def.function_name,
+                                          [case["input"] for case in test_cases],
+                                          timeout=timeout, per_test_timeout=per_test_timeout,
+                                          expected_outputs=[case["output"] for case in test_cases],
+                                          stop_on_failure=stop_on_first_failure)
+        tests_passed = 0
+        errors = []
+        for position, (case, (result, stdout, stderr)) in enumerate(zip(test_cases, outcomes)):
+            i = position if indices is None else indices[position]
+            if stderr:
+                errors.append(f"Test {i + 1} (input={case['input']!r}) raised an error:\n{stderr}")
+            elif not outputs_match(result, case["output"]):
+                errors.append(f"Test {i + 1} (input={case['input']!r}) expected {case['output']!r}, got {result!r}")
+            else:
+                tests_passed += 1
+
+        if len(outcomes) < len(test_cases):
+            errors.append(f"Stopped after {len(outcomes)} of {len(test_cases)} tests.")
+
+        fitness_score = tests_passed / len(test_cases)
+        evaluation_details = {
+            "tests_run": len(outcomes),
+            "tests_passed": tests_passed,
+            "errors": "\n".join(errors) if errors else "",
+        }
+        return fitness_score, evaluation_details
+
+    def _evaluate_suite(self, program_code: str, project_def: Any, stop_on_first_failure: bool,
+                        timeout: float, per_test_timeout: float | None) -> Tuple[float, Dict[str, Any]]:
+        """Scores the pass rate on a columnar test suite, on a cheap sample first when configured."""
+        suite = project_def.test_suite
+        if self.suite_sample_size and len(suite) > self.suite_sample_size:
+            sample = suite.sample(self.suite_sample_size, seed=self.suite_sample_seed)
+            fitness_score, evaluation_details = self._run_suite(program_code, project_def, sample,
+                                                                stop_on_first_failure, timeout, per_test_timeout)
+            if fitness_score < 1.0:
+                # The sample pass rate estimates the full one; only promising programs pay for the rest
+                evaluation_details["suite_sample"] = len(sample)
+                return fitness_score, evaluation_details
+        return self._run_suite(program_code, project_def, suite, stop_on_first_failure, timeout, per_test_timeout)
+
+    def _run_suite(self, program_code: str, project_def: Any, suite: Any, stop_on_first_failure: bool,
+                   timeout: float, per_test_timeout: float | None) -> Tuple[float, Dict[str, Any]]:
+        if len(suite) == 0:
+            return 0.0, {"tests_run": 0, "tests_passed": 0, "errors": "Project has no test cases."}
+        response = self.sandbox.run_suite(program_code, project_def.function_name, suite.directory,
+                                          indices=suite.indices, timeout=timeout,
+                                          per_test_timeout=per_test_timeout, stop_on_failure=stop_on_first_failure)
+        if "error" in response:
+            return 0.0, {"tests_run": 0, "tests_passed": 0, "errors": response["error"]}
+
+        errors = []
+        for failure in response["failures"]:
+            if failure["index"] is None:
+                errors.append(f"The program failed to load:\n{failure['error']}")
+            elif "error" in failure:
+                errors.append(f"Test {failure['index'] + 1} (input={failure['input']}) raised an error:\n{failure['error']}")
+            else:
+                errors.append(f"Test {failure['index'] + 1} (input={failure['input']}) expected {failure['expected']}, "
+                              f"got {failure['got']}")
+        failed = response["tests_run"] - response["tests_passed"]
+        if failed > len(response["failures"]):
+            errors.append(f"... and {failed - len(response['failures'])} more failing tests.")
+        if response["tests_run"] < len(suite):
+            errors.append(f"Stopped after {response['tests_run']} of {len(suite)} tests.")
+
+        evaluation_details = {
+            "tests_run": response["tests_run"],
+            "tests_passed": response["tests_passed"],
+            "errors": "\n".join(errors),
+        }
+        return response["tests_passed"] / len(suite), evaluation_details
+
+    def _benchmark(self, program_code: str, project_def: Any, fitness_score: float,
+                   evaluation_details: Dict[str, Any]) -> float:
+        """Benchmarks a correct program and folds runtime, memory and scaling into its fitness."""
+        sized_inputs = []
+        for size in project_def.benchmark_sizes:
+            test_input = project_def.generate_input(size)
+            if test_input is None:
+                return fitness_score
+            sized_inputs.append((size, test_input))
+
+        benchmark = self.sandbox.run_benchmark(program_code, project_def.function_name, sized_inputs,
+                                               repeats=self.benchmark_repeats, timeout=self.benchmark_timeout,
+                                               per_call_timeout=self.per_test_timeout)
+        if "error" in benchmark:
+            # Correct but too slow (or failing) on large inputs: no performance bonus
+            evaluation_details["performance"] = {"error": benchmark["error"]}
+            return fitness_score
+        summary = self.performance.summarize(benchmark)
+        summary["score"] = self.performance.score(summary)
+        evaluation_details["performance"] = summary
+        return self.performance.combine(fitness_score, summary["score"])
+
+
+class RacingEvaluator(FitnessEvaluator):
+    def __init__(self, threshold: Callable[[], float], initial_cases: int = 8, growth: float = 2.0,
+                 confidence: float = 0.95, seed: int = 0, **kwargs):
+        """
+        Scores programs on growing test subsets and stops those that cannot be admitted.
+
+        Every program sees the test cases in the same seeded random order. After each
+        round the evaluator bounds the program's full pass rate from above, using the
+        smaller of a Hoeffding-Serfling bound (sampling without replacement) and the
+        exact bound where all unrun cases pass. Once the best fitness the program can
+        still reach is at or below the admission threshold, it cannot enter the
+        population: it stops with its observed pass rate as fitness. A program whose
+        bound still allows a perfect pass rate can also earn the full performance bonus,
+        so thresholds above 1.0 only stop programs that are already known to fail. Survivors run the rest of the suite, with no case
+        repeated, and then go on to performance benchmarking.
+
+        Args:
+            threshold: Returns the fitness a newcomer must beat, usually
+                `Population.admission_threshold`; -inf disables racing.
+            initial_cases: Cases in the first round.
+            growth: Factor by which each round grows the number of cases run.
+            confidence: Confidence of the statistical bound, split over the rounds. 1.0
+                uses only the exact bound, which never changes an admission decision.
+            seed: Seed of the shared case order.
+            **kwargs: Passed to `FitnessEvaluator`.
+        """
+        super().__init__(**kwargs)
+        self.threshold = threshold
+        self.initial_cases = initial_cases
+        self.growth = growth
+        self.confidence = confidence
+        self.seed = seed
+        self._orders: Dict[int, List[int]] = {}
+        self._lock = threading.Lock()
+        self.raced = 0
+        self.stopped = 0
+        self.cases_run = 0
+        self.cases_skipped = 0
+
+    def _store(self, key: str, fitness_score: float, evaluation_details: Dict[str, Any], elapsed: float,
+               stop_on_first_failure: bool):
+        # A stopped race depends on the threshold at the time, not only on the program
+        if "race_stopped" not in evaluation_details:
+            super()._store(key, fitness_score, evaluation_details, elapsed, stop_on_first_failure)
+
+    def _evaluate_uncached(self, program_code: str, project_def: Any, stop_on_first_failure: bool = False,
+                           timeout: float | None = None, per_test_timeout: float | None = None) -> Tuple[float, Dict[str, Any]]:
+        threshold = self.threshold() if self.sandbox is not None else float("-inf")
+        if threshold == float("-inf") or stop_on_first_failure:
+            return super()._evaluate_uncached(program_code, project_def, stop_on_first_failure, timeout,
+                                              per_test_timeout)
+        timeout = self.timeout if timeout is None else timeout
+        per_test_timeout = self.per_test_timeout if per_test_timeout is None else per_test_timeout
+
+        suite = project_def.test_suite
+        total = len(suite) if suite is not None else len(project_def.test_cases)
+        if total == 0:
+            return super()._evaluate_uncached(program_code, project_def, False, timeout, per_test_timeout)
+        order = self._case_order(total)
+        rounds = max(1, math.ceil(math.log(max(total / self.initial_cases, 1), self.growth)) + 1)
+        delta = (1.0 - self.confidence) / rounds
+
+        run, passed, errors = 0, 0, []
+        size = min(self.initial_cases, total)
+        while True:
+            positions = order[run:size]
+            if suite is not None:
+                _, details = self._run_suite(program_code, project_def, suite.select(positions), False,
+                                             timeout, per_test_timeout)
+            else:
+                _, details = self._evaluate_in_sandbox(program_code, project_def, False, timeout,
+                                                       per_test_timeout, indices=positions)
+            run = size
+            passed += details["tests_passed"]
+            if details["errors"]:
+                errors.append(details["errors"])
+
+            if run >= total:
+                break
+            upper = self._upper_bound(passed, run, total, delta)
+            if self._reachable(upper) <= threshold:
+                self._record(run, total - run, stopped=True)
+                errors.append(f"Stopped after {run} of {total} tests: the pass rate is at most {upper:.3f} "
+                              f"with {self.confidence:.0%} confidence, below the admission threshold {threshold:.3f}.")
+                return passed / run, {
+                    "tests_run": run,
+                    "tests_passed": passed,
+                    "errors": "\n".join(errors),
+                    "race_stopped": {"upper_bound": upper, "threshold": threshold},
+                }
+            size = min(total, max(size + 1, int(size * self.growth)))
+
+        self._record(run, 0, stopped=False)
+        fitness_score = passed / total
+        evaluation_details = {"tests_run": run, "tests_passed": passed, "errors": "\n".join(errors)}
+        if self.performance is not None and fitness_score >= 1.0:
+            fitness_score = self._benchmark(program_code, project_def, fitness_score, evaluation_details)
+        return fitness_score, evaluation_details
+
+    def _case_order(self, total: int) -> List[int]:
+        with self._lock:
+            order = self._orders.get(total)
+            if order is None:
+                order = self._orders[total] = random.Random(self.seed).sample(range(total), total)
+            return order
+
+    def _upper_bound(self, passed: int, run: int, total: int, delta: float) -> float:
+        """Upper bound on the full pass rate after `passed` of `run` cases drawn without replacement."""
+        exact = (passed + total - run) / total
+        if self.confidence >= 1.0:
+            return exact
+        # Serfling's finite-population correction shrinks the bound as the subset nears the whole suite
+        epsilon = math.sqrt(math.log(1 / delta) * (1 - (run - 1) / total) / (2 * run))
+        return min(exact, passed / run + epsilon)
+
+    def _reachable(self, upper: float) -> float:
+        """Best fitness a program can still score when its full pass rate is at most `upper`."""
+        if self.performance is not None and upper >= 1.0:
+            return 1.0 + self.performance.weight
+        return upper
+
+    def _record(self, run: int, skipped: int, stopped: bool):
+        with self._lock:
+            self.raced += 1
+            self.stopped += stopped
+            self.cases_run += run
+            self.cases_skipped += skipped
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            cases = self.cases_run + self.cases_skipped
+            return {
+                "raced": self.raced,
+                "stopped": self.stopped,
+                "cases_run": self.cases_run,
+                "cases_skipped": self.cases_skipped,
+                "cases_saved": self.cases_skipped / cases if cases else 0.0,
+            }
@@ -0,0 +1,91 @@
+import math
+from typing import List, Dict, Any, Tuple
+
+
+def estimate_complexity(sizes: List[int], times: List[float]) -> Tuple[float, str]:
+    """
+    Estimates the empirical growth of runtime with input size.
+
+    Fits log(time) = k * log(size) + c by least squares.
+
+    Returns:
+        A tuple of the exponent k and a readable label such as "O(n)" or "O(n^2)".
+    """
+    points = [(math.log(size), math.log(max(t, 1e-9))) for size, t in zip(sizes, times) if size > 0]
+    if len(points) < 2:
+        return 0.0, "unknown"
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if variance == 0:
+        return 0.0, "unknown"
+    exponent = sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+    if exponent < 0.5:
+        label = "O(1)"
+    elif exponent < 1.3:
+        label = "O(n)" if exponent < 1.1 else "O(n log n)"
+    elif exponent < 2.5:
+        label = "O(n^2)"
+    else:
+        label = f"O(n^{round(exponent)})"
+    return exponent, label
+
+
+class PerformanceObjective:
+    def __init__(self, weight: float = 0.5, time_weight: float = 0.5, complexity_weight: float = 0.3,
+                 memory_weight: float = 0.2, time_scale: float = 1e-3, memory_scale: float = 1024 * 1024):
+        """
+        Folds benchmark results into a multi-objective fitness.
+
+        Programs that fail any test keep their pass rate as fitness. Correct programs
+        score 1.0 plus `weight` times a performance score in (0, 1], so every correct
+        program outranks every incorrect one and faster correct programs rank higher.
+
+        Args:
+            weight: Scale of the performance bonus on top of correctness.
+            time_weight: Share of the performance score given to runtime at the largest size.
+            complexity_weight: Share given to the empirical complexity exponent.
+            memory_weight: Share given to peak memory at the largest size.
+            time_scale: Runtime in seconds that scores 0.5 on the time objective.
+            memory_scale: Peak memory in bytes that scores 0.5 on the memory objective.
+        """
+        self.weight = weight
+        self.time_weight = time_weight
+        self.complexity_weight = complexity_weight
+        self.memory_weight = memory_weight
+        self.time_scale = time_scale
+        self.memory_scale = memory_scale
+
+    def summarize(self, benchmark: Dict[str, Any]) -> Dict[str, Any]:
+        """Turns the sandbox benchmark response into evaluation details."""
+        samples = benchmark["samples"]
+        largest = samples[-1]
+        exponent, label = estimate_complexity([s["size"] for s in samples], [s["wall"] for s in samples])
+        return {
+            "samples": samples,
+            "wall_seconds": largest["wall"],
+            "cpu_seconds": largest["cpu"],
+            "peak_memory_bytes": largest["peak_memory"],
+            "complexity_exponent": exponent,
+            "complexity": label,
+        }
+
+    def score(self, summary: Dict[str, Any]) -> float:
+        """Returns a performance score in (0, 1]; higher is better on every objective."""
+        time_score = 1.0 / (1.0 + summary["wall_seconds"] / self.time_scale)
+        memory_score = 1.0 / (1.0 + summary["peak_memory_bytes"] / self.memory_scale)
+        complexity_score = 1.0 / (1.0 + max(0.0, summary["complexity_exponent"]))
+        total_weight = self.time_weight + self.complexity_weight + self.memory_weight
+        return (self.time_weight * time_score + self.complexity_weight * complexity_score
+                + self.memory_weight * memory_score) / total_weight
+
+    def combine(self, correctness: float, performance_score: float | None) -> float:
+        if correctness < 1.0 or performance_score is None:
+            return correctness
+        return 1.0 + self.weight * performance_score
+
+    def __repr__(self):
+        return (f"PerformanceObjective(weight={self.weight}, time_weight={self.time_weight}, "
+                f"complexity_weight={self.complexity_weight}, memory_weight={self.memory_weight}, "
+                f"time_scale={self.time_scale}, memory_scale={self.memory_scale})")
@@ -0,0 +1,225 @@
+import ast
+import builtins
+import threading
+import time
+from typing import List, Dict, Any, Tuple
+
+from alphaevolve_core.src.llm_services.code_extraction import extract_code
+
+# Modules a candidate may import; anything else is rejected before it reaches the sandbox
+DEFAULT_ALLOWED_IMPORTS = frozenset({
+    "__future__", "abc", "array", "bisect", "cmath", "collections", "copy", "dataclasses", "decimal",
+    "enum", "fractions", "functools", "heapq", "itertools", "math", "numbers", "operator", "random",
+    "re", "statistics", "string", "typing",
+})
+
+STAGES = ("extract", "parse", "signature", "imports", "lint")
+
+
+class PreFilterReject(Exception):
+    def __init__(self, stage: str, message: str, line: int | None = None):
+        super().__init__(message)
+        self.stage = stage
+        self.message = message
+        self.line = line
+
+
+def _bound_names(tree: ast.AST) -> set:
+    """Collects every name the module binds anywhere: assignments, definitions, parameters and imports."""
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            names.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names.update((alias.asname or alias.name).split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            names.add(node.name)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            names.update(node.names)
+        elif isinstance(node, (ast.MatchAs, ast.MatchStar)) and node.name:
+            names.add(node.name)
+    return names
+
+
+def _is_placeholder(body: List[ast.stmt]) -> bool:
+    """True for a body that is only a docstring, `pass`, `...` or `raise NotImplementedError`."""
+    statements = [s for s in body if not (isinstance(s, ast.Expr) and isinstance(s.value, ast.Constant)
+                                          and isinstance(s.value.value, str))]
+    if not statements:
+        return True
+    if len(statements) > 1:
+        return False
+    statement = statements[0]
+    if isinstance(statement, ast.Pass):
+        return True
+    if isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Constant) and statement.value.value is Ellipsis:
+        return True
+    if isinstance(statement, ast.Raise) and statement.exc is not None:
+        exc = statement.exc.func if isinstance(statement.exc, ast.Call) else statement.exc
+        return isinstance(exc, ast.Name) and exc.id == "NotImplementedError"
+    return False
+
+
+class StaticPreFilter:
+    def __init__(self, allowed_imports: List[str] | None = None, lint: bool = True):
+        """
+        Rejects programs that cannot pass any test without running them.
+
+        The stages run in order, each in microseconds: code-block extraction, `ast`
+        parse, a check that the required function exists with a compatible signature,
+        an import allowlist, and a basic lint for undefined names and placeholder bodies.
+        Rejections carry structured details in the shape `FitnessEvaluator` returns, so
+        `ProgramCorrector` can use them directly.
+
+        Args:
+            allowed_imports: Top-level modules candidates may import (defaults to
+                `DEFAULT_ALLOWED_IMPORTS`).
+            lint: Also run the lint stage.
+        """
+        self.allowed_imports = frozenset(allowed_imports) if allowed_imports is not None else DEFAULT_ALLOWED_IMPORTS
+        self.lint = lint
+        self._lock = threading.Lock()
+        self._signatures: Dict[str, ast.arguments] = {}
+        self.checked = 0
+        self.rejected = {stage: 0 for stage in STAGES}
+        self.seconds = 0.0
+
+    def check(self, program: str, project_def: Any) -> Tuple[str, Dict[str, Any] | None]:
+        """
+        Runs every stage on a program.
+
+        Returns:
+            A tuple containing:
+                - code: The program, with any leftover markdown fences stripped.
+                - rejection: None if the program passed, otherwise evaluation details with
+                  `errors` and a `prefilter` dict holding the failing `stage`, `message`
+                  and `line`.
+        """
+        start = time.perf_counter()
+        code = program
+        try:
+            code = self._extract(program)
+            tree = self._parse(code)
+            self._check_signature(tree, project_def)
+            self._check_imports(tree)
+            if self.lint:
+                self._lint(tree, project_def)
+            rejection = None
+        except PreFilterReject as e:
+            location = f" (line {e.line})" if e.line else ""
+            rejection = {
+                "tests_run": 0,
+                "tests_passed": 0,
+                "errors": f"Rejected before execution by the {e.stage} check{location}: {e.message}",
+                "prefilter": {"stage": e.stage, "message": e.message, "line": e.line},
+            }
+        with self._lock:
+            self.checked += 1
+            self.seconds += time.perf_counter() - start
+            if rejection is not None:
+                self.rejected[rejection["prefilter"]["stage"]] += 1
+        return code, rejection
+
+    def _extract(self, program: str) -> str:
+        code = extract_code(program) if "```" in program else program.strip()
+        if not code:
+            raise PreFilterReject("extract", "The response contains no code.")
+        return code
+
+    def _parse(self, code: str) -> ast.Module:
+        try:
+            return ast.parse(code)
+        except SyntaxError as e:
+            raise PreFilterReject("parse", f"SyntaxError: {e.msg}", e.lineno)
+        except ValueError as e:
+            raise PreFilterReject("parse", str(e))
+
+    def _expected_arguments(self, signature: str) -> ast.arguments | None:
+        arguments = self._signatures.get(signature)
+        if arguments is None:
+            try:
+                function = ast.parse(signature.strip() + "\n    pass").body[0]
+                arguments = function.args
+            except (SyntaxError, IndexError, AttributeError):
+                return None
+            self._signatures[signature] = arguments
+        return arguments
+
+    def _check_signature(self, tree: ast.Module, project_def: Any):
+        name = project_def.function_name
+        functions = [node for node in tree.body
+                     if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == name]
+        if not functions:
+            raise PreFilterReject("signature", f"The program does not define a top-level function `{name}`.")
+        function = functions[-1]
+        if isinstance(function, ast.AsyncFunctionDef):
+            raise PreFilterReject("signature", f"`{name}` must be a regular function, not async.", function.lineno)
+
+        expected = self._expected_arguments(project_def.signature)
+        if expected is None:
+            return
+        # Callers pass the expected positional arguments; the candidate must accept exactly that many
+        wanted = len(expected.posonlyargs) + len(expected.args)
+        args = function.args
+        positional = len(args.posonlyargs) + len(args.args)
+        required = positional - len(args.defaults)
+        required_keyword_only = [a.arg for a, d in zip(args.kwonlyargs, args.kw_defaults) if d is None]
+        if required > wanted or (positional < wanted and args.vararg is None) or required_keyword_only:
+            raise PreFilterReject(
+                "signature", f"`{name}` must accept {wanted} positional argument(s) as in "
+                             f"`{project_def.signature.strip()}`, but it is defined as "
+                             f"`def {name}({ast.unparse(args)})`.",
+                function.lineno)
+
+    def _check_imports(self, tree: ast.Module):
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom):
+                if node.level:
+                    raise PreFilterReject("imports", "Relative imports are not allowed.", node.lineno)
+                modules = [node.module or ""]
+            elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                  and node.func.id in ("__import__", "exec", "eval", "compile")):
+                raise PreFilterReject("imports", f"Calls to `{node.func.id}` are not allowed.", node.lineno)
+            else:
+                continue
+            for module in modules:
+                if module.split(".")[0] not in self.allowed_imports:
+                    raise PreFilterReject(
+                        "imports", f"Importing `{module}` is not allowed; allowed modules are "
+                                   f"{', '.join(sorted(self.allowed_imports))}.", node.lineno)
+
+    def _lint(self, tree: ast.Module, project_def: Any):
+        function = [node for node in tree.body
+                    if isinstance(node, ast.FunctionDef) and node.name == project_def.function_name][-1]
+        if _is_placeholder(function.body):
+            raise PreFilterReject("lint", f"`{function.name}` has a placeholder body and no implementation.",
+                                  function.lineno)
+
+        defined = _bound_names(tree) | set(dir(builtins))
+        # Annotations may be postponed (`from __future__ import annotations`), so they are not linted
+        annotations = set()
+        for node in ast.walk(tree):
+            for annotation in (getattr(node, "annotation", None), getattr(node, "returns", None)):
+                if annotation is not None:
+                    annotations.update(id(child) for child in ast.walk(annotation))
+        for node in ast.walk(tree):
+            if (isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load) and node.id not in defined
+                    and id(node) not in annotations):
+                raise PreFilterReject("lint", f"Undefined name `{node.id}`.", node.lineno)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rejected = sum(self.rejected.values())
+            return {
+                "checked": self.checked,
+                "rejected": rejected,
+                "reject_rate": rejected / self.checked if self.checked else 0.0,
+                "rejected_by_stage": dict(self.rejected),
+                "mean_us": self.seconds / self.checked * 1e6 if self.checked else 0.0,
+            }
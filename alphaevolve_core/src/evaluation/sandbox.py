@@ -1,10 +1,10 @@
-import docker
 import os
 import tempfile
 from typing import Dict, Any, Tuple
 
 class DockerSandbox:
     def __init__(self, image_name="python:3.9-slim"): # Using a slim Python image
+        import docker # Imported on first use; the Docker SDK is slow to import and optional
         self.client = docker.from_env()
         self.image_name = image_name
         # TODO: Build the Docker image if it doesn't exist
@@ -0,0 +1,370 @@
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from typing import List, Dict, Any, Tuple
+
+RUNNER_PATH = os.path.join(os.path.dirname(__file__), "sandbox_runner.py")
+
+# Prepended to the runner source of local workers: the child caps its own address space, since a
+# preexec_fn is not safe once the evaluator threads are running
+LOCAL_LIMITS = """try:
+    import resource
+    resource.setrlimit(resource.RLIMIT_AS, ({limit}, {limit}))
+except ImportError:
+    pass
+"""
+
+
+def read_runner_source() -> str:
+    """Returns the source of `sandbox_runner.py`, which workers are started with."""
+    with open(RUNNER_PATH, encoding="utf-8") as f:
+        return f.read()
+
+
+def docker_available(timeout: float = 10) -> bool:
+    """Whether the `docker` CLI is installed and its daemon answers."""
+    if not shutil.which("docker"):
+        return False
+    try:
+        return subprocess.run(["docker", "info"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                              timeout=timeout).returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+
+class SandboxError(Exception):
+    """Raised when a sandbox worker crashes or exceeds its batch timeout."""
+
+
+class SandboxWorker:
+    """
+    A long-lived sandbox process that executes batches over a persistent pipe.
+
+    The worker runs `sandbox_runner.py` and exchanges one JSON line per batch, so
+    startup is paid once per worker rather than once per test case.
+    """
+
+    def __init__(self, command: List[str]):
+        self.command = command
+        self.runs = 0
+        self.process: subprocess.Popen | None = None
+        self._responses: queue.Queue = queue.Queue()
+        self.start()
+
+    def _build_command(self) -> List[str]:
+        return self.command
+
+    def start(self):
+        self.runs = 0
+        self._responses = queue.Queue()
+        self.process = subprocess.Popen(
+            self._build_command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+        threading.Thread(target=self._read_responses, args=(self.process, self._responses), daemon=True).start()
+
+    @staticmethod
+    def _read_responses(process: subprocess.Popen, responses: queue.Queue):
+        for line in process.stdout:
+            responses.put(line)
+        responses.put(None)  # EOF: the worker exited or crashed
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def run(self, request: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Sends one batch request and waits for its response."""
+        try:
+            self.process.stdin.write(json.dumps(request) + "\n")
+            self.process.stdin.flush()
+            line = self._responses.get(timeout=timeout)
+        except queue.Empty:
+            raise SandboxError(f"Sandbox batch exceeded its {timeout}s timeout.")
+        except (BrokenPipeError, OSError) as e:
+            raise SandboxError(f"Sandbox worker pipe failed: {e}")
+        if line is None:
+            raise SandboxError("Sandbox worker exited unexpectedly.")
+        self.runs += 1
+        return json.loads(line)
+
+    def close(self):
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+    def kill(self):
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+
+    def restart(self):
+        self.kill()
+        self.start()
+
+
+class DockerSandboxWorker(SandboxWorker):
+    """A sandbox worker living in its own container, killed through the Docker CLI."""
+
+    def __init__(self, docker_args: List[str], image_name: str, runner_source: str):
+        self.docker_args = docker_args
+        self.image_name = image_name
+        self.runner_source = runner_source
+        self.container_name = None
+        super().__init__(command=[])
+
+    def _build_command(self) -> List[str]:
+        self.container_name = f"alphaevolve-sandbox-{uuid.uuid4().hex[:12]}"
+        return ["docker", "run", "-i", "--rm", "--name", self.container_name, *self.docker_args,
+                self.image_name, "python", "-u", "-c", self.runner_source]
+
+    def kill(self):
+        # Killing the CLI client does not stop the container, so stop it explicitly.
+        if self.container_name:
+            subprocess.run(["docker", "kill", self.container_name],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        super().kill()
+
+
+class SandboxPool:
+    def __init__(self, size: int = 4, backend: str = "auto", image_name: str = "python:3.9-slim",
+                 max_runs_per_worker: int = 100, memory_limit_mb: int = 512, cpus: float = 1.0,
+                 shared_dirs: List[str] | None = None):
+        """
+        A fixed set of pre-started, resource-limited sandbox workers.
+
+        Args:
+            size: Number of workers kept warm.
+            backend: "docker", "local" (plain subprocesses with rlimits) or "auto",
+                which uses Docker when the `docker` CLI is installed and its daemon is
+                running, and local workers otherwise. Local workers run generated code on
+                the host with only a memory cap, so "auto" warns when it falls back to them.
+            image_name: Docker image used by the docker backend.
+            max_runs_per_worker: Batches a worker serves before it is recycled.
+            memory_limit_mb: Memory cap applied to each worker.
+            cpus: CPU quota for each docker worker.
+            shared_dirs: Directories (e.g. columnar test suites) mounted read-only into
+                docker workers at the same path; local workers read them directly. Suites
+                need NumPy in the worker's Python, so use an image that has it.
+        """
+        if backend == "auto":
+            backend = "docker" if docker_available() else "local"
+            if backend == "local":
+                print("WARNING: Docker is unavailable, so generated programs will run directly on this host with "
+                      "only a memory limit. Start Docker for isolation, or pass --sandbox_backend local to accept "
+                      "this explicitly.")
+        if backend not in ("docker", "local"):
+            raise ValueError(f"Unknown sandbox backend: {backend}")
+        self.size = size
+        self.backend = backend
+        self.image_name = image_name
+        self.max_runs_per_worker = max_runs_per_worker
+        self.memory_limit_mb = memory_limit_mb
+        self.cpus = cpus
+        self.shared_dirs = [os.path.abspath(d) for d in shared_dirs or []]
+        self.runner_source = read_runner_source()
+
+        self._idle: queue.Queue = queue.Queue()
+        self._workers = [self._create_worker() for _ in range(size)]
+        for worker in self._workers:
+            self._idle.put(worker)
+
+        self._lock = threading.Lock()
+        self._created_at = time.perf_counter()
+        self._busy_seconds = 0.0
+        self._latencies: deque = deque(maxlen=1000)
+        self.batches_run = 0
+        self.recycled = 0
+        self.crashes = 0
+        # Requests waiting for an idle worker; a persistently non-zero depth means the pool is too small
+        self.queue_depth = 0
+        self.peak_queue_depth = 0
+        self._queue_seconds = 0.0
+
+    def _create_worker(self) -> SandboxWorker:
+        if self.backend == "docker":
+            docker_args = [
+                "--network", "none",
+                "--memory", f"{self.memory_limit_mb}m",
+                "--cpus", str(self.cpus),
+                "--pids-limit", "64",
+                "--read-only", "--tmpfs", "/tmp",
+            ]
+            for directory in self.shared_dirs:
+                docker_args += ["-v", f"{directory}:{directory}:ro"]
+            return DockerSandboxWorker(docker_args, self.image_name, self.runner_source)
+        limits = LOCAL_LIMITS.format(limit=self.memory_limit_mb * 1024 * 1024)
+        return SandboxWorker([sys.executable, "-u", "-I", "-c", limits + self.runner_source])
+
+    def run_batch(self, code: str, function_name: str, test_inputs: List[Any], timeout: float = 10,
+                  per_test_timeout: float | None = None, expected_outputs: List[Any] | None = None,
+                  stop_on_failure: bool = False) -> List[Tuple[Any, str, str]]:
+        """
+        Runs the program against all test inputs in one round-trip to a warm worker.
+
+        Args:
+            code: The Python code to run.
+            function_name: The name of the function to call in the code.
+            test_inputs: The inputs to pass to the function, one call per input.
+            timeout: Maximum execution time in seconds for the whole batch.
+            per_test_timeout: Optional maximum execution time for each input.
+            expected_outputs: Expected results, needed only for `stop_on_failure`.
+            stop_on_failure: Stop the batch at the first failing input.
+
+        Returns:
+            A list of (result, stdout, stderr) tuples, one per executed test input, in
+            the same shape as `DockerSandbox.run_code`. It is shorter than `test_inputs`
+            when the batch stopped early.
+        """
+        request = {"code": code, "function_name": function_name, "inputs": list(test_inputs),
+                   "timeout": per_test_timeout}
+        if stop_on_failure and expected_outputs is not None:
+            request["expected"] = list(expected_outputs)
+            request["stop_on_failure"] = True
+        try:
+            response = self._dispatch(request, timeout)
+        except SandboxError as e:
+            return [(None, "", str(e)) for _ in test_inputs]
+        if "error" in response:
+            return [(None, "", response["error"]) for _ in test_inputs]
+        return [(r["result"], r["stdout"], r["stderr"]) for r in response["results"]]
+
+    def run_suite(self, code: str, function_name: str, directory: str, indices: List[int] | None = None,
+                  timeout: float = 60, per_test_timeout: float | None = None,
+                  stop_on_failure: bool = False) -> Dict[str, Any]:
+        """
+        Runs the program against a columnar test suite that the worker memory-maps itself.
+
+        Only the case indices travel over the pipe, and only a pass count and the
+        first failures come back, however large the suite is.
+
+        Args:
+            code: The Python code to run.
+            function_name: The name of the function to call in the code.
+            directory: The `TestSuite` directory.
+            indices: Case indices to run; None runs the whole suite.
+            timeout: Maximum execution time in seconds for the whole suite.
+            per_test_timeout: Optional maximum execution time for each case.
+            stop_on_failure: Stop calling the function at the first case that raises.
+
+        Returns:
+            The runner's suite response: `tests_run`, `tests_passed` and `failures`, or `error`.
+        """
+        request = {"op": "suite", "code": code, "function_name": function_name,
+                   "directory": os.path.abspath(directory), "indices": indices,
+                   "timeout": per_test_timeout, "stop_on_failure": stop_on_failure}
+        try:
+            return self._dispatch(request, timeout)
+        except SandboxError as e:
+            return {"error": str(e)}
+
+    def run_benchmark(self, code: str, function_name: str, sized_inputs: List[Tuple[int, Any]],
+                      repeats: int = 5, warmup: int = 1, timeout: float = 60,
+                      per_call_timeout: float | None = None) -> Dict[str, Any]:
+        """
+        Times the program on inputs of increasing size in one round-trip.
+
+        Args:
+            code: The Python code to run.
+            function_name: The name of the function to call in the code.
+            sized_inputs: (size, input) pairs, smallest first.
+            repeats: Timed calls per size; the median is reported.
+            warmup: Untimed calls per size before timing.
+            timeout: Maximum execution time in seconds for the whole benchmark.
+            per_call_timeout: Optional maximum execution time for each call.
+
+        Returns:
+            The runner's benchmark response: `samples`, or `error`.
+        """
+        request = {"op": "benchmark", "code": code, "function_name": function_name,
+                   "sized_inputs": [list(pair) for pair in sized_inputs], "repeats": repeats,
+                   "warmup": warmup, "timeout": per_call_timeout}
+        try:
+            return self._dispatch(request, timeout)
+        except SandboxError as e:
+            return {"error": str(e)}
+
+    def _dispatch(self, request: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Runs one request on an idle worker, recycling the worker when needed."""
+        with self._lock:
+            self.queue_depth += 1
+            self.peak_queue_depth = max(self.peak_queue_depth, self.queue_depth)
+        waited = time.perf_counter()
+        worker = self._idle.get()
+        start = time.perf_counter()
+        with self._lock:
+            self.queue_depth -= 1
+            self._queue_seconds += start - waited
+        try:
+            return worker.run(request, timeout)
+        except SandboxError:
+            with self._lock:
+                self.crashes += 1
+            worker.restart()
+            raise
+        finally:
+            self._record_run(time.perf_counter() - start)
+            if worker.alive and worker.runs >= self.max_runs_per_worker:
+                worker.restart()
+                with self._lock:
+                    self.recycled += 1
+            elif not worker.alive:
+                worker.restart()
+            self._idle.put(worker)
+
+    def _record_run(self, elapsed: float):
+        with self._lock:
+            self.batches_run += 1
+            self._busy_seconds += elapsed
+            self._latencies.append(elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns per-run latency and utilisation figures for sizing the pool."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            wall = time.perf_counter() - self._created_at
+            stats = {
+                "backend": self.backend,
+                "size": self.size,
+                "batches_run": self.batches_run,
+                "recycled": self.recycled,
+                "crashes": self.crashes,
+                "queue_depth": self.queue_depth,
+                "peak_queue_depth": self.peak_queue_depth,
+                "mean_queue_wait": self._queue_seconds / self.batches_run if self.batches_run else 0.0,
+                "utilisation": self._busy_seconds / (wall * self.size) if wall > 0 else 0.0,
+            }
+        if latencies:
+            stats["latency_mean"] = sum(latencies) / len(latencies)
+            stats["latency_p50"] = latencies[len(latencies) // 2]
+            stats["latency_p95"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return stats
+
+    def close(self):
+        for worker in getattr(self, "_workers", []):
+            worker.close()
+        self._workers = []
+
+    def __del__(self):
+        self.close()
@@ -0,0 +1,277 @@
+"""
+Worker-side loop for the pooled sandbox.
+
+The source of this module is sent verbatim to each sandbox worker (a Docker
+container or a local subprocess) and started with `python -u -c`. It reads one
+JSON request per line on stdin and answers with one JSON line per request, so a
+whole batch of test cases costs a single round-trip. Keep it standard-library
+only (NumPy is imported lazily, for columnar test suites) and compatible with
+the Python version of the sandbox image.
+"""
+import contextlib
+import io
+import json
+import os
+import signal
+import sys
+import time
+import traceback
+import tracemalloc
+
+
+class CaseTimeout(Exception):
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise CaseTimeout("Test case exceeded its time limit.")
+
+
+def normalize(value):
+    """Returns the value as it looks after a JSON round-trip, or its repr if it has none."""
+    try:
+        return json.loads(json.dumps(value))
+    except (TypeError, ValueError):
+        return repr(value)
+
+
+def outputs_match(actual, expected):
+    """Compares a function result with the expected output on both sides of the pipe."""
+    return normalize(actual) == normalize(expected)
+
+
+def load_function(code, function_name):
+    """Executes the candidate code in a fresh namespace and returns the target function."""
+    namespace = {"__name__": "__candidate__"}
+    exec(compile(code, "<candidate>", "exec"), namespace)
+    if function_name not in namespace:
+        raise NameError(f"Function '{function_name}' is not defined by the program.")
+    return namespace[function_name]
+
+
+def call_with_timeout(func, test_input, timeout):
+    """Calls the function on one test input, capturing its output streams."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    result = None
+    if timeout:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            result = func(test_input)
+    except BaseException:
+        stderr.write(traceback.format_exc())
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return result, stdout.getvalue(), stderr.getvalue()
+
+
+def run_batch(request):
+    """
+    Runs one program against a batch of test inputs.
+
+    Args:
+        request: A dict with `code`, `function_name`, `inputs`, an optional per-test
+            `timeout` in seconds and, for pass/fail cutoffs, `expected` outputs with
+            `stop_on_failure` set.
+
+    Returns:
+        A dict with a `results` list of {result, stdout, stderr, elapsed} entries.
+        With `stop_on_failure` the list ends at the first failing test.
+    """
+    try:
+        func = load_function(request["code"], request["function_name"])
+    except BaseException:
+        error = traceback.format_exc()
+        return {"results": [{"result": None, "stdout": "", "stderr": error, "elapsed": 0.0}
+                            for _ in request["inputs"]]}
+
+    expected = request.get("expected")
+    stop_on_failure = request.get("stop_on_failure") and expected is not None
+    results = []
+    for i, test_input in enumerate(request["inputs"]):
+        start = time.perf_counter()
+        result, stdout, stderr = call_with_timeout(func, test_input, request.get("timeout"))
+        results.append({
+            "result": normalize(result),
+            "stdout": stdout,
+            "stderr": stderr,
+            "elapsed": time.perf_counter() - start,
+        })
+        if stop_on_failure and (stderr or not outputs_match(result, expected[i])):
+            break
+    return {"results": results}
+
+
+def run_benchmark(request):
+    """
+    Times a program on inputs of increasing size.
+
+    Args:
+        request: A dict with `code`, `function_name`, `sized_inputs` (a list of
+            [size, input] pairs), `repeats`, `warmup` and an optional per-call `timeout`.
+
+    Returns:
+        A dict with a `samples` list of {size, wall, cpu, peak_memory} entries holding
+        the median wall and CPU seconds per call and the peak traced allocation in
+        bytes. On failure it holds an `error` instead.
+    """
+    func = load_function(request["code"], request["function_name"])
+    timeout = request.get("timeout")
+    samples = []
+    for size, test_input in request["sized_inputs"]:
+        for _ in range(request.get("warmup", 1)):
+            _, _, stderr = call_with_timeout(func, test_input, timeout)
+            if stderr:
+                return {"error": stderr}
+
+        walls, cpus = [], []
+        for _ in range(request.get("repeats", 5)):
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            _, _, stderr = call_with_timeout(func, test_input, timeout)
+            walls.append(time.perf_counter() - wall_start)
+            cpus.append(time.process_time() - cpu_start)
+            if stderr:
+                return {"error": stderr}
+
+        # Memory is measured on a separate call since tracing slows execution down
+        tracemalloc.start()
+        call_with_timeout(func, test_input, timeout)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        samples.append({"size": size, "wall": sorted(walls)[len(walls) // 2],
+                        "cpu": sorted(cpus)[len(cpus) // 2], "peak_memory": peak_memory})
+
+    # Pooled workers outlive many candidates, so only the traced allocation peak is per-candidate
+    return {"samples": samples}
+
+
+_SUITE_COLUMNS = {}
+
+
+def _suite_column(directory, manifest, name):
+    """Memory-maps a suite column once per worker; every worker shares the pages through the OS cache."""
+    import numpy as np
+    key = (directory, name)
+    if key not in _SUITE_COLUMNS:
+        if manifest[name] == "dense":
+            data = np.load(os.path.join(directory, name + ".npy"), mmap_mode="r")
+            _SUITE_COLUMNS[key] = (data, lambda i: data[i])
+        else:
+            values = np.load(os.path.join(directory, name + ".values.npy"), mmap_mode="r")
+            offsets = np.load(os.path.join(directory, name + ".offsets.npy"), mmap_mode="r")
+            _SUITE_COLUMNS[key] = (None, lambda i: values[offsets[i]:offsets[i + 1]])
+    return _SUITE_COLUMNS[key]
+
+
+def run_suite(request):
+    """
+    Runs one program against a memory-mapped columnar test suite.
+
+    Args:
+        request: A dict with `code`, `function_name`, the suite `directory`, optional
+            case `indices` (all cases when absent), an optional per-test `timeout`,
+            `stop_on_failure` (stop at the first case that raises or returns a wrong
+            output) and `max_failures` to report.
+
+    Returns:
+        A dict with `tests_run`, `tests_passed` and a `failures` list of
+        {index, input, expected, got | error} entries for the first failing cases.
+    """
+    import numpy as np
+    directory = request["directory"]
+    with open(os.path.join(directory, "manifest.json")) as f:
+        manifest = json.load(f)
+    _, inputs = _suite_column(directory, manifest, "inputs")
+    expected_block, outputs = _suite_column(directory, manifest, "outputs")
+    indices = request.get("indices")
+    if indices is None:
+        indices = range(manifest["size"])
+    rtol, atol = manifest.get("rtol", 1e-6), manifest.get("atol", 1e-9)
+    as_list = manifest.get("input_format", "list") == "list"
+    max_failures = request.get("max_failures", 5)
+    stop_on_failure = request.get("stop_on_failure")
+
+    def output_matches(result, i):
+        try:
+            actual = np.asarray(result, dtype=float)
+            expected = np.asarray(outputs(i), dtype=float)
+            return (actual.shape == expected.shape
+                    and bool(np.isclose(actual, expected, rtol=rtol, atol=atol, equal_nan=True).all()))
+        except (TypeError, ValueError):
+            return False
+
+    try:
+        func = load_function(request["code"], request["function_name"])
+    except BaseException:
+        return {"tests_run": len(indices), "tests_passed": 0,
+                "failures": [{"index": None, "error": traceback.format_exc()}]}
+
+    results, errors = [], {}
+    for position, i in enumerate(indices):
+        row = inputs(i)
+        result, _, stderr = call_with_timeout(func, row.tolist() if as_list else row, request.get("timeout"))
+        results.append(result)
+        if stderr:
+            errors[position] = stderr
+            if stop_on_failure:
+                break
+        elif stop_on_failure and not output_matches(result, i):
+            break
+
+    # One vectorized comparison when the outputs form a dense block, otherwise one per case
+    passed = np.zeros(len(results), dtype=bool)
+    compared = False
+    if expected_block is not None and not errors:
+        try:
+            actual = np.asarray(results, dtype=float)
+            expected = np.asarray(expected_block[np.asarray(indices[:len(results)], dtype=np.int64)], dtype=float)
+            if actual.shape == expected.shape:
+                close = np.isclose(actual, expected, rtol=rtol, atol=atol, equal_nan=True)
+                passed = close.reshape(len(results), -1).all(axis=1)
+                compared = True
+        except (TypeError, ValueError):
+            pass
+    if not compared:
+        for position, result in enumerate(results):
+            if position not in errors:
+                passed[position] = output_matches(result, indices[position])
+
+    failures = []
+    for position in np.flatnonzero(~passed)[:max_failures]:
+        i = indices[int(position)]
+        failure = {"index": int(i), "input": repr(inputs(i).tolist())[:200],
+                   "expected": repr(outputs(i).tolist())[:200]}
+        if int(position) in errors:
+            failure["error"] = errors[int(position)]
+        else:
+            failure["got"] = repr(normalize(results[int(position)]))[:200]
+        failures.append(failure)
+    return {"tests_run": len(results), "tests_passed": int(passed.sum()), "failures": failures}
+
+
+OPERATIONS = {"run": run_batch, "benchmark": run_benchmark, "suite": run_suite}
+
+
+def main():
+    # Keep the protocol on a private copy of stdout so that candidates writing
+    # to file descriptor 1 directly cannot corrupt the response stream.
+    protocol = os.fdopen(os.dup(1), "w")
+    os.dup2(2, 1)
+    signal.signal(signal.SIGALRM, _raise_timeout)
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            response = OPERATIONS[request.get("op", "run")](request)
+        except BaseException:
+            response = {"error": traceback.format_exc()}
+        protocol.write(json.dumps(response) + "\n")
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import re
+from typing import List
+
+CODE_BLOCK_PATTERN = re.compile(r"```[ \t]*(?:python|py|python3)?[ \t]*\n(.*?)```", re.DOTALL | re.IGNORECASE)
+
+
+def extract_code_blocks(text: str) -> List[str]:
+    """
+    Extracts the contents of all triple backtick code blocks from an LLM response.
+
+    A response without any code fences is treated as a single bare program.
+    """
+    if not text:
+        return []
+    blocks = [block.strip() for block in CODE_BLOCK_PATTERN.findall(text)]
+    if not blocks and "```" not in text:
+        blocks = [text.strip()]
+    return [block for block in blocks if block]
+
+
+def extract_code(text: str) -> str:
+    """Returns the first code block of an LLM response, or an empty string if there is none."""
+    blocks = extract_code_blocks(text)
+    return blocks[0] if blocks else ""
@@ -1,41 +1,68 @@
-import google.generativeai as genai
 import os
-from dotenv import load_dotenv
 
-load_dotenv() # Load environment variables from .env
+from alphaevolve_core.src.llm_services.llm_client import LLMClient
+from alphaevolve_core.src.llm_services.rate_limit import RateLimiter, RetryPolicy, estimate_tokens
+from alphaevolve_core.src.llm_services.response_cache import ResponseCache, Cassette
+from alphaevolve_core.src.utils.telemetry import Telemetry
 
-class GeminiClient:
-    def __init__(self, model_name="gemini-1.5-flash-latest"): # Or gemini-1.5-pro-latest
+
+def load_environment():
+    """Loads environment variables from .env; python-dotenv is imported on first use, like the Gemini SDK."""
+    try:
+        from dotenv import load_dotenv
+    except ImportError: # Without python-dotenv, only the real environment is used
+        return
+    load_dotenv()
+
+class GeminiClient(LLMClient):
+    def __init__(self, model_name="gemini-1.5-flash-latest", # Or gemini-1.5-pro-latest
+                 cache: ResponseCache = None, cassette: Cassette = None,
+                 rate_limiter: RateLimiter = None, retry_policy: RetryPolicy = None,
+                 telemetry: Telemetry = None):
+        super().__init__(model_name, cache=cache, cassette=cassette,
+                         rate_limiter=rate_limiter, retry_policy=retry_policy, telemetry=telemetry)
+        # The SDK is imported on first use: importing it takes longer than everything else at startup
+        import google.generativeai as genai
+        load_environment()
+        self.genai = genai
         genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        # One model instance per client, so its underlying connection is reused across calls
         self.model = genai.GenerativeModel(model_name)
 
-    def generate_text(self, prompt, temperature=0.7, #... other params
-                     safety_settings=None # Configure as needed
-                     ):
-        try:
-            # Example safety settings - adjust as per your needs & Gemini docs
-            # Consult Gemini documentation for specific safety setting options
-            # default_safety_settings = [
-            #     {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-            #     {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-            #     {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-            #     {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-            # ]
-            # current_safety_settings = safety_settings if safety_settings is not None else default_safety_settings
-
-            response = self.model.generate_content(
-                prompt,
-                # generation_config=genai.types.GenerationConfig(temperature=temperature, ...),
-                # safety_settings=current_safety_settings
-            )
-            # Handle potential blocks due to safety or other reasons
-            if not response.candidates or not response.candidates[0].content.parts:
-                 # Check response.prompt_feedback for block reasons
-                block_reason = response.prompt_feedback.block_reason if response.prompt_feedback else "Unknown"
-                print(f"WARN: Generation blocked or empty. Reason: {block_reason}")
-                # print(f"Full response: {response}") # For debugging
-                return "" # Or raise an exception
-            return response.text
-        except Exception as e:
-            print(f"Error generating text with Gemini: {e}")
-            return "" # Or re-raise
+    def _request(self, prompt, temperature, safety_settings):
+        response = self.model.generate_content(
+            prompt,
+            generation_config=self.genai.types.GenerationConfig(temperature=temperature),
+            safety_settings=safety_settings,
+        )
+        return self._parse_response(prompt, response)
+
+    async def _request_async(self, prompt, temperature, safety_settings):
+        response = await self.model.generate_content_async(
+            prompt,
+            generation_config=self.genai.types.GenerationConfig(temperature=temperature),
+            safety_settings=safety_settings,
+        )
+        return self._parse_response(prompt, response)
+
+    def _parse_response(self, prompt, response):
+        # Example safety settings - adjust as per your needs & Gemini docs
+        # Consult Gemini documentation for specific safety setting options
+        # default_safety_settings = [
+        #     {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+        #     {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+        #     {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+        #     {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+        # ]
+        usage = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(usage, "prompt_token_count", 0) or estimate_tokens(prompt)
+        completion_tokens = getattr(usage, "candidates_token_count", 0) or 0
+
+        # Handle potential blocks due to safety or other reasons
+        if not response.candidates or not response.candidates[0].content.parts:
+             # Check response.prompt_feedback for block reasons
+            block_reason = response.prompt_feedback.block_reason if response.prompt_feedback else "Unknown"
+            print(f"WARN: Generation blocked or empty. Reason: {block_reason}")
+            # print(f"Full response: {response}") # For debugging
+            return "", prompt_tokens, completion_tokens
+        return response.text, prompt_tokens, completion_tokens or estimate_tokens(response.text)
@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Tuple
+
+from alphaevolve_core.src.llm_services.rate_limit import (RateLimiter, RetryPolicy, LLMMetrics,
+                                                          is_transient, estimate_tokens)
+from alphaevolve_core.src.llm_services.response_cache import ResponseCache, Cassette, response_key
+from alphaevolve_core.src.utils.telemetry import Telemetry
+
+class LLMClient:
+    """
+    Shared plumbing for LLM backends: response cache, cassette record/replay, request
+    coalescing, rate limiting, retries and metrics.
+
+    Backends implement `_request` and `_request_async`, each returning
+    (text, prompt_tokens, completion_tokens) and raising on errors. With a `Telemetry`,
+    latency and token counts of every request are also recorded as histograms.
+    """
+
+    def __init__(self, model_name: str, cache: ResponseCache = None, cassette: Cassette = None,
+                 rate_limiter: RateLimiter = None, retry_policy: RetryPolicy = None,
+                 telemetry: Telemetry = None):
+        self.model_name = model_name
+        self.cache = cache
+        self.cassette = cassette
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.metrics = LLMMetrics()
+        self.telemetry = telemetry
+        self._inflight = {} # key -> Future shared by concurrent identical requests
+        self._inflight_lock = threading.Lock()
+
+    def _request(self, prompt, temperature, safety_settings) -> Tuple[str, int, int]:
+        raise NotImplementedError("LLM backend not implemented.")
+
+    async def _request_async(self, prompt, temperature, safety_settings) -> Tuple[str, int, int]:
+        return await asyncio.to_thread(self._request, prompt, temperature, safety_settings)
+
+    def generate_text(self, prompt, temperature=0.7, safety_settings=None) -> str:
+        """Returns the model's response text, or an empty string if the request failed for good."""
+        key = response_key(self.model_name, prompt, {"temperature": temperature})
+        found, text = self._lookup(key)
+        if found:
+            return self._returned(key, text)
+        future, owner = self._join_inflight(key)
+        if not owner:
+            return self._returned(key, future.result())
+
+        text = ""
+        try:
+            for attempt in range(self.retry_policy.max_retries + 1):
+                estimated = estimate_tokens(prompt)
+                delay = self.rate_limiter.reserve(estimated)
+                if delay:
+                    self.metrics.record_throttle(delay)
+                    time.sleep(delay)
+                start = time.perf_counter()
+                try:
+                    text, prompt_tokens, completion_tokens = self._request(prompt, temperature, safety_settings)
+                except Exception as e:
+                    self.rate_limiter.settle(estimated, 0)
+                    if not self._should_retry(e, attempt):
+                        break
+                    time.sleep(self.retry_policy.delay(attempt))
+                    continue
+                self._finish_request(start, estimated, prompt_tokens, completion_tokens)
+                break
+        finally:
+            self._complete(key, future, text)
+        return self._returned(key, text)
+
+    async def generate_text_async(self, prompt, temperature=0.7, safety_settings=None) -> str:
+        """Asynchronous `generate_text`, sharing the cache, limiter and metrics with it."""
+        key = response_key(self.model_name, prompt, {"temperature": temperature})
+        found, text = self._lookup(key)
+        if found:
+            return self._returned(key, text)
+        future, owner = self._join_inflight(key)
+        if not owner:
+            return self._returned(key, await asyncio.wrap_future(future))
+
+        text = ""
+        try:
+            for attempt in range(self.retry_policy.max_retries + 1):
+                estimated = estimate_tokens(prompt)
+                delay = self.rate_limiter.reserve(estimated)
+                if delay:
+                    self.metrics.record_throttle(delay)
+                    await asyncio.sleep(delay)
+                start = time.perf_counter()
+                try:
+                    text, prompt_tokens, completion_tokens = await self._request_async(
+                        prompt, temperature, safety_settings)
+                except Exception as e:
+                    self.rate_limiter.settle(estimated, 0)
+                    if not self._should_retry(e, attempt):
+                        break
+                    await asyncio.sleep(self.retry_policy.delay(attempt))
+                    continue
+                self._finish_request(start, estimated, prompt_tokens, completion_tokens)
+                break
+        finally:
+            self._complete(key, future, text)
+        return self._returned(key, text)
+
+    def _lookup(self, key: str) -> Tuple[bool, str]:
+        if self.cassette is not None and self.cassette.replaying:
+            return True, self.cassette.play(key)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if self.telemetry is not None:
+                self.telemetry.increment("llm_cache_lookups", result="miss" if cached is None else "hit")
+            if cached is not None:
+                return True, cached
+        return False, ""
+
+    def _join_inflight(self, key: str) -> Tuple[Future, bool]:
+        """Returns the shared future for this request and whether the caller must issue it."""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def _complete(self, key: str, future: Future, text: str):
+        if text and self.cache is not None:
+            self.cache.put(key, text)
+        with self._inflight_lock:
+            del self._inflight[key]
+        future.set_result(text)
+
+    def _returned(self, key: str, text: str) -> str:
+        """Records every response handed to a caller, whether from the network, the cache or a shared call."""
+        if text and self.cassette is not None and not self.cassette.replaying:
+            self.cassette.record(key, text)
+        return text
+
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        if is_transient(error) and attempt < self.retry_policy.max_retries:
+            self.metrics.record_retry()
+            print(f"WARN: Transient error from {self.model_name} ({type(error).__name__}: {error}); "
+                  f"retry {attempt + 1}/{self.retry_policy.max_retries}.")
+            return True
+        self.metrics.record_failure()
+        print(f"Error generating text with {self.model_name}: {error}")
+        return False
+
+    def _finish_request(self, start: float, estimated: int, prompt_tokens: int, completion_tokens: int):
+        latency = time.perf_counter() - start
+        self.metrics.record(latency, prompt_tokens, completion_tokens)
+        if self.telemetry is not None:
+            self.telemetry.observe("llm_latency_seconds", latency, model=self.model_name)
+            self.telemetry.observe("llm_prompt_tokens", prompt_tokens, model=self.model_name)
+            self.telemetry.observe("llm_completion_tokens", completion_tokens, model=self.model_name)
+        self.rate_limiter.settle(estimated, prompt_tokens + completion_tokens)
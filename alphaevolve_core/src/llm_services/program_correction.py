@@ -1,8 +1,22 @@
 from typing import Dict, Any
 
+from alphaevolve_core.src.llm_services.code_extraction import extract_code
+from alphaevolve_core.src.llm_services.prompt_budget import PromptBudget, compact_errors, elide_lines
+
+# Traceback frames and distinct errors kept at each compaction level of the correction prompt
+ERROR_LIMITS = [(3, 5), (1, 3), (1, 1), (1, 1)]
+
 class ProgramCorrector:
-    def __init__(self, gemini_client):
+    def __init__(self, gemini_client, budget: PromptBudget = None, verbose: bool = True):
+        """
+        Args:
+            gemini_client: The LLM client.
+            budget: Optional `PromptBudget` that compacts code and errors to fit a token budget.
+            verbose: Print every correction prompt and corrected program.
+        """
         self.gemini_client = gemini_client
+        self.budget = budget or PromptBudget()
+        self.verbose = verbose
 
     def correct_program(self, buggy_code: str, evaluation_details: Dict[str, Any], project_def: Any) -> str:
         """
@@ -16,28 +30,58 @@ class ProgramCorrector:
         Returns:
             The corrected program code string, or the original code if correction fails.
         """
-        # This is a placeholder implementation based on the plan's example structure.
-        prompt = f"""You are an expert Python debugger. The following Python code is intended to solve this project: "{project_def.description}" by implementing the function: `{project_def.signature}`.
+        prompt = self._correction_prompt(buggy_code, evaluation_details, project_def)
+        return self._parse_correction(self.gemini_client.generate_text(prompt), buggy_code)
+
+    async def correct_program_async(self, buggy_code: str, evaluation_details: Dict[str, Any],
+                                    project_def: Any) -> str:
+        """Asynchronous `correct_program`, awaiting the client's `generate_text_async`."""
+        prompt = self._correction_prompt(buggy_code, evaluation_details, project_def)
+        return self._parse_correction(await self.gemini_client.generate_text_async(prompt), buggy_code)
+
+    def _correction_prompt(self, buggy_code: str, evaluation_details: Dict[str, Any], project_def: Any) -> str:
+        # Static instructions first, so the prefix is identical for every correction on a project
+        prefix = f"""You are an expert Python debugger. The following Python code is intended to solve this project: "{project_def.description}" by implementing the function: `{project_def.signature}`.
 However, it has issues.
+Please analyze the code and the errors below, then provide a corrected version of the Python function.
+Only output the corrected Python code for the function, including necessary imports if any, within a single triple backtick block. Do not include any other explanatory text before or after the code block.
+
+"""
 
-Problematic Code:
+        def body(level: int) -> str:
+            rejection = evaluation_details.get("prefilter")
+            if rejection:
+                # Static rejections pinpoint the problem, so ask for that fix specifically
+                where = f" on line {rejection['line']}" if rejection.get("line") else ""
+                problem = (f"It was rejected before running by the {rejection['stage']} check{where}: "
+                           f"{rejection['message']}")
+            else:
+                max_frames, max_errors = ERROR_LIMITS[level]
+                errors = evaluation_details.get('errors') or 'No specific error details provided.'
+                problem = ("When tested, it produced the following errors/failed these test cases:\n"
+                           f"{compact_errors(errors, max_frames=max_frames, max_errors=max_errors)}")
+            code = buggy_code if level < 3 else elide_lines(buggy_code, 60)
+            return f"""Problematic Code:
 ```python
-{buggy_code}
+{code}
 ```
 
-When tested, it produced the following errors/failed these test cases:
-{evaluation_details.get('errors', 'No specific error details provided.')}
-
-Please analyze the code and the errors, then provide a corrected version of the Python function.
-Only output the corrected Python code for the function, including necessary imports if any, within a single triple backtick block. Do not include any other explanatory text before or after the code block.
+{problem}
 """
-        # In a real implementation, you would call self.gemini_client.generate_text(prompt)
-        # and parse the output to extract the code block.
-        print("Attempting to correct program with Gemini (placeholder)...")
-        print(f"Correction Prompt:\n{prompt}")
 
-        # Dummy corrected code (for demonstration)
-        corrected_code = buggy_code # For now, just return the original code
+        prompt = self.budget.build(prefix, body, levels=len(ERROR_LIMITS))
+        if self.verbose:
+            print("Attempting to correct program with Gemini...")
+            print(f"Correction Prompt:\n{prompt}")
+        return prompt
+
+    def _parse_correction(self, response: str, buggy_code: str) -> str:
+        corrected_code = extract_code(response)
+        if not corrected_code:
+            if self.verbose:
+                print("Correction returned no code; keeping the original program.")
+            return buggy_code
 
-        print(f"Generated dummy corrected code:\n{corrected_code}")
+        if self.verbose:
+            print(f"Generated corrected code:\n{corrected_code}")
         return corrected_code
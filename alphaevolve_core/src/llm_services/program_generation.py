@@ -1,6 +1,16 @@
+from typing import List
+
+from alphaevolve_core.src.llm_services.code_extraction import extract_code, extract_code_blocks
+
 class ProgramGenerator:
-    def __init__(self, gemini_client):
+    def __init__(self, gemini_client, verbose: bool = True):
+        """
+        Args:
+            gemini_client: The LLM client.
+            verbose: Print every prompt and generated program.
+        """
         self.gemini_client = gemini_client
+        self.verbose = verbose
 
     def generate_program(self, prompt: str) -> str:
         """
@@ -10,19 +20,51 @@ class ProgramGenerator:
             prompt: The prompt generated by the EvolvePromptGenerator.
 
         Returns:
-            The generated program code string.
+            The generated program code string, or an empty string if the response holds no code.
+        """
+        if self.verbose:
+            print("Generating program with Gemini...")
+            print(f"Prompt:\n{prompt}")
+        return self._parse_program(self.gemini_client.generate_text(prompt))
+
+    async def generate_program_async(self, prompt: str) -> str:
+        """Asynchronous `generate_program`, awaiting the client's `generate_text_async`."""
+        if self.verbose:
+            print("Generating program with Gemini...")
+            print(f"Prompt:\n{prompt}")
+        return self._parse_program(await self.gemini_client.generate_text_async(prompt))
+
+    def _parse_program(self, response: str) -> str:
+        code = extract_code(response)
+        if self.verbose:
+            print(f"Generated program:\n{code}")
+        return code
+
+    def generate_programs(self, prompt: str, num_candidates: int) -> List[str]:
+        """
+        Generates several candidate programs from a single Gemini response.
+
+        Args:
+            prompt: A prompt asking for `num_candidates` programs in separate code blocks.
+            num_candidates: The maximum number of programs to return.
+
+        Returns:
+            The generated program code strings, possibly fewer than requested.
         """
-        # This is a placeholder implementation.
-        # In a real implementation, you would call self.gemini_client.generate_text(prompt)
-        # and parse the output to extract the code block.
-        print("Generating program with Gemini (placeholder)...")
-        print(f"Prompt:\n{prompt}")
-
-        # Dummy program code
-        dummy_code = """
-def example_function(input):
-    # This is a dummy program
-    return input * 2
-"""
-        print(f"Generated dummy program:\n{dummy_code}")
-        return dummy_code
+        if self.verbose:
+            print(f"Generating {num_candidates} candidate programs with Gemini...")
+            print(f"Prompt:\n{prompt}")
+        return self._parse_programs(self.gemini_client.generate_text(prompt), num_candidates)
+
+    async def generate_programs_async(self, prompt: str, num_candidates: int) -> List[str]:
+        """Asynchronous `generate_programs`, awaiting the client's `generate_text_async`."""
+        if self.verbose:
+            print(f"Generating {num_candidates} candidate programs with Gemini...")
+            print(f"Prompt:\n{prompt}")
+        return self._parse_programs(await self.gemini_client.generate_text_async(prompt), num_candidates)
+
+    def _parse_programs(self, response: str, num_candidates: int) -> List[str]:
+        programs = extract_code_blocks(response)[:num_candidates]
+        if self.verbose:
+            print(f"Generated {len(programs)} candidate programs.")
+        return programs
@@ -0,0 +1,204 @@
+import difflib
+import re
+import threading
+from typing import List, Dict, Any, Callable
+
+# Approximates a BPE tokenizer: words and digit groups are tokens, long words split
+# every few characters, and indentation runs cost about one token per four spaces.
+TOKEN_PATTERN = re.compile(r"[A-Za-z_]+|\d{1,3}|\n|[ \t]+|[^\sA-Za-z_\d]")
+
+
+def count_tokens(text: str) -> int:
+    """Counts prompt tokens locally, without a round-trip to the provider."""
+    tokens = 0
+    for match in TOKEN_PATTERN.finditer(text):
+        piece = match.group()
+        if piece[0] in " \t":
+            # A single space is merged into the following word
+            tokens += (len(piece) - 1 + 3) // 4
+        elif piece[0].isalpha() or piece[0] == "_":
+            tokens += (len(piece) + 5) // 6
+        else:
+            tokens += 1
+    return tokens
+
+
+def program_diff(base: str, other: str, context: int = 2) -> str:
+    """Unified diff turning `base` into `other`."""
+    return "\n".join(difflib.unified_diff(base.splitlines(), other.splitlines(), "best", "parent",
+                                          n=context, lineterm=""))
+
+
+FRAME_PATTERN = re.compile(r'^  File "(?P<file>[^"]+)", line \d+')
+
+
+def trim_traceback(traceback_text: str, max_frames: int = 3) -> str:
+    """
+    Keeps the frames of a traceback that point into the candidate program.
+
+    Sandbox runner frames are dropped, and only the innermost `max_frames` frames are
+    kept, along with the header and the exception message.
+    """
+    lines = traceback_text.rstrip("\n").splitlines()
+    if not lines or not lines[0].startswith("Traceback"):
+        return traceback_text.rstrip("\n")
+    frames, current, tail = [], None, []
+    for line in lines[1:]:
+        if FRAME_PATTERN.match(line):
+            current = [line]
+            frames.append(current)
+        elif line.startswith("    ") and current is not None:
+            current.append(line)
+        else:
+            current = None
+            tail.append(line)
+    relevant = [frame for frame in frames if '"<candidate>"' in frame[0]] or frames
+    kept = relevant[-max_frames:]
+    trimmed = [lines[0]]
+    if len(relevant) > len(kept) or len(frames) > len(relevant):
+        trimmed.append(f"  ... {len(frames) - len(kept)} frame(s) omitted ...")
+    for frame in kept:
+        trimmed.extend(frame)
+    return "\n".join(trimmed + tail)
+
+
+ERROR_HEADER = re.compile(r"^Test (\d+) \(input=")
+
+
+def compact_errors(errors: str, max_frames: int = 3, max_errors: int = 5) -> str:
+    """
+    Shortens the error report of an evaluation.
+
+    Tracebacks are trimmed to the relevant frames, tests failing with the same message
+    are merged into one entry, and at most `max_errors` entries are kept.
+    """
+    if not errors:
+        return errors
+    entries, current = [], []
+    for line in errors.splitlines():
+        if ERROR_HEADER.match(line) and current:
+            entries.append(current)
+            current = []
+        current.append(line)
+    if current:
+        entries.append(current)
+
+    merged: Dict[str, List[Any]] = {}
+    for entry in entries:
+        header, body = entry[0], "\n".join(entry[1:])
+        if body.lstrip().startswith("Traceback"):
+            body = trim_traceback(body, max_frames)
+        # Tests raising the same exception are reported once
+        key = body.splitlines()[-1] if body else header
+        match = ERROR_HEADER.match(header)
+        if key in merged and match:
+            merged[key][1].append(match.group(1))
+        else:
+            merged[key] = [f"{header}\n{body}" if body else header, []]
+
+    shown = list(merged.values())[:max_errors]
+    text = []
+    for entry, duplicates in shown:
+        if duplicates:
+            entry += f"\n(The same error also occurred in tests {', '.join(duplicates)}.)"
+        text.append(entry)
+    if len(merged) > len(shown):
+        text.append(f"... {len(merged) - len(shown)} more distinct error(s) omitted.")
+    return "\n".join(text)
+
+
+def elide_lines(text: str, max_lines: int) -> str:
+    """Keeps the first and last lines of a long text, dropping the middle."""
+    lines = text.splitlines()
+    if len(lines) <= max_lines:
+        return text
+    head = max_lines // 2
+    tail = max_lines - head
+    return "\n".join(lines[:head] + [f"# ... {len(lines) - max_lines} lines omitted ..."] + lines[-tail:])
+
+
+def describe_parents(parents: List[Dict[str, Any]], level: int = 0) -> str:
+    """
+    Describes parent programs at a compaction level.
+
+    Level 0 shows the fittest parent in full and every other parent as a diff against
+    it whenever the diff is shorter. Level 1 uses diffs without context lines, level 2
+    drops all but the fittest parent and level 3 also elides the middle of its code.
+    """
+    if not parents:
+        return ""
+    parents = sorted(parents, key=lambda parent: parent["fitness"], reverse=True)
+    best = parents[0]
+    best_code = best["code"] if level < 3 else elide_lines(best["code"], 40)
+    text = "Here are some existing attempts (parent programs) to solve this project:\n"
+    text += f"Parent Program 1 (fitness {best['fitness']}):\n```python\n{best_code}\n```\n"
+    for i, parent in enumerate(parents[1:], start=2):
+        if level >= 2:
+            text += f"(Parent Program {i}, fitness {parent['fitness']}, omitted for length.)\n"
+            continue
+        if parent["code"] == best["code"]:
+            text += f"Parent Program {i} (fitness {parent['fitness']}) is identical to Parent Program 1.\n"
+            continue
+        diff = program_diff(best["code"], parent["code"], context=2 if level == 0 else 0)
+        if len(diff) < len(parent["code"]):
+            text += (f"Parent Program {i} (fitness {parent['fitness']}), as a diff against Parent Program 1:\n"
+                     f"```diff\n{diff}\n```\n")
+        else:
+            text += f"Parent Program {i} (fitness {parent['fitness']}):\n```python\n{parent['code']}\n```\n"
+    return text
+
+
+class PromptBudget:
+    def __init__(self, max_tokens: int | None = None, counter: Callable[[str], int] = count_tokens):
+        """
+        Assembles prompts within a token budget and keeps count of the tokens sent.
+
+        Prompts are built as a static prefix, identical for every call on a project so
+        provider-side prompt caching applies, followed by the per-call body (parents,
+        errors). The body is compacted level by level until the prompt fits.
+
+        Args:
+            max_tokens: Token budget per prompt; None only counts tokens.
+            counter: Local token counter.
+        """
+        self.max_tokens = max_tokens
+        self.counter = counter
+        self._lock = threading.Lock()
+        self.prompts = 0
+        self.total_tokens = 0
+        self.compacted = 0
+        self.over_budget = 0
+
+    def build(self, prefix: str, body: Callable[[int], str], suffix: str = "", levels: int = 4) -> str:
+        """
+        Returns prefix + body + suffix using the least compacted body that fits.
+
+        Args:
+            prefix: The static instructions; never compacted.
+            body: Builds the per-call section at a compaction level (0 is uncompacted).
+            suffix: A short static closing line.
+            levels: Number of compaction levels `body` supports.
+        """
+        level = 0
+        prompt = prefix + body(0) + suffix
+        tokens = self.counter(prompt)
+        while self.max_tokens is not None and tokens > self.max_tokens and level < levels - 1:
+            level += 1
+            prompt = prefix + body(level) + suffix
+            tokens = self.counter(prompt)
+        with self._lock:
+            self.prompts += 1
+            self.total_tokens += tokens
+            self.compacted += level > 0
+            self.over_budget += self.max_tokens is not None and tokens > self.max_tokens
+        return prompt
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "prompts": self.prompts,
+                "mean_prompt_tokens": self.total_tokens / self.prompts if self.prompts else 0.0,
+                "compacted": self.compacted,
+                "over_budget": self.over_budget,
+                "max_tokens": self.max_tokens,
+            }
@@ -1,12 +1,22 @@
 from typing import List, Dict, Any
 
+from alphaevolve_core.src.llm_services.prompt_budget import PromptBudget, describe_parents
+
 class EvolvePromptGenerator:
-    def __init__(self, gemini_client):
+    def __init__(self, gemini_client, budget: PromptBudget = None, verbose: bool = True):
+        """
+        Args:
+            gemini_client: The LLM client.
+            budget: Optional `PromptBudget` that compacts parents to fit a token budget.
+            verbose: Print every meta-prompt.
+        """
         self.gemini_client = gemini_client
+        self.budget = budget or PromptBudget()
+        self.verbose = verbose
 
     def generate_evolve_prompt(self, project_def: Any, parents: List[Dict[str, Any]] = None, insights: List[str] = None) -> str:
         """
-        Generates a prompt for Gemini to create an evolved program.
+        Asks Gemini to write a prompt for creating an evolved program (the "meta" mode).
 
         Args:
             project_def: The project definition.
@@ -16,23 +26,22 @@ class EvolvePromptGenerator:
         Returns:
             The generated prompt string.
         """
-        # This is a placeholder implementation based on the plan's example structure.
-        prompt = f"""You are an expert programmer and algorithm designer. Your task is to generate a high-quality prompt for another AI coding assistant. This prompt should guide the AI to write a new Python program that aims to solve the following project:
-Project Description: "{project_def.description}"
+        prompt = self._meta_prompt(project_def, parents, insights)
+        return self._parse_evolve_prompt(self.gemini_client.generate_text(prompt), prompt)
 
-"""
-        if parents:
-            prompt += "Here are some existing attempts (parent programs) to solve this project:\n"
-            for i, parent in enumerate(parents):
-                prompt += f"Parent Program {i+1}:\n```python\n{parent['code']}\n```\nFitness: {parent['fitness']}\n"
+    async def generate_evolve_prompt_async(self, project_def: Any, parents: List[Dict[str, Any]] = None,
+                                           insights: List[str] = None) -> str:
+        """Asynchronous `generate_evolve_prompt`, awaiting the client's `generate_text_async`."""
+        prompt = self._meta_prompt(project_def, parents, insights)
+        return self._parse_evolve_prompt(await self.gemini_client.generate_text_async(prompt), prompt)
 
-        if insights:
-            prompt += "Consider the following insights and strategies:\n"
-            for insight in insights:
-                prompt += f"- {insight}\n"
+    def _meta_prompt(self, project_def: Any, parents: List[Dict[str, Any]] = None,
+                     insights: List[str] = None) -> str:
+        # The instructions come first and never change for a project, so they form a cacheable prefix
+        prefix = f"""You are an expert programmer and algorithm designer. Your task is to generate a high-quality prompt for another AI coding assistant. This prompt should guide the AI to write a new Python program that aims to solve the following project:
+Project Description: "{project_def.description}"
 
-        prompt += f"""
-Based on the project and the parent programs (if any), generate a prompt for an AI coding assistant that instructs it to create a new and potentially improved Python program. The new program should implement the function: {project_def.signature}.
+Based on the project and the parent programs (if any) below, generate a prompt for an AI coding assistant that instructs it to create a new and potentially improved Python program. The new program should implement the function: {project_def.signature}.
 The prompt should encourage the AI to:
 Learn from the strengths and weaknesses of the parent programs.
 Try novel approaches or combine ideas from parents if they are good.
@@ -40,10 +49,64 @@ Focus on correctness and adhere to the function signature.
 If parents are provided and have errors, suggest how to avoid those errors.
 Aim for a solution that is both correct and efficient.
 Output only the Python code for the function, including necessary imports if any, within a single triple backtick block. Do not include any other explanatory text before or after the code block.
-Generate the prompt now:
+
 """
-        # In a real implementation, you would call self.gemini_client.generate_text(prompt)
-        # and return the result. For now, we return the constructed prompt.
-        print("Generated evolve prompt (placeholder):")
-        print(prompt)
+        prompt = self.budget.build(prefix, lambda level: self._describe_parents(parents, insights, level),
+                                   suffix="\nGenerate the prompt now:\n")
+        if self.verbose:
+            print("Generated evolve meta-prompt:")
+            print(prompt)
         return prompt
+
+    @staticmethod
+    def _parse_evolve_prompt(evolve_prompt: str, prompt: str) -> str:
+        if not evolve_prompt:
+            # Fall back to the meta-prompt itself; it already asks for the code
+            print("WARN: Prompt generation returned nothing, using the meta-prompt directly.")
+            return prompt
+        return evolve_prompt
+
+    def generate_direct_prompt(self, project_def: Any, parents: List[Dict[str, Any]] = None,
+                               insights: List[str] = None, num_candidates: int = 1) -> str:
+        """
+        Generates a prompt that asks Gemini for the evolved program(s) directly.
+
+        Unlike `generate_evolve_prompt`, this needs no LLM call of its own, so each
+        offspring costs a single round-trip.
+
+        Args:
+            project_def: The project definition.
+            parents: Optional list of parent programs with their fitness scores.
+            insights: Optional list of insights or strategies to guide evolution.
+            num_candidates: Number of diverse candidate programs to request in one response.
+
+        Returns:
+            The prompt string.
+        """
+        prefix = f"""You are an expert programmer and algorithm designer. Write a new Python program that solves the following project:
+Project Description: "{project_def.description}"
+
+The program must implement the function: {project_def.signature}.
+Learn from the strengths and weaknesses of the parent programs (if any), try novel approaches or combine good ideas, and avoid the errors they made.
+Focus on correctness and adhere to the function signature. Aim for a solution that is both correct and efficient.
+"""
+        if num_candidates > 1:
+            prefix += f"""Write {num_candidates} substantially different candidate programs, each taking a different approach.
+Output each candidate as complete Python code, including necessary imports if any, in its own triple backtick block. Do not include any other explanatory text.
+
+"""
+        else:
+            prefix += """Output only the Python code for the function, including necessary imports if any, within a single triple backtick block. Do not include any other explanatory text before or after the code block.
+
+"""
+        return self.budget.build(prefix, lambda level: self._describe_parents(parents, insights, level))
+
+    def _describe_parents(self, parents: List[Dict[str, Any]] = None, insights: List[str] = None,
+                          level: int = 0) -> str:
+        text = describe_parents(parents, level) if parents else ""
+
+        if insights:
+            text += "Consider the following insights and strategies:\n"
+            for insight in insights:
+                text += f"- {insight}\n"
+        return text
@@ -0,0 +1,134 @@
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, Any
+
+# Exception class names (from google.api_core and the standard library) worth retrying
+TRANSIENT_ERRORS = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "DeadlineExceeded",
+    "InternalServerError", "GatewayTimeout", "Aborted", "ConnectionError", "TimeoutError",
+}
+
+
+def is_transient(error: BaseException) -> bool:
+    """Returns True for quota, overload and network errors that a retry may fix."""
+    return any(cls.__name__ in TRANSIENT_ERRORS for cls in type(error).__mro__)
+
+
+def estimate_tokens(text: str) -> int:
+    """A rough local token estimate (about four characters per token)."""
+    return max(1, len(text) // 4) if text else 0
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float, capacity: float | None = None):
+        """
+        A thread-safe token bucket refilled continuously at `per_minute`.
+
+        Callers reserve tokens up front and are told how long to wait, which lets the
+        same bucket serve threads (time.sleep) and coroutines (asyncio.sleep). The
+        default capacity allows a burst of one second's worth of tokens.
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Takes `amount` tokens and returns the seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def refund(self, amount: float):
+        """Returns tokens that were reserved but not used (or takes more when amount is negative)."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+class RateLimiter:
+    def __init__(self, requests_per_minute: float | None = None, tokens_per_minute: float | None = None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def reserve(self, estimated_tokens: int) -> float:
+        """Reserves one request and its estimated tokens; returns the seconds to wait."""
+        delay = 0.0
+        if self.requests is not None:
+            delay = max(delay, self.requests.reserve(1))
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.reserve(estimated_tokens))
+        return delay
+
+    def settle(self, estimated_tokens: int, actual_tokens: int):
+        """Corrects the token bucket once the real usage of a request is known."""
+        if self.tokens is not None:
+            self.tokens.refund(estimated_tokens - actual_tokens)
+
+
+class RetryPolicy:
+    def __init__(self, max_retries: int = 4, base_delay: float = 1.0, max_delay: float = 30.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the given zero-based retry attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class LLMMetrics:
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._latencies: deque = deque(maxlen=window)
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.throttled_seconds = 0.0
+
+    def record(self, latency: float, prompt_tokens: int, completion_tokens: int):
+        with self._lock:
+            self.requests += 1
+            self._latencies.append(latency)
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+
+    def record_throttle(self, seconds: float):
+        with self._lock:
+            self.throttled_seconds += seconds
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                "requests": self.requests,
+                "retries": self.retries,
+                "failures": self.failures,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "throttled_seconds": self.throttled_seconds,
+            }
+        if latencies:
+            stats["latency_mean"] = sum(latencies) / len(latencies)
+            stats["latency_p50"] = latencies[len(latencies) // 2]
+            stats["latency_p95"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return stats
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, Any, List
+
+
+def response_key(model_name: str, prompt: str, generation_config: Dict[str, Any]) -> str:
+    """Hashes everything that determines an LLM response: model, prompt and generation config."""
+    payload = json.dumps({"model": model_name, "prompt": prompt, "config": generation_config},
+                         sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = 1000, ttl: float | None = None, path: str | None = None,
+                 max_disk_entries: int = 100000, commit_interval: int = 32):
+        """
+        A size-bounded LLM response cache with optional expiry.
+
+        Args:
+            max_entries: Size of the in-memory LRU tier.
+            ttl: Seconds a response stays valid; None keeps responses until evicted.
+            path: Optional SQLite file backing the memory tier.
+            max_disk_entries: Oldest on-disk responses beyond this count are evicted.
+            commit_interval: Disk writes are committed every this many puts and on
+                `flush`/`close`, so a crash loses at most that many responses.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+        self.commit_interval = commit_interval
+        self._uncommitted = 0
+        self._entries: OrderedDict = OrderedDict()  # key -> (response, created_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS responses "
+                             "(key TEXT PRIMARY KEY, response TEXT, created_at REAL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_created_at ON responses (created_at)")
+            self._db.commit()
+            self._disk_entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl is not None and time.time() - created_at > self.ttl
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    entry = (row[0], row[1])
+            if entry is not None and self._expired(entry[1]):
+                self._entries.pop(key, None)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+            self._remember(key, entry)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, response: str):
+        entry = (response, time.time())
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                exists = self._db.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone()
+                self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (key, *entry))
+                if exists is None:
+                    self._disk_entries += 1
+                # Evicts only the overflow, oldest first through the created_at index
+                if self._disk_entries > self.max_disk_entries:
+                    self._db.execute("DELETE FROM responses WHERE key IN "
+                                     "(SELECT key FROM responses ORDER BY created_at, rowid LIMIT ?)",
+                                     (self._disk_entries - self.max_disk_entries,))
+                    self._disk_entries = self.max_disk_entries
+                self._uncommitted += 1
+                if self._uncommitted >= self.commit_interval:
+                    self._commit()
+
+    def _remember(self, key: str, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0}
+
+    def _commit(self):
+        self._db.commit()
+        self._uncommitted = 0
+
+    def flush(self):
+        """Commits pending disk writes."""
+        with self._lock:
+            if self._db is not None and self._uncommitted:
+                self._commit()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class CassetteMiss(KeyError):
+    """Raised in replay mode when a request was not recorded on the cassette."""
+
+
+class Cassette:
+    def __init__(self, path: str, mode: str = "replay"):
+        """
+        A recording of LLM responses for deterministic offline runs.
+
+        In "record" mode every response is appended to a JSONL file. In "replay" mode
+        requests are answered from that file without touching the network; repeated
+        requests with the same key are answered in the order they were recorded.
+
+        Args:
+            path: The JSONL cassette file.
+            mode: "record" or "replay".
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._recorded: Dict[str, List[str]] = defaultdict(list)
+        self._cursors: Dict[str, int] = defaultdict(int)
+        if mode == "replay":
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._recorded[entry["key"]].append(entry["response"])
+        elif os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def play(self, key: str) -> str:
+        with self._lock:
+            responses = self._recorded.get(key)
+            if not responses:
+                raise CassetteMiss(f"No recorded response for request {key[:12]} in {self.path}.")
+            # Once a key's recordings are used up, keep answering with the last one
+            index = min(self._cursors[key], len(responses) - 1)
+            self._cursors[key] += 1
+            return responses[index]
+
+    def record(self, key: str, response: str):
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "response": response}) + "\n")
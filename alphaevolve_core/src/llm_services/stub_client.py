@@ -0,0 +1,52 @@
+import asyncio
+import random
+import re
+import time
+from typing import List
+
+from alphaevolve_core.src.llm_services.llm_client import LLMClient
+from alphaevolve_core.src.llm_services.rate_limit import RateLimiter, RetryPolicy, estimate_tokens
+from alphaevolve_core.src.llm_services.response_cache import ResponseCache, Cassette
+from alphaevolve_core.src.utils.telemetry import Telemetry
+
+SIGNATURE_PATTERN = re.compile(r"(def \w+\(.*?\)(?:\s*->\s*[^:]+)?:)")
+
+class StubLLMClient(LLMClient):
+    def __init__(self, responses: List[str] = None, latency: float = 0.0, seed: int = None,
+                 model_name: str = "stub", cache: ResponseCache = None, cassette: Cassette = None,
+                 rate_limiter: RateLimiter = None, retry_policy: RetryPolicy = None,
+                 telemetry: Telemetry = None):
+        """
+        A local LLM backend with the same interface as `GeminiClient`, for offline
+        throughput tests.
+
+        Args:
+            responses: Canned responses picked at random. Without them, the stub answers
+                with a trivial implementation of the first function signature in the prompt.
+            latency: Simulated seconds per request.
+            seed: Seed for the choice of canned responses.
+        """
+        super().__init__(model_name, cache=cache, cassette=cassette,
+                         rate_limiter=rate_limiter, retry_policy=retry_policy, telemetry=telemetry)
+        self.responses = responses
+        self.latency = latency
+        self.random = random.Random(seed)
+
+    def _respond(self, prompt: str):
+        if self.responses:
+            text = self.random.choice(self.responses)
+        else:
+            match = SIGNATURE_PATTERN.search(prompt)
+            signature = match.group(1) if match else "def solution(*args):"
+            text = f"```python\n{signature}\n    return None\n```"
+        return text, estimate_tokens(prompt), estimate_tokens(text)
+
+    def _request(self, prompt, temperature, safety_settings):
+        if self.latency:
+            time.sleep(self.latency)
+        return self._respond(prompt)
+
+    async def _request_async(self, prompt, temperature, safety_settings):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(prompt)
@@ -1,48 +1,218 @@
 import argparse
-from alphaevolve_core.src.core.evolver import Evolver
-from alphaevolve_core.src.project_def.project_base import ProjectBase # Import ProjectBase
-
-# Placeholder for a specific project definition (e.g., a sorting project)
-# In a real scenario, you would import and use a concrete implementation
-class DummyProject(ProjectBase):
-    description = "Write a Python function that takes a list and returns it."
-    function_name = "identity_list"
-    signature = "def identity_list(arr: list) -> list:"
-    test_cases = [
-        {"input": ([1, 2, 3]), "output": [1, 2, 3]},
-        {"input": ([]), "output": []},
-        {"input": (['a', 'b']), "output": ['a', 'b']},
-    ]
+import random
+from alphaevolve_core.src.core.archive import ARCHIVES, DESCRIPTORS, OBJECTIVES
+from alphaevolve_core.src.core.islands import HUB_SECRET_ENV, TOPOLOGIES, IslandModel, hub_authkey, serve_hub
+from alphaevolve_core.src.project_def.registry import ProjectRegistry
+
+# The archive and island modules only need the standard library and the population, so the parser
+# takes its choices from them. Evolver (and through it the LLM and sandbox clients) is imported only
+# once a run starts, so --help, --list_projects and argument errors return without loading it
 
 
 def main():
     parser = argparse.ArgumentParser(description="Run the AlphaEvolve core evolutionary process.")
-    parser.add_argument("--project", type=str, default="dummy", help="Name of the project to evolve.")
-    parser.add_argument("--population_size", type=int, default=50, help="Size of the population.")
-    parser.add_argument("--generations", type=int, default=100, help="Number of generations to run.")
-    parser.add_argument("--tournament_size", type=int, default=5, help="Tournament size for selection.")
-    parser.add_argument("--gemini_model", type=str, default="gemini-1.5-flash-latest", help="Gemini model to use.")
+    project_args = parser.add_argument_group("Project")
+    project_args.add_argument("--project", type=str, default="dummy", help="Name of the project to evolve (see --list_projects), or a package.module:ProjectClass reference.")
+    project_args.add_argument("--projects_dir", type=str, nargs="+", default=None, help="Extra directories of project modules, one project per module.")
+    project_args.add_argument("--list_projects", action="store_true", help="List the available projects and exit.")
+
+    evolution_args = parser.add_argument_group("Evolution")
+    evolution_args.add_argument("--population_size", type=int, default=50, help="Size of the population.")
+    evolution_args.add_argument("--generations", type=int, default=100, help="Number of generations to run.")
+    evolution_args.add_argument("--tournament_size", type=int, default=5, help="Tournament size for selection.")
+    evolution_args.add_argument("--seed", type=int, default=None, help="Random seed, for reproducible (e.g. replayed) runs.")
+    evolution_args.add_argument("--concurrency", type=int, default=1, help="Offspring in flight at once; above 1 runs the asynchronous steady-state loop.")
+    evolution_args.add_argument("--max_llm_requests", type=int, default=None, help="Cap on outstanding LLM requests in steady-state mode (defaults to --concurrency).")
+
+    archive_args = parser.add_argument_group("Archive and selection")
+    archive_args.add_argument("--archive", type=str, default="population", choices=ARCHIVES, help="How programs are kept: the top --population_size by fitness, a MAP-Elites grid of behavioural cells, or a Pareto front.")
+    archive_args.add_argument("--archive_descriptors", type=str, nargs="+", default=None, choices=list(DESCRIPTORS), help="Behavioural descriptors spanning the MAP-Elites grid.")
+    archive_args.add_argument("--archive_bins", type=int, default=8, help="MAP-Elites grid bins per descriptor.")
+    archive_args.add_argument("--cvt_cells", type=int, default=0, help="Use this many centroidal Voronoi cells instead of a MAP-Elites grid.")
+    archive_args.add_argument("--pareto_objectives", type=str, nargs="+", default=None, choices=list(OBJECTIVES), help="Objectives of the Pareto archive (default: fitness speed).")
+    archive_args.add_argument("--selection", type=str, default="tournament", choices=["tournament", "uniform"], help="Parent selection strategy; 'uniform' samples the archive evenly, as in MAP-Elites.")
+    archive_args.add_argument("--program_store", type=str, default=None, help="SQLite file holding population code and evaluation details out of memory (by default they stay in memory).")
+
+    llm_args = parser.add_argument_group("LLM")
+    llm_args.add_argument("--gemini_model", type=str, default="gemini-1.5-flash-latest", help="Gemini model to use.")
+    llm_args.add_argument("--llm_backend", type=str, default="gemini", choices=["gemini", "stub"], help="LLM backend; 'stub' answers locally without network access.")
+    llm_args.add_argument("--generation_mode", type=str, default="meta", choices=["meta", "direct", "batched"], help="How offspring code is requested from the LLM: meta (prompt then code), direct (one call) or batched (several candidates per call).")
+    llm_args.add_argument("--candidates_per_call", type=int, default=4, help="Candidate programs requested per LLM call in batched mode.")
+    llm_args.add_argument("--requests_per_minute", type=float, default=None, help="LLM request rate limit.")
+    llm_args.add_argument("--tokens_per_minute", type=float, default=None, help="LLM token rate limit.")
+    llm_args.add_argument("--max_retries", type=int, default=4, help="Retries for transient LLM errors, with jittered exponential backoff.")
+    llm_args.add_argument("--prompt_token_budget", type=int, default=None, help="Token budget per prompt; parent programs and error reports are compacted to fit.")
+    llm_args.add_argument("--llm_cache_size", type=int, default=0, help="Entries in the in-memory LLM response cache (0 disables it).")
+    llm_args.add_argument("--llm_cache", type=str, default=None, help="SQLite file that persists LLM responses across runs.")
+    llm_args.add_argument("--llm_cache_ttl", type=float, default=None, help="Seconds a cached LLM response stays valid.")
+    llm_args.add_argument("--record_cassette", type=str, default=None, help="Record every LLM response to this JSONL cassette.")
+    llm_args.add_argument("--replay_cassette", type=str, default=None, help="Answer LLM requests from this cassette instead of the network.")
+
+    routing_args = parser.add_argument_group("Model routing and budgets")
+    routing_args.add_argument("--strong_model", type=str, default=None, help="A stronger, more expensive model; generation and correction calls are routed between it and --gemini_model by observed success per unit of cost.")
+    routing_args.add_argument("--strong_cost", type=float, default=10.0, help="Cost per token of --strong_model relative to --gemini_model.")
+    routing_args.add_argument("--routing_patience", type=int, default=5, help="While progress stalls, every this many offspring without improvement is escalated to --strong_model.")
+    routing_args.add_argument("--correction_policy", type=str, default="always", choices=["always", "adaptive"], help="'adaptive' skips corrections whose learned expected fitness gain is below --min_correction_gain.")
+    routing_args.add_argument("--min_correction_gain", type=float, default=0.02, help="Smallest expected fitness gain worth a correction call with the adaptive policy.")
+    routing_args.add_argument("--max_correction_attempts", type=int, default=1, help="Correction calls per offspring at most.")
+    routing_args.add_argument("--token_budget", type=int, default=None, help="Stop the run after this many LLM tokens across all models.")
+    routing_args.add_argument("--time_budget", type=float, default=None, help="Stop the run after this many wall-clock seconds.")
+
+    evaluation_args = parser.add_argument_group("Evaluation")
+    evaluation_args.add_argument("--sandbox_workers", type=int, default=0, help="Number of warm sandbox workers (0 uses the placeholder evaluator).")
+    evaluation_args.add_argument("--sandbox_backend", type=str, default="auto", choices=["auto", "docker", "local"], help="Sandbox worker backend. 'auto' falls back to local workers, which run generated code on this host, when Docker is unavailable.")
+    evaluation_args.add_argument("--eval_workers", type=int, default=None, help="Programs evaluated concurrently (defaults to the sandbox pool size).")
+    evaluation_args.add_argument("--eval_cache", type=str, default=None, help="SQLite file that persists the evaluation cache across runs.")
+    evaluation_args.add_argument("--no_prefilter", action="store_true", help="Send every generated program to the sandbox, skipping the static pre-filter.")
+    evaluation_args.add_argument("--allowed_imports", type=str, nargs="+", default=None, help="Modules generated programs may import (defaults to a small set of pure standard-library modules).")
+    evaluation_args.add_argument("--suite_sample_size", type=int, default=0, help="For projects with a columnar test suite, score programs on this many sampled cases before running the full suite (0 always runs it all).")
+    evaluation_args.add_argument("--racing", action="store_true", help="Score offspring on growing test subsets and stop those that cannot enter the population.")
+    evaluation_args.add_argument("--racing_confidence", type=float, default=0.95, help="Confidence of the racing bound; 1.0 stops only programs that provably cannot be admitted.")
+    evaluation_args.add_argument("--racing_initial_cases", type=int, default=8, help="Test cases in the first racing round.")
+    evaluation_args.add_argument("--performance_weight", type=float, default=0.0, help="Weight of the runtime, memory and scaling score added to correct programs' fitness (0 scores correctness only; needs sandbox workers).")
+    evaluation_args.add_argument("--benchmark_repeats", type=int, default=5, help="Timed calls per input size when benchmarking correct programs.")
+
+    checkpoint_args = parser.add_argument_group("Checkpoints")
+    checkpoint_args.add_argument("--checkpoint", type=str, default=None, help="SQLite file for incremental checkpoints of the run.")
+    checkpoint_args.add_argument("--checkpoint_interval", type=int, default=1, help="Generations between checkpoints.")
+    checkpoint_args.add_argument("--resume", type=str, default=None, help="Resume from this checkpoint file (and keep checkpointing to it).")
+
+    telemetry_args = parser.add_argument_group("Telemetry")
+    telemetry_args.add_argument("--telemetry", type=str, default=None, help="JSONL file receiving span timings, LLM metrics and a summary event per generation.")
+    telemetry_args.add_argument("--metrics_port", type=int, default=None, help="Serve Prometheus metrics on this port at /metrics (islands use consecutive ports).")
+    telemetry_args.add_argument("--metrics_host", type=str, default="127.0.0.1", help="Interface the metrics endpoint binds to (0.0.0.0 exposes it to other machines).")
+    telemetry_args.add_argument("--profile_dir", type=str, default=None, help="Write a cProfile .prof file per generation to this directory.")
+    telemetry_args.add_argument("--quiet", action="store_true", help="Drop the per-offspring prints of prompts and programs; progress stays one line per generation.")
+
+    island_args = parser.add_argument_group("Island model")
+    island_args.add_argument("--islands", type=int, default=1, help="Sub-populations evolved in separate processes; above 1 runs the island model.")
+    island_args.add_argument("--migration_interval", type=int, default=5, help="Generations between island migrations.")
+    island_args.add_argument("--migration_size", type=int, default=2, help="Top individuals each island sends per migration.")
+    island_args.add_argument("--topology", type=str, default="ring", choices=TOPOLOGIES, help="Island migration topology.")
+    island_args.add_argument("--migration_hub", type=str, default=None, help="host:port of the migration hub, for islands on several machines.")
+    island_args.add_argument("--serve_hub", action="store_true", help="Run the migration hub in this process (with --migration_hub).")
+    island_args.add_argument("--hub_only", action="store_true", help="Only run the migration hub at --migration_hub.")
+    island_args.add_argument("--hub_secret", type=str, default=None, help=f"Shared secret of the migration hub (or set {HUB_SECRET_ENV}); required unless the hub is on a loopback address.")
+    island_args.add_argument("--island_offset", type=int, default=0, help="Global index of this machine's first island.")
+    island_args.add_argument("--total_islands", type=int, default=None, help="Islands across all machines (defaults to --islands).")
 
     args = parser.parse_args()
+    if args.islands > 1 and args.concurrency > 1:
+        parser.error("--concurrency is not supported with --islands; each island runs the generational loop.")
+    hub_key = None
+    if args.migration_hub:
+        try:
+            hub_key = hub_authkey(args.migration_hub, args.hub_secret)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.hub_only:
+        serve_hub(args.migration_hub, hub_key)
+        return
+    registry = ProjectRegistry(directories=args.projects_dir)
+    if args.list_projects:
+        print("\n".join(registry.names()))
+        return
+    if args.seed is not None:
+        random.seed(args.seed)
 
-    # In a real implementation, load the project definition based on args.project
-    # For now, we use the DummyProject
-    if args.project == "dummy":
-        project_definition = DummyProject()
-    else:
-        print(f"Error: Project '{args.project}' not found.")
+    try:
+        project_definition = registry.create(args.project)
+    except KeyError:
+        print(f"Error: Project '{args.project}' not found. Available projects: {', '.join(registry.names())}")
         return
 
-    evolver = Evolver(
-        project_def=project_definition,
+    evolver_options = dict(
         population_size=args.population_size,
         generations=args.generations,
         tournament_size=args.tournament_size,
-        gemini_model=args.gemini_model
+        gemini_model=args.gemini_model,
+        sandbox_workers=args.sandbox_workers,
+        sandbox_backend=args.sandbox_backend,
+        eval_workers=args.eval_workers,
+        eval_cache_path=args.eval_cache,
+        llm_cache_size=args.llm_cache_size,
+        llm_cache_path=args.llm_cache,
+        llm_cache_ttl=args.llm_cache_ttl,
+        cassette_path=args.replay_cassette or args.record_cassette,
+        cassette_mode="replay" if args.replay_cassette else "record",
+        generation_mode=args.generation_mode,
+        candidates_per_call=args.candidates_per_call,
+        llm_backend=args.llm_backend,
+        requests_per_minute=args.requests_per_minute,
+        tokens_per_minute=args.tokens_per_minute,
+        max_retries=args.max_retries,
+        program_store_path=args.program_store,
+        checkpoint_path=args.checkpoint or args.resume,
+        checkpoint_interval=args.checkpoint_interval,
+        performance_weight=args.performance_weight,
+        benchmark_repeats=args.benchmark_repeats,
+        archive=args.archive,
+        archive_descriptors=args.archive_descriptors,
+        archive_bins=args.archive_bins,
+        cvt_cells=args.cvt_cells,
+        pareto_objectives=args.pareto_objectives,
+        selection=args.selection,
+        prefilter=not args.no_prefilter,
+        allowed_imports=args.allowed_imports,
+        suite_sample_size=args.suite_sample_size,
+        racing=args.racing,
+        racing_confidence=args.racing_confidence,
+        racing_initial_cases=args.racing_initial_cases,
+        prompt_token_budget=args.prompt_token_budget,
+        telemetry_path=args.telemetry,
+        metrics_port=args.metrics_port,
+        metrics_host=args.metrics_host,
+        profile_dir=args.profile_dir,
+        quiet=args.quiet,
+        strong_model=args.strong_model,
+        strong_cost=args.strong_cost,
+        routing_patience=args.routing_patience,
+        correction_policy=args.correction_policy,
+        min_correction_gain=args.min_correction_gain,
+        max_correction_attempts=args.max_correction_attempts,
+        token_budget=args.token_budget,
+        time_budget=args.time_budget,
+        seed=args.seed
     )
 
-    evolver.initialize_population()
-    evolver.evolve()
+    if args.islands > 1:
+        island_model = IslandModel(
+            project_def=project_definition,
+            num_islands=args.islands,
+            evolver_options=evolver_options,
+            migration_interval=args.migration_interval,
+            migration_size=args.migration_size,
+            topology=args.topology,
+            hub_address=args.migration_hub,
+            serve_hub=args.serve_hub,
+            authkey=hub_key,
+            island_offset=args.island_offset,
+            total_islands=args.total_islands,
+            seed=args.seed,
+            resume=bool(args.resume)
+        )
+        merged = island_model.run()
+        fittest = merged.get_fittest()
+        if fittest:
+            print("Fittest individual across islands:")
+            print(fittest.code)
+            print(f"Fitness: {fittest.fitness}")
+        return
+
+    from alphaevolve_core.src.core.evolver import Evolver
+    evolver = Evolver(project_def=project_definition, **evolver_options)
+
+    try:
+        if args.resume:
+            evolver.resume(args.resume)
+        else:
+            evolver.initialize_population()
+        if args.concurrency > 1:
+            evolver.evolve_async(concurrency=args.concurrency, max_llm_requests=args.max_llm_requests)
+        else:
+            evolver.evolve()
+    finally:
+        evolver.close()
 
 if __name__ == "__main__":
     main()
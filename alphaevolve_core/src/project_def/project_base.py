@@ -1,6 +1,20 @@
+import json
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any
 
+
+def load_test_cases(path: str) -> List[Dict[str, Any]]:
+    """
+    Reads test cases from a JSON file holding a list of `{"input", "output"}` objects.
+
+    Projects with large test data can return this from a `functools.cached_property`
+    named `test_cases`, so the file is read on first use rather than when the project
+    is loaded.
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
 class ProjectBase(ABC):
     @property
     @abstractmethod
@@ -21,3 +35,19 @@ class ProjectBase(ABC):
     @abstractmethod
     def test_cases(self) -> List[Dict[str, Any]]:
         pass
+
+    # Optional: projects that can generate inputs of a given size enable performance benchmarking
+    def generate_input(self, size: int) -> Any:
+        """Returns a test input of roughly `size` elements, or None if the project has no generator."""
+        return None
+
+    @property
+    def benchmark_sizes(self) -> List[int]:
+        """Input sizes used to measure runtime, memory and scaling."""
+        return [100, 1000, 10000]
+
+    # Optional: large numeric suites are better stored as a columnar `TestSuite`
+    @property
+    def test_suite(self) -> Any:
+        """A `TestSuite` evaluated instead of `test_cases` when a sandbox is available, or None."""
+        return None
@@ -0,0 +1,15 @@
+from alphaevolve_core.src.project_def.project_base import ProjectBase
+
+# Placeholder for a specific project definition (e.g., a sorting project)
+class DummyProject(ProjectBase):
+    description = "Write a Python function that takes a list and returns it."
+    function_name = "identity_list"
+    signature = "def identity_list(arr: list) -> list:"
+    test_cases = [
+        {"input": ([1, 2, 3]), "output": [1, 2, 3]},
+        {"input": ([]), "output": []},
+        {"input": (['a', 'b']), "output": ['a', 'b']},
+    ]
+
+    def generate_input(self, size: int) -> list:
+        return list(range(size))
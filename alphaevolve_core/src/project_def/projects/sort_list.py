@@ -0,0 +1,22 @@
+import os
+import random
+from functools import cached_property
+from typing import List, Dict, Any
+
+from alphaevolve_core.src.project_def.project_base import ProjectBase, load_test_cases
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "data", "sort_list.json")
+
+
+class SortListProject(ProjectBase):
+    description = "Write a Python function that sorts a list of integers in ascending order without using sorted() or list.sort()."
+    function_name = "sort_list"
+    signature = "def sort_list(arr: list) -> list:"
+
+    @cached_property
+    def test_cases(self) -> List[Dict[str, Any]]:
+        # Read on first use, not when the project is loaded
+        return load_test_cases(DATA_PATH)
+
+    def generate_input(self, size: int) -> list:
+        return random.Random(size).sample(range(size * 10), size)
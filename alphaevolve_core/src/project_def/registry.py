@@ -0,0 +1,116 @@
+import importlib
+import inspect
+import os
+import sys
+from typing import List, Dict, Any
+
+from alphaevolve_core.src.project_def.project_base import ProjectBase
+
+PROJECTS_DIR = os.path.join(os.path.dirname(__file__), "projects")
+PROJECTS_PACKAGE = "alphaevolve_core.src.project_def.projects"
+# Installed packages register projects as `name = "package.module:ProjectClass"` in this group
+ENTRY_POINT_GROUP = "alphaevolve.projects"
+
+
+def _project_class(module: Any) -> type:
+    """Returns the project a module defines: its `PROJECT` attribute, or its only concrete ProjectBase subclass."""
+    project = getattr(module, "PROJECT", None)
+    if project is not None:
+        return project
+    classes = [obj for obj in vars(module).values()
+               if inspect.isclass(obj) and issubclass(obj, ProjectBase) and not inspect.isabstract(obj)
+               and obj.__module__ == module.__name__]
+    if len(classes) != 1:
+        raise ValueError(f"Module {module.__name__} must define exactly one ProjectBase subclass or set PROJECT, "
+                         f"found {[cls.__name__ for cls in classes]}.")
+    return classes[0]
+
+
+class ProjectRegistry:
+    def __init__(self, directories: List[str] | None = None, entry_point_group: str | None = ENTRY_POINT_GROUP):
+        """
+        Finds project definitions by name without importing them.
+
+        Every `*.py` module in the built-in `projects/` directory and in `directories` is
+        one project, named after the module; installed packages can add projects through
+        the `entry_point_group` entry points. A project module is imported only when it
+        is loaded, so listing projects or starting a run stays cheap however many
+        projects (and however much test data) there are.
+
+        Modules in extra directories are imported by their plain module name with the
+        directory on `sys.path`, so that island processes can import them too; they must
+        not shadow other modules.
+
+        Args:
+            directories: Extra directories of project modules; they override built-in
+                projects of the same name.
+            entry_point_group: Entry point group to scan, or None to skip entry points.
+        """
+        self.directories = [PROJECTS_DIR] + [os.path.abspath(d) for d in directories or []]
+        self.entry_point_group = entry_point_group
+        self._modules: Dict[str, str] | None = None  # name -> module file
+        self._entry_points: Dict[str, Any] | None = None  # name -> EntryPoint
+        self._classes: Dict[str, type] = {}
+
+    def _module_files(self) -> Dict[str, str]:
+        if self._modules is None:
+            self._modules = {}
+            for directory in self.directories:
+                if not os.path.isdir(directory):
+                    continue
+                for filename in sorted(os.listdir(directory)):
+                    if filename.endswith(".py") and not filename.startswith("_"):
+                        self._modules[filename[:-3]] = os.path.join(directory, filename)
+        return self._modules
+
+    def _entry_point_map(self) -> Dict[str, Any]:
+        # importlib.metadata scans every installed distribution, so this runs only when needed
+        if self._entry_points is None:
+            self._entry_points = {}
+            if self.entry_point_group:
+                from importlib.metadata import entry_points
+                self._entry_points = {ep.name: ep for ep in entry_points(group=self.entry_point_group)}
+        return self._entry_points
+
+    def names(self) -> List[str]:
+        """Names of every discoverable project."""
+        return sorted(set(self._module_files()) | set(self._entry_point_map()))
+
+    def load(self, name: str) -> type:
+        """
+        Imports a project and returns its class.
+
+        Args:
+            name: A registered project name, or a `package.module:ProjectClass` reference.
+
+        Raises:
+            KeyError: If no project has that name.
+        """
+        project = self._classes.get(name)
+        if project is not None:
+            return project
+        path = self._module_files().get(name)
+        if path is not None:
+            project = _project_class(self._import(path))
+        elif name in self._entry_point_map():
+            loaded = self._entry_point_map()[name].load()
+            project = loaded if inspect.isclass(loaded) else _project_class(loaded)
+        elif ":" in name:
+            module_name, _, class_name = name.partition(":")
+            project = getattr(importlib.import_module(module_name), class_name)
+        else:
+            raise KeyError(name)
+        self._classes[name] = project
+        return project
+
+    def _import(self, path: str) -> Any:
+        directory, filename = os.path.split(path)
+        if directory == PROJECTS_DIR:
+            return importlib.import_module(f"{PROJECTS_PACKAGE}.{filename[:-3]}")
+        if directory not in sys.path:
+            sys.path.append(directory)
+        return importlib.import_module(filename[:-3])
+
+    def create(self, name: str, **kwargs) -> ProjectBase:
+        """Loads a project and instantiates it."""
+        return self.load(name)(**kwargs)
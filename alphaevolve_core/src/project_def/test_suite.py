@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import random
+from typing import List, Dict, Any, Iterator
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for projects with columnar test suites
+    np = None
+
+MANIFEST = "manifest.json"
+
+# Content hashes of suite files, keyed by path and reused while the size and mtime are unchanged
+_FILE_DIGESTS: Dict[str, tuple] = {}
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Columnar test suites need NumPy: pip install numpy")
+
+
+def _file_digest(path: str) -> str:
+    """Returns the SHA-256 of a file's contents, rehashing only when its size or mtime changes."""
+    stat = os.stat(path)
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    cached = _FILE_DIGESTS.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    _FILE_DIGESTS[path] = (stamp, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def _save_column(directory: str, name: str, rows: List[Any]) -> str:
+    """Writes a column as one dense `.npy` array, or as flat values plus row offsets when rows are ragged."""
+    try:
+        dense = np.asarray(rows)
+    except ValueError:
+        dense = None
+    if dense is not None and dense.dtype != object:
+        np.save(os.path.join(directory, f"{name}.npy"), dense)
+        return "dense"
+    flat = [np.asarray(row).ravel() for row in rows]
+    offsets = np.zeros(len(flat) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(row) for row in flat])
+    # Empty rows are float arrays; leaving them out keeps integer columns integral
+    non_empty = [row for row in flat if len(row)]
+    values = np.concatenate(non_empty) if non_empty else np.zeros(0)
+    if values.dtype == object:
+        raise ValueError(f"Column '{name}' must hold numbers or numeric arrays.")
+    np.save(os.path.join(directory, f"{name}.values.npy"), values)
+    np.save(os.path.join(directory, f"{name}.offsets.npy"), offsets)
+    return "ragged"
+
+
+class TestSuite:
+    def __init__(self, directory: str, indices: List[int] | None = None):
+        """
+        A columnar test suite stored as memory-mapped NumPy files.
+
+        Inputs and expected outputs are each one column: a dense `.npy` array with one
+        row per case, or flat values plus row offsets for ragged rows. Sandbox workers
+        map the same files read-only, so a large suite is shared through the page cache
+        instead of being serialized into every batch, and outputs are compared in bulk
+        with a float tolerance.
+
+        Args:
+            directory: A directory written by `TestSuite.save`.
+            indices: Optional subset of case indices (see `sample`).
+        """
+        self.directory = os.path.abspath(directory)
+        with open(os.path.join(self.directory, MANIFEST), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.indices = indices
+
+    @staticmethod
+    def save(directory: str, inputs: List[Any], outputs: List[Any], input_format: str = "list",
+             rtol: float = 1e-6, atol: float = 1e-9) -> "TestSuite":
+        """
+        Writes a suite from parallel lists of inputs and expected outputs.
+
+        Args:
+            directory: Target directory, created if needed.
+            inputs: One numeric (array-like) input per case.
+            outputs: The expected output of each case.
+            input_format: "list" passes each input row to the function as a Python list,
+                "array" as a read-only NumPy view.
+            rtol: Relative tolerance for comparing outputs.
+            atol: Absolute tolerance for comparing outputs.
+        """
+        _require_numpy()
+        if len(inputs) != len(outputs):
+            raise ValueError("inputs and outputs must have the same length.")
+        os.makedirs(directory, exist_ok=True)
+        manifest = {
+            "size": len(inputs),
+            "inputs": _save_column(directory, "inputs", inputs),
+            "outputs": _save_column(directory, "outputs", outputs),
+            "input_format": input_format,
+            "rtol": rtol,
+            "atol": atol,
+        }
+        with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        return TestSuite(directory)
+
+    def __len__(self) -> int:
+        return self.manifest["size"] if self.indices is None else len(self.indices)
+
+    def sample(self, size: int, seed: int = 0) -> "TestSuite":
+        """Returns a view on `size` cases drawn without replacement; the same seed gives the same subset."""
+        population = range(self.manifest["size"]) if self.indices is None else self.indices
+        if size >= len(population):
+            return self
+        return TestSuite(self.directory, indices=sorted(random.Random(seed).sample(population, size)))
+
+    def select(self, positions: List[int]) -> "TestSuite":
+        """Returns a view on the cases at the given positions of this suite."""
+        base = range(self.manifest["size"]) if self.indices is None else self.indices
+        return TestSuite(self.directory, indices=[base[position] for position in positions])
+
+    def fingerprint(self) -> str:
+        """Identifies the suite contents (manifest and column file contents) and the selected subset."""
+        digest = hashlib.sha256(json.dumps(self.manifest, sort_keys=True).encode("utf-8"))
+        for name in sorted(os.listdir(self.directory)):
+            digest.update(f"{name}:{_file_digest(os.path.join(self.directory, name))}".encode("utf-8"))
+        digest.update(json.dumps(self.indices).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _column(self, name: str):
+        if self.manifest[name] == "dense":
+            data = np.load(os.path.join(self.directory, f"{name}.npy"), mmap_mode="r")
+            return lambda i: data[i]
+        values = np.load(os.path.join(self.directory, f"{name}.values.npy"), mmap_mode="r")
+        offsets = np.load(os.path.join(self.directory, f"{name}.offsets.npy"), mmap_mode="r")
+        return lambda i: values[offsets[i]:offsets[i + 1]]
+
+    def cases(self) -> Iterator[Dict[str, Any]]:
+        """Yields the selected cases as `{"input", "output"}` dicts, like `ProjectBase.test_cases`."""
+        _require_numpy()
+        inputs, outputs = self._column("inputs"), self._column("outputs")
+        for i in (range(self.manifest["size"]) if self.indices is None else self.indices):
+            yield {"input": inputs(i).tolist(), "output": outputs(i).tolist()}
@@ -0,0 +1,231 @@
+import bisect
+import cProfile
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import List, Dict, Any, Tuple
+
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (16, 64, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+DEFAULT_BUCKETS = (0.1, 1.0, 10.0, 100.0, 1000.0, 10000.0)
+
+METRIC_PREFIX = "alphaevolve_"
+
+
+def _buckets_for(name: str) -> Tuple[float, ...]:
+    if name.endswith("_seconds"):
+        return SECONDS_BUCKETS
+    if name.endswith("_tokens"):
+        return TOKEN_BUCKETS
+    return DEFAULT_BUCKETS
+
+
+def _label_text(labels: Tuple[Tuple[str, Any], ...], extra: str = "") -> str:
+    parts = [f'{key}="{value}"' for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...], window: int = 1000):
+        """Cumulative bucket counts for Prometheus, plus a window of recent values for percentiles."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._recent: deque = deque(maxlen=window)
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self._recent.append(value)
+
+    def summary(self) -> Dict[str, float]:
+        recent = sorted(self._recent)
+        summary = {"count": self.count, "sum": self.sum, "mean": self.sum / self.count if self.count else 0.0}
+        if recent:
+            summary["p50"] = recent[len(recent) // 2]
+            summary["p95"] = recent[min(len(recent) - 1, int(len(recent) * 0.95))]
+        return summary
+
+
+class Telemetry:
+    def __init__(self, path: str | None = None, prometheus_port: int | None = None,
+                 profile_dir: str | None = None, prometheus_host: str = "127.0.0.1"):
+        """
+        Structured metrics and traces for the evolution loop.
+
+        Spans time the phases of each generation (select, prompt, generate, evaluate,
+        correct); histograms, gauges and counters hold LLM latency and tokens, sandbox
+        queue depth and cache hit rates. Every span and event is written as one JSON
+        line, and the aggregates can be scraped in the Prometheus text format.
+
+        Args:
+            path: Optional JSONL file events are appended to.
+            prometheus_port: Optional port serving `/metrics` in the Prometheus format.
+            profile_dir: Optional directory receiving one cProfile `.prof` file per
+                profiled generation (readable with `pstats` or snakeviz). Span events carry
+                the process id and thread name, so a `py-spy record --pid` capture can be
+                lined up with them.
+            prometheus_host: Interface the metrics endpoint binds to; loopback by default,
+                "0.0.0.0" exposes it to other machines.
+        """
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, Tuple], Histogram] = {}
+        self._gauges: Dict[Tuple[str, Tuple], float] = {}
+        self._counters: Dict[Tuple[str, Tuple], float] = {}
+        self._file = None
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            # Line buffered, so events survive a crash and can be tailed while the run goes on
+            self._file = open(path, "a", encoding="utf-8", buffering=1)
+        self.profile_dir = profile_dir
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+        self._server = None
+        if prometheus_port is not None:
+            self._server = self._serve(prometheus_host, prometheus_port)
+        self.emit("start", pid=os.getpid())
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> Tuple[str, Tuple]:
+        return name, tuple(sorted(labels.items()))
+
+    def observe(self, name: str, value: float, **labels):
+        """Records a value in the histogram `name`."""
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(_buckets_for(name))
+            histogram.observe(value)
+
+    def set_gauge(self, name: str, value: float, **labels):
+        with self._lock:
+            self._gauges[self._key(name, labels)] = value
+
+    def increment(self, name: str, amount: float = 1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def emit(self, event: str, **fields):
+        """Writes one event as a JSON line; a no-op without a JSONL path."""
+        if self._file is None:
+            return
+        line = json.dumps({"event": event, "time": time.time(), **fields}, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Times a block into the `span_seconds` histogram and writes it as a `span` event."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.observe("span_seconds", seconds, span=name)
+            self.emit("span", name=name, seconds=seconds, pid=os.getpid(),
+                      thread=threading.current_thread().name, **attributes)
+
+    @contextmanager
+    def profile(self, label: str):
+        """Runs a block under cProfile when a profile directory is set; otherwise does nothing."""
+        if not self.profile_dir:
+            yield
+            return
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            path = os.path.join(self.profile_dir, f"{label}.prof")
+            profiler.dump_stats(path)
+            self.emit("profile", label=label, path=path)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns every metric keyed by name and labels, histograms as count/sum/mean/p50/p95."""
+        with self._lock:
+            return {
+                "histograms": {name + _label_text(labels): histogram.summary()
+                               for (name, labels), histogram in self._histograms.items()},
+                "gauges": {name + _label_text(labels): value for (name, labels), value in self._gauges.items()},
+                "counters": {name + _label_text(labels): value for (name, labels), value in self._counters.items()},
+            }
+
+    def span_summary(self) -> Dict[str, Dict[str, float]]:
+        """Returns the timing summary of each span name."""
+        with self._lock:
+            return {dict(labels)["span"]: histogram.summary()
+                    for (name, labels), histogram in self._histograms.items() if name == "span_seconds"}
+
+    def prometheus(self) -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        typed = set()
+
+        def declare(name: str, kind: str):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                declare(METRIC_PREFIX + name, "counter")
+                lines.append(f"{METRIC_PREFIX}{name}{_label_text(labels)} {value}")
+            for (name, labels), value in sorted(self._gauges.items()):
+                declare(METRIC_PREFIX + name, "gauge")
+                lines.append(f"{METRIC_PREFIX}{name}{_label_text(labels)} {value}")
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                metric = METRIC_PREFIX + name
+                declare(metric, "histogram")
+                cumulative = 0
+                for bound, count in zip(list(histogram.buckets) + ["+Inf"], histogram.counts):
+                    cumulative += count
+                    le = f'le="{bound}"'
+                    lines.append(f"{metric}_bucket{_label_text(labels, le)} {cumulative}")
+                lines.append(f"{metric}_sum{_label_text(labels)} {histogram.sum}")
+                lines.append(f"{metric}_count{_label_text(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def _serve(self, host: str, port: int):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        telemetry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = telemetry.prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes are not worth a line on stderr each
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"Serving Prometheus metrics on http://{host}:{server.server_address[1]}/metrics")
+        return server
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+# Modules are imported as `alphaevolve_core.src...`, so the tests need the repository root on the path
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from alphaevolve_core.src.project_def.project_base import ProjectBase
+
+
+class IncrementProject(ProjectBase):
+    description = "Return the input integer plus one."
+    function_name = "f"
+    signature = "def f(x: int) -> int:"
+    test_cases = None
+
+    def __init__(self, num_cases: int = 10):
+        self.test_cases = [{"input": i, "output": i + 1} for i in range(num_cases)]
+
+
+@pytest.fixture
+def project():
+    return IncrementProject()
+
+
+@pytest.fixture
+def sandbox():
+    """Runs batches through the sandbox runner's own code in this process."""
+    from alphaevolve_core.benchmarks.evolver_bench import InProcessSandbox
+    return InProcessSandbox()
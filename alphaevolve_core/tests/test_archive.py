@@ -0,0 +1,66 @@
+from alphaevolve_core.src.core.archive import MapElitesArchive, ParetoArchive, dominates
+
+
+def failing(passed, run=4):
+    return {"tests_run": run, "tests_passed": passed, "errors": "" if passed == run else "Test 1 failed"}
+
+
+def benchmarked(wall_seconds):
+    return {"tests_run": 4, "tests_passed": 4, "errors": "", "performance": {"wall_seconds": wall_seconds}}
+
+
+def test_dominates():
+    assert dominates((1.0, 0.5), (1.0, 0.4))
+    assert not dominates((1.0, 0.5), (1.0, 0.5))
+    assert not dominates((1.0, 0.3), (0.9, 0.4))
+
+
+def test_pareto_keeps_front():
+    archive = ParetoArchive(max_size=10)
+    assert archive.add_individual("slow", 1.0, benchmarked(1e-2))
+    assert archive.add_individual("fast", 0.9, benchmarked(1e-4))
+    assert archive.add_individual("dominated", 0.8, benchmarked(1e-2)) is None
+    # Faster and as fit as "slow": replaces it
+    assert archive.add_individual("better", 1.0, benchmarked(1e-3))
+    assert [ind.code for ind in archive.individuals] == ["better", "fast"]
+
+
+def test_short_failing_programs_do_not_flood_front():
+    archive = ParetoArchive(max_size=10, objectives=("fitness", "brevity"))
+    archive.add_individual("def f(x):\n    return x + 1  # a correct, longer program", 1.0, failing(4))
+    for length in range(1, 6):
+        archive.add_individual("x" * length, 0.25, failing(1))
+    # Failing programs only compete on fitness, so the correct program dominates them all
+    assert [ind.fitness for ind in archive.individuals] == [1.0]
+
+    archive = ParetoArchive(max_size=10, objectives=("fitness", "brevity"))
+    for length in range(1, 6):
+        archive.add_individual("x" * length, 0.25, failing(1))
+    assert len(archive.individuals) == 1
+
+
+def test_pareto_evicts_most_crowded():
+    archive = ParetoArchive(max_size=3)
+    for i, seconds in enumerate((1e-1, 1e-2, 1.1e-2, 1e-3)):
+        archive.add_individual(f"p{i}", 1.0 - i / 10, benchmarked(seconds))
+    assert len(archive.individuals) == 3
+    # The extremes of the front are never the most crowded members
+    assert {"p0", "p3"} <= {ind.code for ind in archive.individuals}
+
+
+def test_map_elites_replaces_cell_incumbent():
+    archive = MapElitesArchive(max_size=10, descriptors=["code_length"], bins=4)
+    assert archive.add_individual("a = 1", 0.5, {})
+    assert archive.add_individual("b = 2", 0.4, {}) is None
+    assert archive.add_individual("c = 3", 0.7, {})
+    assert [ind.code for ind in archive.individuals] == ["c = 3"]
+    long_code = "\n".join(f"v{i} = {i}" for i in range(40))
+    assert archive.add_individual(long_code, 0.1, {})
+    assert archive.stats()["occupied_cells"] == 2
+
+
+def test_map_elites_cvt_cells_are_seeded():
+    first = MapElitesArchive(max_size=10, cvt_cells=6, seed=3)
+    second = MapElitesArchive(max_size=10, cvt_cells=6, seed=3)
+    metadata = {"performance": {"wall_seconds": 1e-3}}
+    assert first.cell("a = 1", metadata) == second.cell("a = 1", metadata)
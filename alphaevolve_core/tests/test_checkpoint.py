@@ -0,0 +1,94 @@
+import pickle
+import random
+import sqlite3
+
+import pytest
+
+from alphaevolve_core.src.core.checkpoint import CheckpointWriter, load_checkpoint
+from alphaevolve_core.src.core.evolver import Evolver
+
+UNPICKLED = []
+
+
+def _record_unpickle():
+    UNPICKLED.append(True)
+
+
+class Payload:
+    def __reduce__(self):
+        return _record_unpickle, ()
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    writer = CheckpointWriter(path)
+    writer.submit([("a", 0.5, {"errors": []}), ("b", 0.25, {})], {"generation": 1, "rng_state": random.getstate()})
+    writer.submit([("c", 0.75, {})], {"generation": 2, "rng_state": random.getstate()})
+    writer.close()
+
+    individuals, state = load_checkpoint(path)
+    assert list(individuals) == [("a", 0.5, {"errors": []}), ("b", 0.25, {}), ("c", 0.75, {})]
+    assert state["generation"] == 2
+
+
+def test_snapshot_replaces_log(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    writer = CheckpointWriter(path)
+    writer.submit([(str(i), i / 10, {}) for i in range(5)], {"generation": 1})
+    writer.submit([("5", 0.9, {})], {"generation": 2}, survivors=[("5", 0.9, {}), ("4", 0.4, {})])
+    writer.submit([("6", 0.1, {})], {"generation": 3})
+    writer.close()
+
+    individuals, state = load_checkpoint(path)
+    assert [code for code, _, _ in individuals] == ["5", "4", "6"]
+    assert state["generation"] == 3
+
+
+def test_pickled_state_is_not_loaded(tmp_path):
+    path = str(tmp_path / "old.ckpt")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE individuals (seq INTEGER PRIMARY KEY, generation INTEGER, code TEXT, fitness REAL, details TEXT)")
+    db.execute("CREATE TABLE state (key TEXT PRIMARY KEY, value BLOB)")
+    db.execute("INSERT INTO state VALUES (?, ?)", ("generation", pickle.dumps(Payload())))
+    db.commit()
+    db.close()
+
+    with pytest.raises(ValueError):
+        load_checkpoint(path)
+    assert not UNPICKLED
+
+
+def test_evolver_resume(tmp_path, project):
+    path = str(tmp_path / "run.ckpt")
+    evolver = Evolver(project, population_size=3, llm_backend="stub", checkpoint_path=path, quiet=True)
+    evolver.checkpoint_writer.snapshot_interval = 2
+    for generation in range(4):
+        evolver.population.add_individual(f"def f(x):\n    return x + {generation}", generation / 4, {})
+        evolver.checkpoint(generation + 1)
+    expected = [(ind.code, ind.fitness) for ind in evolver.population.individuals]
+    rng_state = random.getstate()
+    evolver.close()
+
+    random.seed(1)
+    resumed = Evolver(project, population_size=3, llm_backend="stub", quiet=True)
+    resumed.resume(path)
+    assert [(ind.code, ind.fitness) for ind in resumed.population.individuals] == expected
+    assert resumed.start_generation == 4
+    assert random.getstate() == rng_state
+    resumed.close()
+
+
+def test_stopped_run_records_its_last_completed_generation(tmp_path, project, sandbox):
+    path = str(tmp_path / "run.ckpt")
+    evolver = Evolver(project, population_size=3, generations=10, llm_backend="stub", generation_mode="direct",
+                      checkpoint_path=path, quiet=True)
+    evolver.fitness_evaluator.sandbox = sandbox
+    evolver.initialize_population(["def f(x):\n    return 0\n", "def f(x):\n    return 1\n"])
+    checks = iter([None, None, "Budget spent."])
+    # The budget runs out before the third generation starts
+    evolver.run_budget.exhausted = lambda: next(checks)
+    evolver.evolve()
+    evolver.close()
+
+    _, state = load_checkpoint(path)
+    assert state["generation"] == 2
@@ -0,0 +1,58 @@
+from alphaevolve_core.src.evaluation.eval_cache import EvaluationCache, normalize_program
+from alphaevolve_core.src.evaluation.fitness import FitnessEvaluator
+
+ADD_ONE = "def f(x):\n    return x + 1\n"
+
+
+def test_normalization_ignores_comments_docstrings_and_whitespace():
+    variant = 'def f(x):\n    """Adds one."""\n    # comment\n    return  x+1\n'
+    assert normalize_program(variant) == normalize_program(ADD_ONE)
+    assert normalize_program("def f(x):\n    return x + 2\n") != normalize_program(ADD_ONE)
+
+
+def test_results_persist_across_instances(tmp_path, project):
+    path = str(tmp_path / "eval.sqlite")
+    cache = EvaluationCache(path=path)
+    key = cache.key(ADD_ONE, project)
+    cache.put(key, 1.0, {"tests_passed": 10}, elapsed=0.5)
+    cache.close()
+
+    cache = EvaluationCache(path=path)
+    assert cache.get(key) == (1.0, {"tests_passed": 10})
+    assert cache.stats()["seconds_saved"] == 0.5
+    cache.close()
+
+
+def test_placeholder_scores_are_not_served_to_sandboxed_runs(tmp_path, project, sandbox):
+    # Regression: a run without a sandbox cached its placeholder 0.5 for later sandboxed runs
+    path = str(tmp_path / "eval.sqlite")
+    cache = EvaluationCache(path=path)
+    assert FitnessEvaluator(cache=cache, verbose=False).evaluate(ADD_ONE, project)[0] == 0.5
+    assert cache.stats()["entries"] == 0
+    cache.close()
+
+    cache = EvaluationCache(path=path)
+    assert FitnessEvaluator(sandbox=sandbox, cache=cache).evaluate(ADD_ONE, project)[0] == 1.0
+    cache.close()
+
+
+def test_sandboxed_results_are_cached(project, sandbox):
+    cache = EvaluationCache()
+    evaluator = FitnessEvaluator(sandbox=sandbox, cache=cache)
+    evaluator.evaluate(ADD_ONE, project)
+    evaluator.evaluate("def f(x):\n    # same program\n    return x + 1\n", project)
+    assert sandbox.batches_run == 1 and cache.stats()["hits"] == 1
+
+
+def test_timeouts_are_part_of_the_key(project, sandbox):
+    cache = EvaluationCache()
+    FitnessEvaluator(sandbox=sandbox, cache=cache, timeout=10).evaluate(ADD_ONE, project)
+    FitnessEvaluator(sandbox=sandbox, cache=cache, timeout=1).evaluate(ADD_ONE, project)
+    assert sandbox.batches_run == 2
+
+
+def test_partial_runs_are_not_cached(project, sandbox):
+    cache = EvaluationCache()
+    evaluator = FitnessEvaluator(sandbox=sandbox, cache=cache)
+    evaluator.evaluate("def f(x):\n    return 1\n", project, stop_on_first_failure=True)
+    assert cache.stats()["entries"] == 0
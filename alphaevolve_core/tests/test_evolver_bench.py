@@ -0,0 +1,29 @@
+from alphaevolve_core.benchmarks.evolver_bench import bench, build_projects
+
+RUN_FIELDS = ("generations", "llm_calls", "test_cases", "solve_rate")
+
+
+def run(seed, concurrency=1):
+    project = build_projects(seed)["sort"]
+    return bench(project, population_size=8, tournament_size=3, concurrency=concurrency, generations=10,
+                 generation_mode="direct", seed=seed)
+
+
+def test_projects_are_seeded():
+    first, second = build_projects(1)["sum"], build_projects(1)["sum"]
+    assert first.test_cases == second.test_cases
+    assert first.test_cases != build_projects(2)["sum"].test_cases
+    assert 0 < first.solve_rate < 1
+
+
+def test_runs_repeat_with_the_same_seed():
+    first, second = run(0), run(0)
+    assert {field: first[field] for field in RUN_FIELDS} == {field: second[field] for field in RUN_FIELDS}
+    assert (first["time_to_solution"] is None) == (second["time_to_solution"] is None)
+    assert first["generations"] == 10
+
+
+def test_steady_state_runs_the_same_budget():
+    result = run(0, concurrency=4)
+    assert result["generations"] == 10
+    assert result["evaluations_per_second"] > 0
@@ -0,0 +1,27 @@
+import threading
+
+from alphaevolve_core.src.evaluation.fitness import FitnessEvaluator
+
+ADD_ONE = "def f(x):\n    return x + 1\n"
+ADD_TWO = "def f(x):\n    return x + 2\n"
+
+
+def test_evaluate_scores_the_pass_rate(project, sandbox):
+    evaluator = FitnessEvaluator(sandbox=sandbox)
+    assert evaluator.evaluate(ADD_ONE, project)[0] == 1.0
+    fitness, details = evaluator.evaluate("def f(x):\n    return 1\n", project)
+    assert fitness == 0.1 and details["tests_passed"] == 1
+
+
+def test_evaluate_many_yields_every_program(project, sandbox):
+    evaluator = FitnessEvaluator(sandbox=sandbox)
+    results = {i: fitness for i, fitness, _ in evaluator.evaluate_many([ADD_ONE, ADD_TWO, ADD_ONE], project,
+                                                                       max_workers=2)}
+    assert results == {0: 1.0, 1: 0.0, 2: 1.0}
+
+
+def test_evaluate_many_without_sandbox_accepts_unpicklable_projects(project):
+    project.lock = threading.Lock()  # Not picklable
+    evaluator = FitnessEvaluator(verbose=False)
+    results = sorted(evaluator.evaluate_many([ADD_ONE, ADD_TWO], project))
+    assert [i for i, _, _ in results] == [0, 1]
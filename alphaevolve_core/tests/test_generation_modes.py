@@ -0,0 +1,45 @@
+import pytest
+
+from alphaevolve_core.src.core.evolver import Evolver
+from alphaevolve_core.src.llm_services.code_extraction import extract_code, extract_code_blocks
+from alphaevolve_core.src.llm_services.prompt_generation import EvolvePromptGenerator
+from alphaevolve_core.src.llm_services.stub_client import StubLLMClient
+
+PARENTS = [{"code": "def f(x):\n    return x\n", "fitness": 0.0}]
+THREE_PROGRAMS = "\n".join(f"Candidate {i}:\n```python\ndef f(x):\n    return x + {i}\n```" for i in (1, 2, 3))
+
+
+def test_extract_code_blocks():
+    assert extract_code_blocks(THREE_PROGRAMS) == [f"def f(x):\n    return x + {i}" for i in (1, 2, 3)]
+    assert extract_code_blocks("```py\nx = 1\n```") == ["x = 1"]
+    assert extract_code_blocks("def f(x):\n    return x\n") == ["def f(x):\n    return x"]
+    # An unterminated fence is not a program
+    assert extract_code_blocks("```python\ndef f(x):") == []
+    assert extract_code("") == ""
+
+
+def test_direct_prompt_has_a_static_prefix(project):
+    generator = EvolvePromptGenerator(StubLLMClient(), verbose=False)
+    first = generator.generate_direct_prompt(project, PARENTS)
+    second = generator.generate_direct_prompt(project, [{"code": "def f(x):\n    return 2\n", "fitness": 0.1}])
+    assert project.signature in first and "return x" in first
+    prefix = first[:first.index("Here are some existing attempts")]
+    assert second.startswith(prefix)
+    assert "Write 3 substantially different candidate programs" in \
+        generator.generate_direct_prompt(project, PARENTS, num_candidates=3)
+
+
+@pytest.mark.parametrize("mode, requests, programs", [("meta", 2, 1), ("direct", 1, 1), ("batched", 1, 3)])
+def test_llm_calls_per_offspring(project, mode, requests, programs):
+    evolver = Evolver(project, population_size=4, llm_backend="stub", generation_mode=mode, candidates_per_call=3,
+                      quiet=True)
+    evolver.gemini_client.responses = [THREE_PROGRAMS]
+    offspring = evolver._generate_offspring(PARENTS)
+    assert evolver.gemini_client.metrics.requests == requests
+    assert len(offspring) == programs
+    evolver.close()
+
+
+def test_unknown_mode_is_rejected(project):
+    with pytest.raises(ValueError):
+        Evolver(project, llm_backend="stub", generation_mode="twice")
@@ -0,0 +1,108 @@
+import multiprocessing as mp
+import pickle
+import random
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+
+import pytest
+
+from alphaevolve_core.src.core.islands import (
+    HUB_SECRET_ENV, MigrationHub, QueueTransport, SocketTransport, hub_authkey, join_islands, migration_targets,
+    parse_address,
+)
+
+UNPICKLED = []
+
+
+def _record_unpickle():
+    UNPICKLED.append(True)
+
+
+class Payload:
+    def __reduce__(self):
+        return _record_unpickle, ()
+
+
+def test_migration_targets():
+    rng = random.Random(0)
+    assert migration_targets(3, 4, "ring", rng) == [0]
+    assert migration_targets(1, 4, "full", rng) == [0, 2, 3]
+    assert migration_targets(0, 4, "random", rng)[0] in (1, 2, 3)
+    assert migration_targets(0, 1, "ring", rng) == []
+
+
+def test_parse_address():
+    assert parse_address("10.0.0.5:7000") == ("10.0.0.5", 7000)
+
+
+def test_authkey_required_off_loopback(monkeypatch):
+    monkeypatch.delenv(HUB_SECRET_ENV, raising=False)
+    assert hub_authkey("127.0.0.1:7000")
+    assert hub_authkey("localhost:7000")
+    with pytest.raises(ValueError):
+        hub_authkey("0.0.0.0:7000")
+    assert hub_authkey("0.0.0.0:7000", "s3cret") == b"s3cret"
+    monkeypatch.setenv(HUB_SECRET_ENV, "from-env")
+    assert hub_authkey("10.0.0.5:7000") == b"from-env"
+
+
+def _start_hub(authkey):
+    hub = MigrationHub("127.0.0.1:0", authkey)
+    hub.start()
+    host, port = hub.address
+    return f"{host}:{port}"
+
+
+def test_hub_relays_migrants():
+    address = _start_hub(b"key")
+    transport = SocketTransport(address, b"key")
+    transport.send(1, [{"code": "def f(x): return x", "fitness": 0.75, "island": 0}])
+    assert transport.receive(1) == [{"code": "def f(x): return x", "fitness": 0.75, "island": 0}]
+    assert transport.receive(1) == []
+
+
+def test_hub_does_not_unpickle():
+    address = _start_hub(b"key")
+    connection = Client(parse_address(address), authkey=b"key")
+    connection.send_bytes(pickle.dumps(("put", 0, [Payload()])))
+    with pytest.raises((EOFError, OSError)):
+        connection.recv_bytes()
+    assert not UNPICKLED
+
+
+def test_hub_rejects_wrong_key():
+    address = _start_hub(b"key")
+    with pytest.raises(AuthenticationError):
+        Client(parse_address(address), authkey=b"guess")
+    assert SocketTransport(address, b"key").receive(0) == []
+
+
+def _short_island(transport):
+    pass
+
+
+def _long_island(transport):
+    # Sends to island 0 well after it finished, more than a pipe buffer holds
+    time.sleep(0.5)
+    for _ in range(8):
+        transport.send(0, [{"code": "x" * 100_000, "fitness": 0.5, "island": 1}])
+
+
+def test_join_with_uneven_island_lifetimes():
+    context = mp.get_context("spawn")
+    transport = QueueTransport(2, context=context)
+    processes = {island: context.Process(target=target, args=(transport,))
+                 for island, target in enumerate((_short_island, _long_island))}
+    for process in processes.values():
+        process.start()
+
+    joiner = threading.Thread(target=join_islands, args=(processes, transport), daemon=True)
+    joiner.start()
+    joiner.join(timeout=60)
+    hung = joiner.is_alive()
+    for process in processes.values():
+        process.terminate()
+    assert not hung
+    assert all(process.exitcode == 0 for process in processes.values())
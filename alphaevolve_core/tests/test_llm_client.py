@@ -0,0 +1,89 @@
+import asyncio
+
+from alphaevolve_core.src.core.evolver import Evolver
+from alphaevolve_core.src.llm_services.rate_limit import RetryPolicy
+from alphaevolve_core.src.llm_services.response_cache import Cassette, ResponseCache
+from alphaevolve_core.src.llm_services.stub_client import StubLLMClient
+
+
+class ServiceUnavailable(Exception):
+    """Named like the google.api_core error, so it counts as transient."""
+
+
+def test_transient_errors_are_retried():
+    client = StubLLMClient(responses=["ok"], retry_policy=RetryPolicy(max_retries=2, base_delay=0, max_delay=0))
+    failures = [ServiceUnavailable("busy")]
+    request = client._request
+
+    def flaky(*args):
+        if failures:
+            raise failures.pop()
+        return request(*args)
+
+    client._request = flaky
+    assert client.generate_text("prompt") == "ok"
+    assert client.metrics.snapshot()["retries"] == 1
+
+
+def test_permanent_errors_return_an_empty_response():
+    client = StubLLMClient()
+
+    def broken(*args):
+        raise ValueError("bad request")
+
+    client._request = broken
+    assert client.generate_text("prompt") == ""
+    assert client.metrics.snapshot()["failures"] == 1
+
+
+def test_cached_responses_skip_the_backend():
+    client = StubLLMClient(responses=["ok"], cache=ResponseCache())
+    client.generate_text("prompt")
+    client.generate_text("prompt")
+    assert client.metrics.requests == 1
+
+
+def test_concurrent_identical_async_requests_are_coalesced():
+    client = StubLLMClient(responses=["ok"], latency=0.05)
+
+    async def run():
+        return await asyncio.gather(*(client.generate_text_async("prompt") for _ in range(5)))
+
+    assert asyncio.run(run()) == ["ok"] * 5
+    assert client.metrics.requests == 1
+
+
+def test_cached_and_coalesced_responses_are_recorded(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    cache = ResponseCache()
+    StubLLMClient(responses=["cached"], cache=cache).generate_text("warm")
+    recorder = StubLLMClient(responses=["ok"], latency=0.05, cache=cache, cassette=Cassette(path, mode="record"))
+
+    async def run():
+        return await asyncio.gather(*(recorder.generate_text_async("prompt") for _ in range(3)))
+
+    assert asyncio.run(run()) == ["ok"] * 3
+    assert recorder.generate_text("warm") == "cached"
+    assert recorder.metrics.requests == 1
+
+    player = StubLLMClient(cassette=Cassette(path))
+    assert player.generate_text("warm") == "cached"
+    assert [player.generate_text("prompt") for _ in range(3)] == ["ok"] * 3
+    assert player.metrics.requests == 0
+
+
+def test_steady_state_loop_awaits_the_async_client(project, sandbox):
+    evolver = Evolver(project, population_size=4, generations=6, llm_backend="stub", generation_mode="direct",
+                      quiet=True)
+    evolver.fitness_evaluator.sandbox = sandbox
+    client = evolver.gemini_client
+    client.responses = ["```python\ndef f(x):\n    return x\n```"]
+
+    def blocking(*args):
+        raise AssertionError("the steady-state loop must not use the blocking client")
+
+    client._request = blocking
+    evolver.initialize_population(["def f(x):\n    return 0\n", "def f(x):\n    return 1\n"])
+    evolver.evolve_async(concurrency=2)
+    assert client.metrics.requests > 0
+    evolver.close()
@@ -0,0 +1,75 @@
+import pytest
+
+from alphaevolve_core.src.evaluation import sandbox_runner
+from alphaevolve_core.src.evaluation.fitness import FitnessEvaluator
+from alphaevolve_core.src.evaluation.performance import PerformanceObjective, estimate_complexity
+from alphaevolve_core.src.evaluation.sandbox_pool import SandboxPool
+from alphaevolve_core.src.project_def.projects.sort_list import SortListProject
+
+SORT = "def sort_list(arr):\n    return sorted(arr)\n"
+QUADRATIC_SORT = '''def sort_list(arr):
+    arr = list(arr)
+    for i in range(len(arr)):
+        for j in range(len(arr) - 1 - i):
+            if arr[j] > arr[j + 1]:
+                arr[j], arr[j + 1] = arr[j + 1], arr[j]
+    return arr
+'''
+
+
+class SmallSortProject(SortListProject):
+    benchmark_sizes = [50, 200, 800]
+
+
+def summary(wall_seconds, peak_memory_bytes=0, complexity_exponent=1.0):
+    return {"wall_seconds": wall_seconds, "peak_memory_bytes": peak_memory_bytes,
+            "complexity_exponent": complexity_exponent}
+
+
+def test_estimate_complexity():
+    sizes = [100, 1000, 10000]
+    assert estimate_complexity(sizes, [1e-4, 1e-3, 1e-2]) == (pytest.approx(1.0), "O(n)")
+    assert estimate_complexity(sizes, [1e-4, 1e-2, 1.0])[1] == "O(n^2)"
+    assert estimate_complexity(sizes, [1e-3, 1e-3, 1e-3])[1] == "O(1)"
+    assert estimate_complexity([100], [1e-3]) == (0.0, "unknown")
+
+
+def test_score_prefers_faster_leaner_programs():
+    objective = PerformanceObjective()
+    assert 0.0 < objective.score(summary(1e-1)) < objective.score(summary(1e-4)) <= 1.0
+    assert objective.score(summary(1e-3, complexity_exponent=2.0)) < objective.score(summary(1e-3))
+    assert objective.score(summary(1e-3, peak_memory_bytes=2 ** 30)) < objective.score(summary(1e-3))
+
+
+def test_only_correct_programs_get_a_bonus():
+    objective = PerformanceObjective(weight=0.5)
+    assert objective.combine(0.9, 1.0) == 0.9
+    assert objective.combine(1.0, None) == 1.0
+    assert objective.combine(1.0, 0.5) == 1.25
+
+
+def test_run_benchmark_reports_each_size():
+    response = sandbox_runner.run_benchmark({"code": SORT, "function_name": "sort_list", "repeats": 3, "warmup": 1,
+                                             "sized_inputs": [[10, list(range(10, 0, -1))],
+                                                              [1000, list(range(1000, 0, -1))]]})
+    assert [sample["size"] for sample in response["samples"]] == [10, 1000]
+    # Only per-candidate measurements; a pooled worker's RSS high-water mark is not one
+    assert set(response) == {"samples"}
+    assert all(sample["wall"] >= 0 and sample["peak_memory"] > 0 for sample in response["samples"])
+
+    failing = sandbox_runner.run_benchmark({"code": "def sort_list(arr):\n    raise ValueError('no')\n",
+                                            "function_name": "sort_list", "sized_inputs": [[10, [1]]]})
+    assert "error" in failing
+
+
+def test_faster_correct_programs_rank_higher():
+    project = SmallSortProject()
+    pool = SandboxPool(size=1, backend="local")
+    try:
+        evaluator = FitnessEvaluator(sandbox=pool, performance=PerformanceObjective(), benchmark_repeats=1)
+        fast, fast_details = evaluator.evaluate(SORT, project)
+        slow, slow_details = evaluator.evaluate(QUADRATIC_SORT, project)
+    finally:
+        pool.close()
+    assert 1.0 < slow < fast
+    assert fast_details["performance"]["complexity_exponent"] < slow_details["performance"]["complexity_exponent"]
@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from alphaevolve_core.src.core.population import Individual, Population, ProgramStore, SortedIndividuals
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    store = ProgramStore(path=str(tmp_path / "store.sqlite") if request.param == "sqlite" else None)
+    yield store
+    store.close()
+
+
+def test_individuals_stay_sorted_and_bounded(store):
+    population = Population(max_size=3, store=store)
+    for i, fitness in enumerate([0.2, 0.9, 0.5, 0.1, 0.7]):
+        population.add_individual(f"def f(x):\n    return {i}\n", fitness)
+    assert [ind.fitness for ind in population.individuals] == [0.9, 0.7, 0.5]
+    assert population.get_fittest()["code"] == "def f(x):\n    return 1\n"
+    assert population.get_average_fitness() == pytest.approx(0.7)
+
+
+def test_newcomers_rank_after_equal_fitness(store):
+    population = Population(max_size=2, store=store)
+    population.add_individual("first", 0.5)
+    population.add_individual("second", 0.5)
+    assert population.add_individual("third", 0.5) is None
+    assert [ind.code for ind in population.individuals] == ["first", "second"]
+
+
+def test_admission_threshold_applies_once_full(store):
+    population = Population(max_size=2, store=store)
+    population.add_individual("a", 0.3)
+    assert population.admission_threshold() == float("-inf")
+    population.add_individual("b", 0.6)
+    assert population.admission_threshold() == 0.3
+
+
+def test_details_are_read_through_the_store(store):
+    population = Population(max_size=2, store=store)
+    population.add_individual("a", 0.5, metadata={"tests_passed": 5, "errors": "boom"})
+    individual = population.individuals[0]
+    assert individual["errors"] == "boom" and "tests_passed" in individual
+    assert individual.to_dict() == {"code": "a", "fitness": 0.5, "tests_passed": 5, "errors": "boom"}
+
+
+def test_duplicate_programs_share_one_entry_until_evicted(store):
+    population = Population(max_size=2, store=store)
+    population.add_individual("same", 0.5)
+    population.add_individual("same", 0.6)
+    assert len(store._codes) == 1
+    population.add_individual("other", 0.9)
+    population.add_individual("better", 1.0)
+    assert "same" not in [ind.code for ind in population.individuals]
+    assert len(store._codes) == 2
+
+
+def test_sorted_individuals_match_a_sorted_list():
+    rng = random.Random(0)
+    store = ProgramStore()
+    # A small load splits and empties blocks many times over
+    individuals, reference = SortedIndividuals(load=4), []
+    for step in range(2000):
+        if reference and rng.random() < 0.3:
+            position = rng.randrange(-len(reference), len(reference))
+            assert individuals.pop(position) is reference.pop(position)
+        else:
+            individual = Individual(rng.randint(0, 20) / 20, step, None, store)
+            individuals.insert(individual)
+            # Stable sort keeps a newcomer after equal fitness, like the population
+            reference.append(individual)
+            reference.sort(key=lambda ind: -ind.fitness)
+        assert len(individuals) == len(reference)
+    assert list(individuals) == reference
+    assert individuals[3:9] == reference[3:9] and individuals[-1] is reference[-1]
+    assert all(individuals.index(ind) == position for position, ind in enumerate(reference))
+    assert random.sample(individuals, 3)
@@ -0,0 +1,56 @@
+import pytest
+
+from alphaevolve_core.src.evaluation.prefilter import StaticPreFilter
+
+
+def stage(program, project, **options):
+    _, rejection = StaticPreFilter(**options).check(program, project)
+    return rejection and rejection["prefilter"]["stage"]
+
+
+def test_valid_program_passes_and_fences_are_stripped(project):
+    code, rejection = StaticPreFilter().check("```python\nimport math\n\ndef f(x):\n    return x + 1\n```", project)
+    assert rejection is None
+    assert code == "import math\n\ndef f(x):\n    return x + 1"
+
+
+@pytest.mark.parametrize("program, expected", [
+    ("   ", "extract"),
+    ("def f(x):\n    return (x +\n", "parse"),
+    ("def g(x):\n    return x + 1\n", "signature"),
+    ("async def f(x):\n    return x + 1\n", "signature"),
+    ("def f(x, y):\n    return x + y\n", "signature"),
+    ("def f(x, *, scale):\n    return x * scale\n", "signature"),
+    ("import os\n\ndef f(x):\n    return x + 1\n", "imports"),
+    ("def f(x):\n    return eval('x + 1')\n", "imports"),
+    ("from . import helpers\n\ndef f(x):\n    return x + 1\n", "imports"),
+    ("def f(x):\n    pass\n", "lint"),
+    ("def f(x):\n    raise NotImplementedError()\n", "lint"),
+    ("def f(x):\n    return x + offset\n", "lint"),
+])
+def test_rejections(project, program, expected):
+    assert stage(program, project) == expected
+
+
+def test_accepted_variants(project):
+    assert stage("def f(x, y=2, *args):\n    return x + 1\n", project) is None
+    assert stage("def f(x: Undeclared) -> int:\n    return x + 1\n", project) is None
+    assert stage("def f(x):\n    try:\n        return x + 1\n    except Exception as e:\n        raise e\n", project) is None
+
+
+def test_allowlist_and_lint_are_configurable(project):
+    assert stage("import os\n\ndef f(x):\n    return x + 1\n", project, allowed_imports=["os"]) is None
+    assert stage("def f(x):\n    pass\n", project, lint=False) is None
+
+
+def test_rejection_details_and_stats(project):
+    prefilter = StaticPreFilter()
+    _, rejection = prefilter.check("def f(x):\n    return x + offset\n", project)
+    assert rejection["tests_run"] == 0
+    assert rejection["prefilter"]["line"] == 2
+    assert "Undefined name `offset`" in rejection["errors"]
+    prefilter.check("def f(x):\n    return x + 1\n", project)
+    stats = prefilter.stats()
+    assert stats["checked"] == 2
+    assert stats["rejected_by_stage"]["lint"] == 1
+    assert stats["reject_rate"] == 0.5
@@ -0,0 +1,82 @@
+from alphaevolve_core.src.llm_services.prompt_budget import (
+    PromptBudget, compact_errors, count_tokens, describe_parents, elide_lines, trim_traceback,
+)
+
+BEST = "\n".join(["def f(x):"] + [f"    y{i} = x + {i}" for i in range(50)] + ["    return x + 1"])
+PARENT = BEST.replace("return x + 1", "return x + 2")
+
+TRACEBACK = """Traceback (most recent call last):
+  File "/sandbox/sandbox_runner.py", line 40, in call_with_timeout
+    result = func(*args)
+  File "<candidate>", line 3, in f
+    return g(x)
+  File "<candidate>", line 6, in g
+    return 1 / x
+ZeroDivisionError: division by zero"""
+
+
+def test_count_tokens():
+    assert count_tokens("") == 0
+    # Single spaces merge into the following token
+    assert count_tokens("return x + 1") == 4
+    # Longer text costs more tokens
+    assert count_tokens(BEST) > count_tokens("def f(x):\n    return x + 1")
+
+
+def test_trim_traceback_keeps_candidate_frames():
+    trimmed = trim_traceback(TRACEBACK)
+    assert "sandbox_runner.py" not in trimmed
+    assert '"<candidate>", line 6' in trimmed
+    assert trimmed.endswith("ZeroDivisionError: division by zero")
+    assert "1 frame(s) omitted" in trimmed
+    assert trim_traceback("plain error\n") == "plain error"
+
+
+def test_compact_errors_merges_identical_failures():
+    errors = "\n".join(f"Test {i} (input={i}) raised an error:\n{TRACEBACK}" for i in (1, 2, 3))
+    compacted = compact_errors(errors)
+    assert compacted.count("ZeroDivisionError") == 1
+    assert "also occurred in tests 2, 3" in compacted
+
+    distinct = "\n".join(f"Test {i} (input={i}) expected {i}, got None{i}" for i in range(1, 9))
+    assert "3 more distinct error(s) omitted" in compact_errors(distinct, max_errors=5)
+
+
+def test_elide_lines():
+    assert elide_lines("a\nb", 5) == "a\nb"
+    elided = elide_lines(BEST, 10).splitlines()
+    assert len(elided) == 11
+    assert "lines omitted" in elided[5]
+
+
+def test_describe_parents_levels():
+    parents = [{"code": PARENT, "fitness": 0.5}, {"code": BEST, "fitness": 0.9}]
+    full = describe_parents(parents, level=0)
+    assert full.index("fitness 0.9") < full.index("fitness 0.5")
+    assert "```diff" in full and "+    return x + 2" in full
+    assert "omitted for length" in describe_parents(parents, level=2)
+    assert "lines omitted" in describe_parents(parents, level=3)
+    assert len(describe_parents(parents, level=3)) < len(describe_parents(parents, level=1)) < len(full)
+    assert describe_parents([]) == ""
+
+
+def test_budget_compacts_until_the_prompt_fits():
+    parents = [{"code": BEST, "fitness": 0.9}, {"code": PARENT, "fitness": 0.5}]
+    prefix, suffix = "Instructions.\n", "Write the program."
+    uncompacted = count_tokens(prefix + describe_parents(parents, 0) + suffix)
+    budget = PromptBudget(max_tokens=uncompacted - 1)
+    prompt = budget.build(prefix, lambda level: describe_parents(parents, level), suffix)
+    assert prompt.startswith(prefix) and prompt.endswith(suffix)
+    assert count_tokens(prompt) <= budget.max_tokens
+    assert budget.stats()["compacted"] == 1
+
+    unlimited = PromptBudget()
+    assert unlimited.build(prefix, lambda level: describe_parents(parents, level), suffix) == \
+        prefix + describe_parents(parents, 0) + suffix
+    assert unlimited.stats()["compacted"] == 0
+
+
+def test_budget_reports_prompts_that_never_fit():
+    budget = PromptBudget(max_tokens=1)
+    budget.build("A long static prefix that alone is over budget.", lambda level: "")
+    assert budget.stats()["over_budget"] == 1
@@ -0,0 +1,100 @@
+from conftest import IncrementProject
+
+from alphaevolve_core.benchmarks.evolver_bench import InProcessSandbox
+from alphaevolve_core.src.evaluation import sandbox_runner
+from alphaevolve_core.src.evaluation.eval_cache import EvaluationCache
+from alphaevolve_core.src.evaluation.fitness import RacingEvaluator
+from alphaevolve_core.src.evaluation.performance import PerformanceObjective
+
+ADD_ONE = "def f(x):\n    return x + 1\n"
+IDENTITY = "def f(x):\n    return x\n"
+HALF_RIGHT = "def f(x):\n    return x + 1 if x < 32 else x\n"
+
+
+class BenchmarkedIncrementProject(IncrementProject):
+    benchmark_sizes = [10, 100]
+
+    def generate_input(self, size):
+        return size
+
+
+class BenchmarkingSandbox(InProcessSandbox):
+    def run_benchmark(self, code, function_name, sized_inputs, repeats=3, timeout=60, per_call_timeout=None):
+        return sandbox_runner.run_benchmark({"code": code, "function_name": function_name, "repeats": repeats,
+                                             "sized_inputs": [list(pair) for pair in sized_inputs]})
+
+
+def racer(sandbox, threshold, **options):
+    return RacingEvaluator(threshold=lambda: threshold, sandbox=sandbox, **options)
+
+
+def test_hopeless_programs_stop_early(sandbox):
+    evaluator = racer(sandbox, 0.5)
+    fitness, details = evaluator.evaluate(IDENTITY, IncrementProject(64))
+    assert fitness == 0.0
+    assert details["tests_run"] < 64
+    assert details["race_stopped"]["threshold"] == 0.5
+    assert evaluator.stats()["stopped"] == 1
+
+
+def test_survivors_run_every_case_once(sandbox):
+    evaluator = racer(sandbox, 0.5)
+    fitness, details = evaluator.evaluate(ADD_ONE, IncrementProject(64))
+    assert fitness == 1.0
+    assert details["tests_run"] == 64
+    stats = evaluator.stats()
+    assert stats["cases_run"] == 64
+    assert stats["cases_skipped"] == 0
+    # Rounds of 8, 16, 32 and 64 cases
+    assert sandbox.batches_run == 4
+
+
+def test_exact_bound_only_stops_programs_below_the_threshold(sandbox):
+    project = IncrementProject(64)
+    fitness, details = racer(sandbox, 0.49, confidence=1.0).evaluate(HALF_RIGHT, project)
+    assert "race_stopped" not in details
+    assert fitness == 0.5
+
+    # Even if the 56 unrun cases all passed, the pass rate would stay at 0.875
+    fitness, details = racer(sandbox, 0.9, confidence=1.0).evaluate(IDENTITY, project)
+    assert details["tests_run"] == 8
+    assert details["race_stopped"]["upper_bound"] == 56 / 64
+
+
+def test_upper_bound():
+    evaluator = RacingEvaluator(threshold=lambda: 0.0)
+    # Never below the observed rate, and exact once every case has run
+    assert evaluator._upper_bound(8, 8, 64, 0.01) == 1.0
+    assert evaluator._upper_bound(2, 16, 64, 0.01) >= 2 / 16
+    assert evaluator._upper_bound(10, 64, 64, 0.01) == 10 / 64
+    # More evidence tightens the bound
+    assert evaluator._upper_bound(4, 32, 64, 0.01) < evaluator._upper_bound(1, 8, 64, 0.01)
+
+
+def test_disabled_without_a_threshold(sandbox):
+    evaluator = racer(sandbox, float("-inf"))
+    assert evaluator.evaluate(IDENTITY, IncrementProject(64))[1]["tests_run"] == 64
+    assert evaluator.stats()["raced"] == 0
+
+
+def test_stopped_races_are_not_cached(sandbox):
+    cache = EvaluationCache()
+    project = IncrementProject(64)
+    racer(sandbox, 0.5, cache=cache).evaluate(IDENTITY, project)
+    assert cache.stats()["entries"] == 0
+    racer(sandbox, 0.5, cache=cache).evaluate(ADD_ONE, project)
+    assert cache.stats()["entries"] == 1
+
+
+def test_thresholds_above_one_leave_room_for_the_performance_bonus():
+    evaluator = racer(BenchmarkingSandbox(), 1.05, performance=PerformanceObjective(weight=0.5))
+    fitness, details = evaluator.evaluate(ADD_ONE, BenchmarkedIncrementProject(64))
+    assert "race_stopped" not in details
+    assert details["tests_run"] == 64
+    assert "score" in details["performance"]
+    assert 1.0 < fitness <= 1.5
+
+    # A program that fails a test can no longer earn the bonus
+    fitness, details = evaluator.evaluate(IDENTITY, BenchmarkedIncrementProject(64))
+    assert details["tests_run"] == 8
+    assert "race_stopped" in details
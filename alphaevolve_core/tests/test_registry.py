@@ -0,0 +1,69 @@
+import sys
+
+import pytest
+
+from alphaevolve_core.src.project_def.projects.dummy import DummyProject
+from alphaevolve_core.src.project_def.registry import ProjectRegistry
+
+PROJECT_MODULE = '''from alphaevolve_core.src.project_def.project_base import ProjectBase
+
+
+class {name}(ProjectBase):
+    description = "{description}"
+    function_name = "f"
+    signature = "def f(x):"
+    test_cases = [{{"input": 1, "output": 2}}]
+'''
+
+
+@pytest.fixture
+def projects_dir(tmp_path, monkeypatch):
+    # The registry puts extra directories on sys.path; keep that to this test
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    return tmp_path
+
+
+def write_project(directory, module, name="ExtraProject", description="extra"):
+    (directory / f"{module}.py").write_text(PROJECT_MODULE.format(name=name, description=description))
+
+
+def test_builtin_projects(projects_dir):
+    registry = ProjectRegistry(entry_point_group=None)
+    assert {"dummy", "sort_list"} <= set(registry.names())
+    assert registry.load("dummy") is DummyProject
+    assert registry.create("sort_list").function_name == "sort_list"
+
+
+def test_listing_does_not_import(projects_dir):
+    write_project(projects_dir, "registry_lazy_project")
+    registry = ProjectRegistry(directories=[str(projects_dir)], entry_point_group=None)
+    assert "registry_lazy_project" in registry.names()
+    assert "registry_lazy_project" not in sys.modules
+    assert registry.create("registry_lazy_project").description == "extra"
+    assert "registry_lazy_project" in sys.modules
+
+
+def test_extra_directories_override_builtins(projects_dir):
+    write_project(projects_dir, "dummy", name="OtherDummy", description="override")
+    registry = ProjectRegistry(directories=[str(projects_dir)], entry_point_group=None)
+    assert registry.create("dummy").description == "override"
+    sys.modules.pop("dummy", None)
+
+
+def test_module_references_and_unknown_names():
+    registry = ProjectRegistry(entry_point_group=None)
+    assert registry.load("alphaevolve_core.src.project_def.projects.dummy:DummyProject") is DummyProject
+    with pytest.raises(KeyError):
+        registry.load("no_such_project")
+
+
+def test_modules_must_define_one_project(projects_dir):
+    (projects_dir / "registry_two_projects.py").write_text(
+        PROJECT_MODULE.format(name="First", description="a") + PROJECT_MODULE.format(name="Second", description="b"))
+    (projects_dir / "registry_chosen_project.py").write_text(
+        PROJECT_MODULE.format(name="First", description="a") + PROJECT_MODULE.format(name="Second", description="b")
+        + "\nPROJECT = Second\n")
+    registry = ProjectRegistry(directories=[str(projects_dir)], entry_point_group=None)
+    with pytest.raises(ValueError):
+        registry.load("registry_two_projects")
+    assert registry.create("registry_chosen_project").description == "b"
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from alphaevolve_core.src.llm_services.response_cache import Cassette, CassetteMiss, ResponseCache, response_key
+
+
+def test_key_depends_on_model_prompt_and_config():
+    key = response_key("model", "prompt", {"temperature": 0.7})
+    assert key == response_key("model", "prompt", {"temperature": 0.7})
+    assert key != response_key("other", "prompt", {"temperature": 0.7})
+    assert key != response_key("model", "prompt", {"temperature": 0.2})
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A" and cache.get("c") == "C"
+
+
+def test_expired_responses_are_misses(monkeypatch):
+    cache = ResponseCache(ttl=10)
+    cache.put("a", "A")
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get("a") is None
+
+
+def test_disk_tier_keeps_the_newest_entries(tmp_path):
+    path = str(tmp_path / "llm.sqlite")
+    cache = ResponseCache(max_entries=1, path=path, max_disk_entries=3, commit_interval=100)
+    for i in range(5):
+        cache.put(f"k{i}", f"v{i}")
+    cache.put("k4", "v4 again")  # Replacing an entry does not count as a new one
+    cache.close()
+
+    cache = ResponseCache(max_entries=10, path=path, max_disk_entries=3)
+    assert [cache.get(f"k{i}") for i in range(5)] == [None, None, "v2", "v3", "v4 again"]
+    cache.close()
+
+
+def test_commits_are_batched(tmp_path):
+    path = str(tmp_path / "llm.sqlite")
+    cache = ResponseCache(path=path, commit_interval=2)
+    cache.put("a", "A")
+    assert ResponseCache(path=path).get("a") is None
+    cache.put("b", "B")
+    assert ResponseCache(path=path).get("a") == "A"
+    cache.close()
+
+
+def test_cassette_replays_in_recorded_order(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    recorder = Cassette(path, mode="record")
+    recorder.record("k", "first")
+    recorder.record("k", "second")
+
+    player = Cassette(path)
+    assert [player.play("k") for _ in range(3)] == ["first", "second", "second"]
+    with pytest.raises(CassetteMiss):
+        player.play("unknown")
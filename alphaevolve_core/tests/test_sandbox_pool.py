@@ -0,0 +1,64 @@
+import subprocess
+
+import pytest
+
+from alphaevolve_core.src.evaluation import sandbox_pool
+from alphaevolve_core.src.evaluation.sandbox_pool import SandboxPool, docker_available
+
+ADD_ONE = "def f(x):\n    return x + 1\n"
+
+
+@pytest.fixture
+def pool():
+    pool = SandboxPool(size=1, backend="local", max_runs_per_worker=3)
+    yield pool
+    pool.close()
+
+
+def test_run_batch_returns_one_result_per_input(pool):
+    results = pool.run_batch(ADD_ONE, "f", [1, 2, 3])
+    assert [result for result, _, _ in results] == [2, 3, 4]
+
+
+def test_exceptions_are_reported_per_input(pool):
+    code = "def f(x):\n    if x == 2:\n        raise ValueError('two')\n    return x\n"
+    results = pool.run_batch(code, "f", [1, 2, 3])
+    assert [result for result, _, _ in results] == [1, None, 3]
+    assert "ValueError: two" in results[1][2]
+
+
+def test_stop_on_failure_stops_at_first_wrong_output(pool):
+    results = pool.run_batch(ADD_ONE, "f", [1, 2, 3], expected_outputs=[2, 0, 4], stop_on_failure=True)
+    assert len(results) == 2
+
+
+def test_batch_timeout_restarts_the_worker(pool):
+    results = pool.run_batch("def f(x):\n    while True:\n        pass\n", "f", [1], timeout=0.5)
+    assert results[0][0] is None and "timeout" in results[0][2]
+    assert pool.stats()["crashes"] == 1
+    assert pool.run_batch(ADD_ONE, "f", [1])[0][0] == 2
+
+
+def test_workers_are_recycled_after_max_runs(pool):
+    for _ in range(4):
+        pool.run_batch(ADD_ONE, "f", [1])
+    assert pool.stats()["recycled"] == 1
+
+
+def test_local_workers_cap_their_own_memory(pool):
+    results = pool.run_batch("def f(x):\n    return len(bytearray(x))\n", "f", [1024, 2 * 1024 ** 3])
+    assert results[0][0] == 1024
+    assert "MemoryError" in results[1][2]
+
+
+def test_auto_backend_falls_back_to_local_without_a_docker_daemon(monkeypatch, capsys):
+    monkeypatch.setattr(sandbox_pool.shutil, "which", lambda name: "/usr/bin/docker")
+    monkeypatch.setattr(sandbox_pool.subprocess, "run",
+                        lambda *args, **kwargs: subprocess.CompletedProcess(args, returncode=1))
+    assert not docker_available()
+    pool = SandboxPool(size=1, backend="auto")
+    try:
+        assert pool.backend == "local"
+        assert "WARNING" in capsys.readouterr().out
+    finally:
+        pool.close()
@@ -0,0 +1,87 @@
+import time
+from types import SimpleNamespace
+
+from alphaevolve_core.src.core.evolver import Evolver
+from alphaevolve_core.src.core.scheduler import CorrectionPolicy, ModelRouter, RunBudget, fitness_bucket
+
+
+class FakeClient:
+    def __init__(self, name):
+        self.name = name
+        self.metrics = SimpleNamespace(total_tokens=0)
+
+    def generate_text(self, prompt, temperature=0.7, safety_settings=None):
+        return self.name
+
+
+def make_router(seed=0, patience=5):
+    return ModelRouter({"cheap": FakeClient("cheap"), "strong": FakeClient("strong")},
+                       costs={"cheap": 1.0, "strong": 10.0}, patience=patience, seed=seed)
+
+
+def test_fitness_bucket():
+    assert [fitness_bucket(f) for f in (0.0, 0.2, 0.5, 0.7, 0.95)] == [0, 1, 2, 2, 3]
+
+
+def test_router_is_seeded():
+    choices = [[make_router(seed=7).choose("generate", 0.5) for _ in range(20)] for _ in range(2)]
+    assert choices[0] == choices[1]
+
+
+def test_router_escalates_and_saves():
+    router = make_router(patience=3)
+    assert router.choose("generate", 0.5, stalled=3) == "strong"
+    assert router.choose("generate", 0.5, stalled=3, budget_left=0.1) == "cheap"
+
+
+def test_router_learns_and_routes_calls():
+    router = make_router()
+    for _ in range(50):
+        router.record("generate", "strong", 0.5, improved=True)
+        router.record("generate", "cheap", 0.5, improved=False)
+    # Ten times the cost still pays off against a tier that never helps
+    assert router.choose("generate", 0.5) == "strong"
+    with router.use("strong"):
+        assert router.generate_text("prompt") == "strong"
+    assert router.generate_text("prompt") == "cheap"
+
+
+def test_correction_policy_skips_unproductive_kinds():
+    policy = CorrectionPolicy(min_expected_gain=0.05, explore=0.0, seed=0)
+    assert policy.should_correct(0.3, {})
+    for _ in range(20):
+        policy.record(0.3, {}, corrected_fitness=0.3)
+    assert not policy.should_correct(0.3, {})
+    # Other kinds of failure keep their own estimate
+    assert policy.should_correct(0.3, {"prefilter": {"stage": "syntax"}})
+
+
+def test_correction_policy_exploration_is_seeded():
+    def draws():
+        policy = CorrectionPolicy(min_expected_gain=1.0, explore=0.5, seed=3)
+        return [policy.should_correct(0.3, {}) for _ in range(20)]
+    assert draws() == draws()
+
+
+def test_run_budget():
+    client = FakeClient("cheap")
+    budget = RunBudget([client], max_tokens=100, max_seconds=0.05)
+    time.sleep(0.06)
+    assert budget.exhausted().startswith("Time budget")
+    budget.start()
+    assert budget.exhausted() is None
+    client.metrics.total_tokens = 60
+    assert 0.35 < budget.left() <= 0.4
+    client.metrics.total_tokens = 100
+    assert budget.exhausted().startswith("Token budget")
+
+
+def test_evolver_seeds_router_and_policy(project):
+    def choices():
+        evolver = Evolver(project, population_size=4, llm_backend="stub", strong_model="strong", quiet=True,
+                          correction_policy="adaptive", seed=11)
+        routed = [evolver.router.choose("generate", 0.5) for _ in range(20)]
+        draws = [evolver.correction_policy._rng.random() for _ in range(5)]
+        evolver.close()
+        return routed, draws
+    assert choices() == choices()
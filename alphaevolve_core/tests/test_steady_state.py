@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from alphaevolve_core.src.core.evolver import Evolver
+
+WRONG = "```python\ndef f(x):\n    return x\n```"
+RIGHT = "```python\ndef f(x):\n    return x + 1\n```"
+
+
+@pytest.fixture
+def make_evolver(project, sandbox):
+    evolvers = []
+
+    def make(responses, generations=8):
+        evolver = Evolver(project, population_size=4, generations=generations, llm_backend="stub",
+                          generation_mode="direct", quiet=True)
+        evolver.fitness_evaluator.sandbox = sandbox
+        evolver.gemini_client.responses = responses
+        evolver.initialize_population(["def f(x):\n    return 0\n", "def f(x):\n    return 1\n"])
+        evolvers.append(evolver)
+        return evolver
+
+    yield make
+    for evolver in evolvers:
+        evolver.close()
+
+
+def track_llm_concurrency(evolver):
+    """Wraps offspring generation to record how many LLM chains are in flight at once."""
+    generate = evolver._generate_offspring_async
+    in_flight = {"now": 0, "max": 0}
+
+    async def tracked(parents, tier=None):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        try:
+            await asyncio.sleep(0.01)
+            return await generate(parents, tier)
+        finally:
+            in_flight["now"] -= 1
+
+    evolver._generate_offspring_async = tracked
+    return in_flight
+
+
+def test_produces_the_offspring_budget(make_evolver, capsys):
+    evolver = make_evolver([WRONG])
+    evolver.evolve_async(concurrency=3)
+    assert evolver.offspring_started == evolver.offspring_evaluated == 8
+    # One generation and one correction call per imperfect child
+    assert evolver.gemini_client.metrics.requests == 16
+    # Quiet mode drops the per-offspring progress lines
+    assert "Offspring 1/8" not in capsys.readouterr().out
+
+
+def test_offspring_overlap_within_the_llm_cap(make_evolver):
+    evolver = make_evolver([WRONG])
+    in_flight = track_llm_concurrency(evolver)
+    evolver.evolve_async(concurrency=4)
+    assert in_flight["max"] > 1
+
+    evolver = make_evolver([WRONG])
+    in_flight = track_llm_concurrency(evolver)
+    evolver.evolve_async(concurrency=4, max_llm_requests=1)
+    assert in_flight["max"] == 1
+
+
+def test_stops_once_solved(make_evolver):
+    evolver = make_evolver([RIGHT], generations=50)
+    evolver.evolve_async(concurrency=2)
+    assert evolver.population.get_fittest().fitness == 1.0
+    assert evolver.offspring_started < 50
@@ -0,0 +1,71 @@
+import json
+import os
+import urllib.request
+
+from alphaevolve_core.src.core.evolver import Evolver
+from alphaevolve_core.src.utils.telemetry import Histogram, Telemetry
+
+
+def read_events(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_histogram():
+    histogram = Histogram((1.0, 10.0))
+    for value in (0.5, 2.0, 3.0, 20.0):
+        histogram.observe(value)
+    assert histogram.counts == [1, 2, 1]
+    summary = histogram.summary()
+    assert summary["count"] == 4 and summary["mean"] == 6.375
+    assert summary["p50"] == 3.0 and summary["p95"] == 20.0
+
+
+def test_spans_are_written_as_json_lines(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    telemetry = Telemetry(path=path)
+    with telemetry.span("evaluate", programs=2):
+        pass
+    telemetry.close()
+    events = read_events(path)
+    assert [event["event"] for event in events] == ["start", "span"]
+    assert events[1]["name"] == "evaluate" and events[1]["programs"] == 2
+    assert telemetry.span_summary()["evaluate"]["count"] == 1
+
+
+def test_prometheus_exposition():
+    telemetry = Telemetry(prometheus_port=0)
+    telemetry.increment("llm_requests", model="stub")
+    telemetry.set_gauge("population_size", 4)
+    telemetry.observe("llm_latency_seconds", 0.02, model="stub")
+    host, port = telemetry._server.server_address
+    # Only reachable from this machine unless a host is given
+    assert host == "127.0.0.1"
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+        text = response.read().decode("utf-8")
+    telemetry.close()
+    assert '# TYPE alphaevolve_llm_requests counter' in text
+    assert 'alphaevolve_llm_requests{model="stub"} 1' in text
+    assert 'alphaevolve_population_size 4' in text
+    assert 'alphaevolve_llm_latency_seconds_bucket{model="stub",le="0.05"} 1' in text
+    assert 'alphaevolve_llm_latency_seconds_count{model="stub"} 1' in text
+
+
+def test_profiles_are_written_per_label(tmp_path):
+    telemetry = Telemetry(profile_dir=str(tmp_path))
+    with telemetry.profile("generation1"):
+        sum(range(1000))
+    assert os.path.exists(tmp_path / "generation1.prof")
+    telemetry.close()
+
+
+def test_evolver_records_phases(tmp_path, project, sandbox):
+    path = str(tmp_path / "run.jsonl")
+    evolver = Evolver(project, population_size=4, generations=2, llm_backend="stub", generation_mode="direct",
+                      telemetry_path=path, quiet=True)
+    evolver.fitness_evaluator.sandbox = sandbox
+    evolver.initialize_population(["def f(x):\n    return 0\n", "def f(x):\n    return 1\n"])
+    evolver.evolve()
+    evolver.close()
+    spans = {event["name"] for event in read_events(path) if event["event"] == "span"}
+    assert {"select", "prompt", "generate", "evaluate"} <= spans
@@ -0,0 +1,60 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from alphaevolve_core.src.evaluation import sandbox_runner
+from alphaevolve_core.src.project_def.projects.sort_list import SortListProject
+from alphaevolve_core.src.project_def import test_suite as suites
+
+SORT = "def sort_list(arr):\n    return sorted(arr)\n"
+WRONG = "def sort_list(arr):\n    return arr\n"
+
+
+@pytest.fixture
+def sort_suite(tmp_path):
+    cases = SortListProject().test_cases
+    return suites.TestSuite.save(str(tmp_path / "sort_list"), [case["input"] for case in cases],
+                                 [case["output"] for case in cases])
+
+
+def run_suite(suite, code, **request):
+    return sandbox_runner.run_suite({"code": code, "function_name": "sort_list", "directory": suite.directory,
+                                     "indices": suite.indices, **request})
+
+
+def test_round_trip_keeps_ragged_integer_rows(sort_suite):
+    cases = SortListProject().test_cases
+    assert len(sort_suite) == len(cases)
+    assert list(sort_suite.cases()) == cases
+    assert all(isinstance(x, int) for case in sort_suite.cases() for x in case["input"])
+
+
+def test_sample_is_seeded(sort_suite):
+    assert sort_suite.sample(5, seed=1).indices == sort_suite.sample(5, seed=1).indices
+    assert len(sort_suite.sample(5)) == 5
+
+
+def test_run_suite(sort_suite):
+    response = run_suite(sort_suite, SORT)
+    assert response["tests_passed"] == response["tests_run"] == len(sort_suite)
+    assert response["failures"] == []
+
+    response = run_suite(sort_suite, WRONG)
+    assert 0 < response["tests_passed"] < len(sort_suite)
+    assert "got" in response["failures"][0]
+
+
+def test_stop_on_failure_stops_on_wrong_output(sort_suite):
+    full = run_suite(sort_suite, WRONG)
+    stopped = run_suite(sort_suite, WRONG, stop_on_failure=True)
+    assert stopped["tests_run"] == full["failures"][0]["index"] + 1
+    assert stopped["tests_passed"] == stopped["tests_run"] - 1
+
+
+def test_fingerprint_follows_file_contents(tmp_path):
+    directory = str(tmp_path / "suite")
+    before = suites.TestSuite.save(directory, [[1, 2], [3, 4]], [3, 7]).fingerprint()
+    # Same shapes and file sizes, one changed value
+    after = suites.TestSuite.save(directory, [[1, 2], [3, 4]], [3, 8]).fingerprint()
+    assert before != after
+    assert suites.TestSuite(directory).fingerprint() == after